@@ -0,0 +1,44 @@
+#!/bin/sh  -e
+# Copyright 2024 Canonical Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# Sourced by the daemon wrappers after the `.env` file.
+
+# Run a daemon with the CPU affinity, nice value, and I/O scheduling class
+# set by the `<service>.cpu-affinity`, `<service>.nice`, and `<service>.ionice`
+# options. The first argument is the prefix of the options' `.env` keys.
+#
+# Usage: placement MUNGED "${SNAP}"/sbin/munged --foreground
+placement() {
+  prefix="$1"
+  shift
+  eval "affinity=\${${prefix}_CPU_AFFINITY:-}"
+  eval "niceness=\${${prefix}_NICE:-0}"
+  eval "ioclass=\${${prefix}_IONICE:-}"
+
+  if [ -n "${ioclass}" ]; then
+    case "${ioclass}" in
+      *:*) set -- "${SNAP}"/usr/bin/ionice -c "${ioclass%%:*}" -n "${ioclass#*:}" "$@" ;;
+      *) set -- "${SNAP}"/usr/bin/ionice -c "${ioclass}" "$@" ;;
+    esac
+  fi
+  if [ "${niceness}" != 0 ]; then
+    set -- nice -n "${niceness}" "$@"
+  fi
+  if [ -n "${affinity}" ]; then
+    set -- "${SNAP}"/usr/bin/taskset --cpu-list "${affinity}" "$@"
+  fi
+
+  "$@"
+}
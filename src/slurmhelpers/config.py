@@ -0,0 +1,145 @@
+# Copyright 2025 Canonical Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Manage the global configuration of the Slurm snap stored in `$SNAP_COMMON/.env`."""
+
+import logging
+import os
+from os import PathLike
+from pathlib import Path
+from typing import Dict, Optional, Set, Union
+
+from . import profiling
+
+
+def write_atomic(
+    file: Union[str, PathLike], content: Union[str, bytes], mode: int = 0o644
+) -> None:
+    """Atomically replace the content of a file.
+
+    The content is written to a temporary file in the same directory, synced to
+    disk, and renamed over `file`, so readers only ever see the old or the new
+    content. The temporary file has its final mode before any content is written.
+
+    Args:
+        file: Path to the file.
+        content: New content of the file.
+        mode: Permissions of the file.
+    """
+    import tempfile
+
+    file = Path(file)
+    fd, tmp = tempfile.mkstemp(dir=file.parent, prefix=f".{file.name}.")
+    try:
+        os.fchmod(fd, mode)
+        with os.fdopen(fd, "wb" if isinstance(content, bytes) else "w") as f:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, file)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+class ConfigStore:
+    """Transactional, in-memory view of the snap's `.env` configuration file.
+
+    The `.env` file is parsed once, on first access, and every read after that
+    is served from memory. Updated keys are tracked until `commit` is called,
+    which writes the whole file to a temporary file, syncs it to disk, and
+    renames it over the original. Service wrappers sourcing the `.env` file
+    will therefore only ever see the previous or the new configuration.
+
+    Args:
+        file: Path to the `.env` file.
+    """
+
+    def __init__(self, file: Union[str, PathLike]) -> None:
+        self._file = Path(file)
+        self._values: Optional[Dict[str, str]] = None
+        self._dirty: Set[str] = set()
+
+    @property
+    def file(self) -> Path:
+        """Get the path to the `.env` file backing this store."""
+        return self._file
+
+    @property
+    def dirty(self) -> Set[str]:
+        """Get the set of keys that have been changed but not yet committed."""
+        return set(self._dirty)
+
+    def _load(self) -> Dict[str, str]:
+        """Load the `.env` file into memory."""
+        if self._values is None:
+            logging.debug("loading snap configuration from %s", self._file)
+            self._values = {}
+            if self._file.exists():
+                with profiling.phase("config.load"):
+                    # Deferred so that modules that only use `write_atomic` never import it.
+                    import dotenv
+
+                    self._values = {
+                        k: v for k, v in dotenv.dotenv_values(self._file).items() if v is not None
+                    }
+
+        return self._values
+
+    def get(self, key: str) -> Optional[str]:
+        """Get a configuration value.
+
+        Args:
+            key: Key of configuration value to retrieve.
+        """
+        return self._load().get(key)
+
+    def set(self, key: str, value: str) -> None:
+        """Set a configuration value.
+
+        The value is only recorded in memory. Call `commit` to write it to the `.env` file.
+
+        Args:
+            key: Key of configuration value to set.
+            value: New configuration value.
+
+        Raises:
+            ValueError: Raised if the value cannot be safely sourced by a shell.
+        """
+        if "'" in value or "\n" in value:
+            raise ValueError(f"invalid value {value!r} for {key}. quotes and newlines not allowed")
+
+        values = self._load()
+        if values.get(key) == value:
+            return
+
+        values[key] = value
+        self._dirty.add(key)
+
+    def commit(self) -> None:
+        """Atomically write all pending changes to the `.env` file."""
+        if not self._dirty:
+            logging.debug("no pending changes to snap configuration. not writing")
+            return
+
+        with profiling.phase("config.commit"):
+            self._write()
+
+    def _write(self) -> None:
+        """Write the `.env` file to a temporary file and rename it over the original."""
+        logging.info("committing changes to %s: %s", self._file, ", ".join(sorted(self._dirty)))
+        mode = self._file.stat().st_mode & 0o777 if self._file.exists() else 0o644
+        content = "".join(f"{k}='{v}'\n" for k, v in self._load().items())
+        write_atomic(self._file, content, mode)
+        self._dirty.clear()
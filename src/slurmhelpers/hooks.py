@@ -15,69 +15,83 @@
 """Hooks for the Slurm snap."""
 
 import logging
-import os
-from pathlib import Path
+from typing import Dict
 
 from snaphelpers import Snap
 
-from .log import setup_logging
-from .models import Munged, Slurmd, Slurmrestd
+from .config import ConfigStore
+from .log import LOG_LEVELS, setup_logging
+from .options import Option, diff, register, validate
+from .profiling import HookProfiler
+from .snapctl import SnapCtlClient
+
+_HOOK_OPTIONS = register(
+    Option("hooks", "log-level", "HOOKS_LOG_LEVEL", default="debug", choices=tuple(LOG_LEVELS)),
+    Option("hooks", "log-format", "HOOKS_LOG_FORMAT", default="text", choices=("text", "json")),
+)
 
 
 def _setup_dirs(snap: Snap) -> None:
     """Create directories needed by Slurm and Munge to function within the snap.
 
+    Only directories that are missing, or that have the wrong mode or owner,
+    are changed, so this is safe to run on an existing installation.
+
     Args:
         snap: The Snap instance.
     """
-    # Generate directories need by Slurm and Munge.
+    # Only the `install` and `post-refresh` hooks provision directories.
+    from .provision import provision
+
     logging.info("provisioning required directories for slurm and munge")
-    etc = Path(snap.paths.common) / "etc"
-    var = Path(snap.paths.common) / "var"
-    run = Path(snap.paths.common) / "run"
-    for directory in [
-        # etc - configuration files
-        etc / "logrotate",
-        etc / "munge",
-        etc / "slurm",
-        etc / "slurm" / "plugstack.conf.d",
-        etc / "slurm" / "epilog.d",
-        etc / "slurm" / "prolog.d",
-        # var/lib - variable state information
-        var / "lib" / "munge",
-        var / "lib" / "slurm",
-        var / "lib" / "slurm" / "checkpoint",
-        var / "lib" / "slurm" / "slurmctld",
-        var / "lib" / "slurm" / "slurmd",
-        var / "lib" / "slurm" / "slurmdbd",
-        var / "lib" / "slurm" / "slurmrestd",
-        # var/log - variable log data
-        var / "log" / "slurm",
-        # run - variable runtime data
-        run / "munge",
-        run / "slurm",
-    ]:
-        logging.debug("generating directory %s", directory)
-        directory.mkdir(parents=True)
-
-    # Set permissions on special directories
-    logging.debug("updating directory permissions")
-    etc.chmod(0o711)
-    (etc / "munge").chmod(0o700)
-    (etc / "slurm").chmod(0o755)
-    (var / "lib" / "munge").chmod(0o711)
-    (run / "munge").chmod(0o755)
-
-
-def _setup_logrotate(snap: Snap) -> None:
-    """Configure `logrotate` for the Slurm.
+    provision(snap.paths.common)
+
+
+def _setup_hook_logging(snap: Snap, store: ConfigStore) -> None:
+    """Set up logging for a hook using the log settings stored in the `.env` file.
+
+    Args:
+        snap: The Snap instance.
+        store: The snap's configuration store.
+    """
+    setup_logging(
+        snap.paths.common / "hooks.log",
+        level=_HOOK_OPTIONS["log-level"].value(store),
+        json_format=_HOOK_OPTIONS["log-format"].value(store) == "json",
+    )
+
+
+def _update_hook_logging(snap: Snap, store: ConfigStore, config: Dict[str, str]) -> None:
+    """Update the log settings of the snap's hooks.
 
     Args:
         snap: The Snap instance.
+        store: The snap's configuration store.
+        config: The `hooks` snap configuration options.
     """
-    tmpl = (snap.paths.snap / "templates" / "logrotate.conf.tmpl").read_text()
-    config = os.path.expandvars(tmpl)
-    (snap.paths.common / "etc" / "logrotate" / "logrotate.conf").write_text(config)
+    for k, v in validate({"hooks": config})["hooks"].items():
+        store.set(_HOOK_OPTIONS[k].key, v)
+
+    if store.dirty & {"HOOKS_LOG_LEVEL", "HOOKS_LOG_FORMAT"}:
+        _setup_hook_logging(snap, store)
+
+
+def _update_metrics(snap: Snap, snapctl: SnapCtlClient) -> None:
+    """Write the snap's health metrics at the end of a hook.
+
+    Metrics are best effort, so failing to write them does not fail the hook.
+
+    Args:
+        snap: The Snap instance.
+        snapctl: The hook's `snapctl` client.
+    """
+    try:
+        from . import metrics
+
+        metrics.record_env(snap.paths.common)
+        metrics.update(snap, snapctl)
+    except Exception as e:
+        logging.warning("failed to write snap metrics. reason %s", e)
 
 
 def install(snap: Snap) -> None:
@@ -87,44 +101,197 @@ def install(snap: Snap) -> None:
     required by munge and Slurm under $SNAP_DATA, set the default
     snap configuration, and generate a munge.key file for the host.
     """
-    setup_logging(snap.paths.common / "hooks.log")
-    munged = Munged(snap)
-    slurmd = Slurmd(snap)
-    slurmrestd = Slurmrestd(snap)
+    # Each hook runs in a fresh interpreter. Only import what the hook needs.
+    from .migrations import LATEST, SCHEMA_KEY
+    from .models import (
+        Logrotate,
+        Munged,
+        PrometheusSlurmExporter,
+        Slurmctld,
+        Slurmd,
+        Slurmdbd,
+        Slurmrestd,
+        SlurmrestdProxy,
+    )
+    from .restart import RestartPlanner
+
+    store = ConfigStore(snap.paths.common / ".env")
+    _setup_hook_logging(snap, store)
+    with HookProfiler("install", snap.paths.common) as profiler:
+        restarts = RestartPlanner(snap)
+        logrotate = Logrotate(snap, store, restarts)
+        munged = Munged(snap, store, restarts)
+        slurmd = Slurmd(snap, store, restarts)
+        slurmrestd = Slurmrestd(snap, store, restarts)
+        exporter = PrometheusSlurmExporter(snap, store, restarts)
+        proxy = SlurmrestdProxy(snap, store, restarts)
+        slurmctld = Slurmctld(snap, store, restarts)
+        slurmdbd = Slurmdbd(snap, store, restarts)
+
+        logging.info("executing snap `install` hook")
+        with profiler.phase("setup_dirs"):
+            _setup_dirs(snap)
+        with profiler.phase("setup_logrotate"):
+            logrotate.write_config()
+        with profiler.phase("setup_slurmctld_profile"):
+            slurmctld.write_profile()
+        with profiler.phase("setup_slurmdbd_tuning"):
+            slurmdbd.write_tuning()
+
+        logging.info("setting default global configuration for snap")
+        with profiler.phase("defaults"):
+            munged.max_thread_count = "auto"
+            slurmd.config_server = ""
+            slurmrestd.profile = "balanced"
+            exporter.render_args()
+            proxy.render_args()
+            # Fresh installations need no migrations.
+            store.set(SCHEMA_KEY, str(LATEST))
 
-    logging.info("executing snap `install` hook")
-    _setup_dirs(snap)
-    _setup_logrotate(snap)
+        logging.info("generating default munge.key secret")
+        with profiler.phase("generate_key"):
+            munged.generate_key()
 
-    logging.info("setting default global configuration for snap")
-    munged.max_thread_count = 1
-    slurmd.config_server = ""
-    slurmrestd.max_connections = 124
-    slurmrestd.max_thread_count = 20
+        store.commit()
+        restarts.apply()
 
-    logging.info("generating default munge.key secret")
-    munged.generate_key()
+    _update_metrics(snap, restarts.snapctl)
 
 
 def configure(snap: Snap) -> None:
     """Configure hook for the Slurm snap."""
-    setup_logging(snap.paths.common / "hooks.log")
-    logging.info("Executing snap `configure` hook.")
-    options = snap.config.get_options(
-        "munge", "slurm", "slurmd", "slurmdbd", "slurmrestd"
-    ).as_dict()
+    from .models import (
+        Logrotate,
+        Munged,
+        PrometheusSlurmExporter,
+        Slurmctld,
+        Slurmd,
+        Slurmdbd,
+        Slurmrestd,
+        SlurmrestdProxy,
+    )
+    from .restart import RestartPlanner
 
-    if "munged" in options:
+    store = ConfigStore(snap.paths.common / ".env")
+    _setup_hook_logging(snap, store)
+    with HookProfiler("configure", snap.paths.common) as profiler:
+        logging.info("Executing snap `configure` hook.")
+        snapctl = SnapCtlClient(snap)
+        options = snapctl.config(
+            "hooks",
+            "logrotate",
+            "munged",
+            "prometheus-slurm-exporter",
+            "slurm",
+            "slurmctld",
+            "slurmd",
+            "slurmdbd",
+            "slurmrestd",
+            "slurmrestd-proxy",
+        )
+        # Validate the whole payload before applying any of it, then
+        # only apply the options that differ from the current configuration.
+        with profiler.phase("options.diff"):
+            changes = diff(store, validate(options))
+        restarts = RestartPlanner(snap, snapctl)
+
+        if "hooks" in changes:
+            logging.info("updating snap hook log settings")
+            _update_hook_logging(snap, store, changes["hooks"])
+
+        if "logrotate" in changes:
+            logging.info("updating `logrotate` configuration")
+            logrotate = Logrotate(snap, store, restarts)
+            logrotate.update_config(changes["logrotate"])
+
+        # Always update `munged` so that an automatically sized thread count is re-evaluated.
         logging.info("updating the `munged` service's configuration")
-        munged = Munged(snap)
-        munged.update_config(options["munged"])
+        munged = Munged(snap, store, restarts)
+        munged.update_config(changes.get("munged", {}))
+
+        if "prometheus-slurm-exporter" in changes:
+            logging.info("updating `prometheus-slurm-exporter` service configuration")
+            exporter = PrometheusSlurmExporter(snap, store, restarts)
+            exporter.update_config(changes["prometheus-slurm-exporter"])
+
+        if "slurmctld" in changes:
+            logging.info("updating `slurmctld` service configuration")
+            slurmctld = Slurmctld(snap, store, restarts)
+            slurmctld.update_config(changes["slurmctld"])
+
+        if "slurmd" in changes:
+            logging.info("updating `slurmd` service configuration")
+            slurmd = Slurmd(snap, store, restarts)
+            slurmd.update_config(changes["slurmd"])
 
-    if "slurmd" in options:
-        logging.info("updating `slurmd` service configuration")
-        slurmd = Slurmd(snap)
-        slurmd.update_config(options["slurmd"])
+        if "slurmdbd" in changes:
+            logging.info("updating `slurmdbd` service configuration")
+            slurmdbd = Slurmdbd(snap, store, restarts)
+            slurmdbd.update_config(changes["slurmdbd"])
 
-    if "slurmrestd" in options:
+        # Always update `slurmrestd` so that automatically sized values are re-evaluated.
         logging.info("updating `slurmrestd` service configuration")
-        slurmrestd = Slurmrestd(snap)
-        slurmrestd.update_config(options["slurmrestd"])
+        slurmrestd = Slurmrestd(snap, store, restarts)
+        slurmrestd.update_config(changes.get("slurmrestd", {}))
+
+        if "slurmrestd-proxy" in changes:
+            logging.info("updating `slurmrestd-proxy` service configuration")
+            proxy = SlurmrestdProxy(snap, store, restarts)
+            proxy.update_config(changes["slurmrestd-proxy"])
+
+        store.commit()
+        restarts.apply()
+
+    _update_metrics(snap, snapctl)
+
+
+def pre_refresh(snap: Snap) -> None:
+    """Pre-refresh hook for the Slurm snap.
+
+    Records a fingerprint of each daemon's binaries and effective configuration
+    so that the `post-refresh` hook can restart only the daemons that changed.
+    """
+    from . import refresh
+
+    store = ConfigStore(snap.paths.common / ".env")
+    _setup_hook_logging(snap, store)
+    with HookProfiler("pre-refresh", snap.paths.common) as profiler:
+        logging.info("executing snap `pre-refresh` hook")
+        with profiler.phase("fingerprint"):
+            refresh.save_state(snap.paths.common, refresh.fingerprints(snap, store))
+
+    _update_metrics(snap, SnapCtlClient(snap))
+
+
+def post_refresh(snap: Snap) -> None:
+    """Post-refresh hook for the Slurm snap.
+
+    Repairs the directories under $SNAP_COMMON, applies pending `.env`
+    migrations, and restarts only the daemons whose binaries or effective
+    configuration changed during the refresh. Daemons are not restarted by
+    snapd on refresh since they use `refresh-mode: endure`.
+    """
+    from . import refresh
+    from .migrations import migrate
+    from .restart import RestartPlanner
+
+    store = ConfigStore(snap.paths.common / ".env")
+    _setup_hook_logging(snap, store)
+    with HookProfiler("post-refresh", snap.paths.common) as profiler:
+        logging.info("executing snap `post-refresh` hook")
+        restarts = RestartPlanner(snap)
+        with profiler.phase("setup_dirs"):
+            _setup_dirs(snap)
+        with profiler.phase("migrate"):
+            migrate(snap, store, restarts)
+        store.commit()
+
+        with profiler.phase("fingerprint"):
+            before = refresh.pop_state(snap.paths.common)
+            changed = refresh.changed_services(before, refresh.fingerprints(snap, store))
+        if before is None:
+            logging.info("no fingerprints recorded before refresh. restarting all active daemons")
+        restarts.request(*changed)
+        restarts.apply()
+
+    _update_metrics(snap, restarts.snapctl)
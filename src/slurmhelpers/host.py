@@ -0,0 +1,177 @@
+# Copyright 2025 Canonical Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Query the resources of the host that the Slurm snap is installed on."""
+
+import logging
+import math
+import os
+import resource
+from pathlib import Path, PurePosixPath
+from typing import List, Optional, Set
+
+CGROUP_ROOT = Path("/sys/fs/cgroup")
+CPU_ONLINE = Path("/sys/devices/system/cpu/online")
+MEMINFO = Path("/proc/meminfo")
+PROC_CGROUP = Path("/proc/self/cgroup")
+
+
+def _cgroup_dirs(controller: str) -> List[Path]:
+    """Get the cgroups of this process for a controller, from its own cgroup up to the root.
+
+    Limits set on any ancestor of a cgroup, e.g. `system.slice`, also apply to it.
+    The unified (v2) hierarchy is used if it is mounted, else the legacy (v1) one.
+
+    Args:
+        controller: Name of the controller, e.g. `cpu` or `memory`.
+    """
+    unified = (CGROUP_ROOT / "cgroup.controllers").exists()
+    mount = CGROUP_ROOT if unified else CGROUP_ROOT / controller
+    cgroup = PurePosixPath("/")
+    try:
+        for line in PROC_CGROUP.read_text().splitlines():
+            _, controllers, path = line.split(":", 2)
+            if (not controllers) if unified else controller in controllers.split(","):
+                cgroup = PurePosixPath(path)
+                break
+    except (OSError, ValueError) as e:
+        logging.warning("failed to read cgroup of process. reason %s", e)
+
+    return [mount / p.relative_to("/") for p in (cgroup, *cgroup.parents)]
+
+
+def _cgroup_cpu_quota() -> Optional[float]:
+    """Get the tightest CPU quota of this process' cgroup and its ancestors as a number of CPUs.
+
+    Both the unified (v2) and legacy (v1) cgroup hierarchies are supported.
+    `None` is returned if no quota is set.
+    """
+    quotas = []
+    try:
+        for cgroup in _cgroup_dirs("cpu"):
+            if (cpu_max := cgroup / "cpu.max").exists():
+                quota, period = cpu_max.read_text().split()
+                if quota != "max":
+                    quotas.append(int(quota) / int(period))
+            elif (cfs_quota := cgroup / "cpu.cfs_quota_us").exists():
+                quota = int(cfs_quota.read_text())
+                period = int((cgroup / "cpu.cfs_period_us").read_text())
+                if quota > 0:
+                    quotas.append(quota / period)
+    except (OSError, ValueError) as e:
+        logging.warning("failed to read cgroup cpu quota. reason %s", e)
+
+    return min(quotas, default=None)
+
+
+def cpu_count() -> int:
+    """Get the number of CPUs that services launched by the snap can use.
+
+    The count is the number of online CPUs in the process' affinity mask,
+    further limited by the cgroup CPU quota if one is set.
+    """
+    count = len(os.sched_getaffinity(0))
+    if (quota := _cgroup_cpu_quota()) is not None:
+        count = min(count, math.ceil(quota))
+
+    return max(count, 1)
+
+
+def parse_cpu_list(cpus: str) -> Set[int]:
+    """Parse a CPU list such as `0-3,8,10-14:2` into a set of CPU numbers.
+
+    Uses the list format of `taskset --cpu-list` and `/sys/devices/system/cpu/online`.
+
+    Args:
+        cpus: CPU list to parse.
+
+    Raises:
+        ValueError: Raised if the CPU list is malformed.
+    """
+    result = set()
+    for part in cpus.split(","):
+        span, _, stride = part.strip().partition(":")
+        first, _, last = span.partition("-")
+        last = last or first
+        if not (first.isdigit() and last.isdigit() and (stride.isdigit() or not stride)):
+            raise ValueError(f"invalid cpu list {cpus}. expected a list such as 0-3,8")
+        if int(first) > int(last) or stride == "0":
+            raise ValueError(f"invalid cpu range {part} in cpu list {cpus}")
+        result.update(range(int(first), int(last) + 1, int(stride or 1)))
+
+    return result
+
+
+def online_cpus() -> Set[int]:
+    """Get the CPU numbers that are online on the host."""
+    try:
+        return parse_cpu_list(CPU_ONLINE.read_text().strip())
+    except (OSError, ValueError) as e:
+        logging.warning("failed to read online cpus. reason %s", e)
+        return set(range(os.cpu_count() or 1))
+
+
+def _cgroup_memory_limit() -> Optional[int]:
+    """Get the tightest memory limit of this process' cgroup and its ancestors in bytes.
+
+    Both the unified (v2) and legacy (v1) cgroup hierarchies are supported.
+    `None` is returned if no limit is set.
+    """
+    limits = []
+    try:
+        for cgroup in _cgroup_dirs("memory"):
+            if (memory_max := cgroup / "memory.max").exists():
+                limit = memory_max.read_text().strip()
+                if limit != "max":
+                    limits.append(int(limit))
+            elif (limit_in_bytes := cgroup / "memory.limit_in_bytes").exists():
+                limit = int(limit_in_bytes.read_text())
+                # cgroup v1 reports an unset limit as a page-aligned `LONG_MAX`.
+                if limit < 2**62:
+                    limits.append(limit)
+    except (OSError, ValueError) as e:
+        logging.warning("failed to read cgroup memory limit. reason %s", e)
+
+    return min(limits, default=None)
+
+
+def memory_total() -> int:
+    """Get the amount of memory in bytes that services launched by the snap can use.
+
+    The amount is the total memory of the host, further limited by the
+    cgroup memory limit if one is set.
+    """
+    total = 0
+    for line in MEMINFO.read_text().splitlines():
+        if line.startswith("MemTotal:"):
+            total = int(line.split()[1]) * 1024
+            break
+
+    if (limit := _cgroup_memory_limit()) is not None:
+        total = min(total, limit)
+
+    return total
+
+
+def nofile_limit() -> int:
+    """Get the maximum number of file descriptors that a service can open.
+
+    Slurm daemons raise their soft `RLIMIT_NOFILE` to the hard limit on startup,
+    so the hard limit is the effective ceiling on open connections.
+    """
+    _, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if hard == resource.RLIM_INFINITY:
+        return 2**20
+
+    return hard
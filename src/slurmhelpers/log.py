@@ -1,4 +1,4 @@
-# Copyright 2024 Canonical Ltd.
+# Copyright 2024-2025 Canonical Ltd.
 #
 # Licensed under the Apache License, Version 2.0 (the "License");
 # you may not use this file except in compliance with the License.
@@ -14,21 +14,113 @@
 
 """Configure logging for the Slurm snap Python utility functions."""
 
+import atexit
+import gzip
+import json
 import logging
+import os
+import queue
+import shutil
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from os import PathLike
-from typing import Union
+from typing import Optional, Union
 
+# Log levels that can be set with `snap set slurm hooks.log-level=...`.
+LOG_LEVELS = {
+    "debug": logging.DEBUG,
+    "info": logging.INFO,
+    "warning": logging.WARNING,
+    "error": logging.ERROR,
+}
+# Rotate the log file once it grows beyond this size in bytes.
+LOG_MAX_BYTES = 5 * 1024 * 1024
+# Number of compressed log files to keep.
+LOG_BACKUP_COUNT = 3
 
-def setup_logging(file: Union[str, PathLike]) -> None:
+_listener: Optional[QueueListener] = None
+
+
+class JsonFormatter(logging.Formatter):
+    """Format log records as single-line JSON objects."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        """Format a log record as JSON."""
+        entry = {
+            "timestamp": self.formatTime(record, "%Y-%m-%dT%H:%M:%S%z"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+
+        return json.dumps(entry)
+
+
+def _namer(name: str) -> str:
+    """Name rotated log files with a `.gz` suffix."""
+    return f"{name}.gz"
+
+
+def _rotator(source: str, dest: str) -> None:
+    """Compress the rotated log file."""
+    with open(source, "rb") as src, gzip.open(dest, "wb") as dst:
+        shutil.copyfileobj(src, dst)
+    os.remove(source)
+
+
+def _stop_listener() -> None:
+    """Flush pending log records and close the log file."""
+    global _listener
+    if _listener is None:
+        return
+
+    _listener.stop()
+    for handler in _listener.handlers:
+        handler.close()
+    _listener = None
+
+
+def setup_logging(
+    file: Union[str, PathLike], level: str = "debug", json_format: bool = False
+) -> None:
     """Set up logging for a Slurm snap utility function.
 
+    Log records are put on an in-memory queue and written to the log file by a
+    background thread, so callers never block on disk I/O. The log file is
+    rotated once it exceeds `LOG_MAX_BYTES`, and up to `LOG_BACKUP_COUNT`
+    gzip-compressed backups are kept.
+
     Args:
         file: The file to record logging information.
+        level: Minimum level of log records to record. See `LOG_LEVELS`.
+        json_format: Record log entries as JSON lines instead of plain text.
     """
-    logging.basicConfig(
-        filename=str(file),
-        filemode="a",
-        format="%(asctime)s,%(msecs)d %(name)s %(levelname)s %(message)s",
-        datefmt="%H:%M:%S",
-        level=logging.DEBUG,
+    global _listener
+    _stop_listener()
+
+    handler = RotatingFileHandler(
+        str(file), maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT, delay=True
     )
+    handler.namer = _namer
+    handler.rotator = _rotator
+    handler.setFormatter(
+        JsonFormatter()
+        if json_format
+        else logging.Formatter(
+            "%(asctime)s,%(msecs)d %(name)s %(levelname)s %(message)s", datefmt="%H:%M:%S"
+        )
+    )
+
+    q = queue.SimpleQueue()
+    root = logging.getLogger()
+    for h in [h for h in root.handlers if isinstance(h, QueueHandler)]:
+        root.removeHandler(h)
+    root.addHandler(QueueHandler(q))
+    root.setLevel(LOG_LEVELS.get(level, logging.DEBUG))
+
+    _listener = QueueListener(q, handler)
+    _listener.start()
+
+
+atexit.register(_stop_listener)
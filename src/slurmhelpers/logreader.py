@@ -0,0 +1,243 @@
+# Copyright 2025 Canonical Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Incrementally read Slurm's log files as structured records.
+
+The reader remembers the inode and offset of the last line it read from each
+`*.log` file under `var/log/slurm`, so each run only reads lines written since
+the last one. `logrotate` renames a log to `<log>.1` and only compresses it on
+the next rotation (`delaycompress`), so lines written to a log between the last
+read and its rotation are read from `<log>.1` before the new log is read.
+
+A daemon keeps appending to `<log>.1` until it reopens its log, so the reader
+only moves on to the new log once the daemon has written to it.
+"""
+
+import json
+import logging
+import os
+import re
+from os import PathLike
+from pathlib import Path
+from typing import Any, Dict, Iterator, NamedTuple, Optional, Tuple, Union
+
+from .config import write_atomic
+
+_LINE_RE = re.compile(
+    r"^(?:\[(?P<timestamp>[^\]]+)\]\s|(?P<rfc5424>\d{4}-\d\d-\d\dT\S+)\s)?"
+    r"(?:\[(?P<step>\d+\.\w+)\]\s)?"
+    r"(?:(?P<level>fatal|error|warning|debug[2-5]?|verbose):\s+)?"
+    r"(?:(?P<component>[A-Za-z_][\w/-]*):\s)?"
+)
+_JOB_ID_RE = re.compile(r"\bJobId=(\d+)")
+
+
+class Position(NamedTuple):
+    """Position of the last line read from a log file.
+
+    Attributes:
+        inode: Inode of the file that the line was read from.
+        offset: Offset of the end of the line.
+    """
+
+    inode: int
+    offset: int
+
+
+def _read(f, inode: int, final: bool) -> Iterator[Tuple[str, Position]]:
+    """Read complete lines from the current offset of an open log file.
+
+    Args:
+        f: Log file opened in binary mode.
+        inode: Inode of the log file.
+        final: Whether the file is no longer written to, so a last line
+            without a trailing newline is complete.
+    """
+    offset = f.tell()
+    for line in f:
+        if not line.endswith(b"\n") and not final:
+            # The daemon is still writing the line.
+            return
+        offset += len(line)
+        yield line.rstrip(b"\n").decode(errors="replace"), Position(inode, offset)
+
+
+def _read_rotated(file: Path, position: Position, final: bool) -> Iterator[Tuple[str, Position]]:
+    """Read the rest of a log file that was rotated to `<file>.1` since it was last read.
+
+    Args:
+        file: Log file that was rotated.
+        position: Position of the last line read from the rotated file.
+        final: Whether the daemon has reopened its log, so the rotated file is complete.
+    """
+    try:
+        with file.with_name(f"{file.name}.1").open("rb") as f:
+            if os.fstat(f.fileno()).st_ino == position.inode:
+                f.seek(position.offset)
+                yield from _read(f, position.inode, final)
+                return
+    except FileNotFoundError:
+        pass
+
+    logging.warning(
+        "%s was rotated more than once since it was last read. lines may be missing", file
+    )
+
+
+def read_lines(
+    file: Union[str, PathLike], position: Optional[Position] = None
+) -> Iterator[Tuple[str, Position]]:
+    """Read the lines written to a log file since a position, following rotation.
+
+    The position after each line is yielded with the line, so a consumer that
+    stops early resumes from the last line that it consumed.
+
+    Args:
+        file: Log file to read.
+        position: Position of the last line read. The file is read from the start if `None`.
+    """
+    file = Path(file)
+    try:
+        f = file.open("rb")
+    except FileNotFoundError:
+        f = None
+
+    try:
+        st = os.fstat(f.fileno()) if f is not None else None
+        if position is not None and (st is None or st.st_ino != position.inode):
+            # Until the daemon reopens its log, it is still appending to the rotated file.
+            reopened = st is not None and st.st_size > 0
+            yield from _read_rotated(file, position, final=reopened)
+            if not reopened:
+                return
+            position = None
+
+        if f is None:
+            return
+
+        offset = position.offset if position is not None else 0
+        if offset > st.st_size:
+            logging.warning("%s was truncated. reading it from the start", file)
+            offset = 0
+        f.seek(offset)
+        yield from _read(f, st.st_ino, final=False)
+    finally:
+        if f is not None:
+            f.close()
+
+
+def parse_line(line: str) -> Dict[str, Any]:
+    """Parse a `slurmctld`, `slurmd`, or `slurmdbd` log line into a structured record.
+
+    Args:
+        line: Log line, e.g. `[2025-01-01T00:00:00.000] error: Nodes node1 not responding`.
+    """
+    m = _LINE_RE.match(line)
+    message = line[m.end() :]
+    job_id, step = None, None
+    if m["step"]:
+        job, _, step = m["step"].partition(".")
+        job_id = int(job)
+    elif jid := _JOB_ID_RE.search(message):
+        job_id = int(jid[1])
+
+    return {
+        "timestamp": m["timestamp"] or m["rfc5424"],
+        "level": m["level"] or "info",
+        "component": m["component"],
+        "job_id": job_id,
+        "step": step,
+        "message": message,
+    }
+
+
+class LogReader:
+    """Read new lines from every `*.log` file in a directory as structured records.
+
+    Args:
+        log_dir: Directory containing the log files, i.e. `$SNAP_COMMON/var/log/slurm`.
+        checkpoint: File that the position in each log file is stored in.
+    """
+
+    def __init__(self, log_dir: Union[str, PathLike], checkpoint: Union[str, PathLike]) -> None:
+        self.log_dir = Path(log_dir)
+        self.checkpoint = Path(checkpoint)
+        try:
+            state = json.loads(self.checkpoint.read_text())
+        except FileNotFoundError:
+            state = {}
+        self.positions: Dict[str, Position] = {k: Position(*v) for k, v in state.items()}
+
+    def records(self) -> Iterator[Dict[str, Any]]:
+        """Read the records written to the log files since they were last read.
+
+        The position in a log file is advanced as each of its records is yielded.
+        Call `save` to persist the positions.
+        """
+        for file in sorted(self.log_dir.glob("*.log")):
+            for line, position in read_lines(file, self.positions.get(file.name)):
+                self.positions[file.name] = position
+                if line:
+                    yield {"file": file.name, "daemon": file.stem, **parse_line(line)}
+
+    def save(self) -> None:
+        """Atomically write the position in each log file to the checkpoint file."""
+        write_atomic(
+            self.checkpoint, json.dumps({k: list(v) for k, v in sorted(self.positions.items())})
+        )
+
+
+def main() -> None:
+    """Entrypoint for the `logs` snap app."""
+    import argparse
+    import sys
+    import time
+
+    from snaphelpers import Snap
+
+    common = Snap().paths.common
+    parser = argparse.ArgumentParser(
+        prog="slurm.logs", description="Print new Slurm log lines as JSON records."
+    )
+    parser.add_argument(
+        "--checkpoint",
+        type=Path,
+        default=common / ".slurm-logs-checkpoint.json",
+        help="file to store the position in each log in. use one per consumer",
+    )
+    parser.add_argument("--follow", action="store_true", help="keep printing new records")
+    parser.add_argument(
+        "--interval", type=float, default=1.0, help="seconds between checks with --follow"
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(format="%(levelname)s %(message)s", level=logging.INFO)
+    reader = LogReader(common / "var" / "log" / "slurm", args.checkpoint)
+    try:
+        while True:
+            for record in reader.records():
+                sys.stdout.write(json.dumps(record) + "\n")
+            sys.stdout.flush()
+            # Records are printed before the checkpoint is saved, so they
+            # are delivered at least once if the reader is interrupted.
+            reader.save()
+            if not args.follow:
+                break
+            time.sleep(args.interval)
+    except KeyboardInterrupt:
+        # Positions may have advanced past records that were never printed,
+        # so only the checkpoint saved after the last flush is kept.
+        pass
+    except OSError as e:
+        parser.exit(1, f"error: {e}\n")
@@ -0,0 +1,119 @@
+# Copyright 2025 Canonical Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Rotate Slurm's log files as soon as they grow beyond a size threshold.
+
+Run by the snap's `logrotate-watch` service when `logrotate.trigger` is set to `size`.
+"""
+
+import logging
+import re
+import subprocess
+import time
+from pathlib import Path
+from typing import Callable, List, Optional
+
+_SIZE_RE = re.compile(r"^(\d+)([kKmMgG]?)$")
+_SIZE_UNITS = {"": 1, "k": 1024, "m": 1024**2, "g": 1024**3}
+
+
+def parse_size(size: str) -> int:
+    """Parse a `logrotate` size such as `100k`, `5M`, or `1G` into bytes.
+
+    Args:
+        size: Size to parse.
+
+    Raises:
+        ValueError: Raised if the size is not a valid `logrotate` size.
+    """
+    match = _SIZE_RE.match(str(size).strip())
+    if match is None:
+        raise ValueError(f"invalid size {size}. expected a number of bytes or k, M, or G suffix")
+
+    return int(match[1]) * _SIZE_UNITS[match[2].lower()]
+
+
+def oversized_logs(log_dir: Path, max_bytes: int) -> List[Path]:
+    """Get the log files in a directory that have grown beyond a size threshold.
+
+    Args:
+        log_dir: Directory containing the `*.log` files to check.
+        max_bytes: Size threshold in bytes.
+    """
+    oversized = []
+    for log in log_dir.glob("*.log"):
+        try:
+            if log.stat().st_size > max_bytes:
+                oversized.append(log)
+        except FileNotFoundError:
+            # Log was rotated between listing the directory and checking its size.
+            continue
+
+    return oversized
+
+
+def watch(
+    log_dir: Path,
+    max_bytes: int,
+    interval: float,
+    rotate: Callable[[], None],
+    iterations: Optional[int] = None,
+) -> None:
+    """Periodically check the size of log files and rotate them once they are too large.
+
+    Args:
+        log_dir: Directory containing the `*.log` files to watch.
+        max_bytes: Size threshold in bytes.
+        interval: Seconds to wait between checks.
+        rotate: Callback that rotates the log files.
+        iterations: Number of checks to run. Runs forever if `None`.
+    """
+    count = 0
+    while iterations is None or count < iterations:
+        if logs := oversized_logs(log_dir, max_bytes):
+            logging.info(
+                "rotating logs. %s exceeded %s bytes",
+                ", ".join(log.name for log in logs),
+                max_bytes,
+            )
+            rotate()
+
+        count += 1
+        if iterations is None or count < iterations:
+            time.sleep(interval)
+
+
+def main() -> None:
+    """Entrypoint for the `logrotate-watch` service."""
+    from snaphelpers import Snap
+
+    from .config import ConfigStore
+
+    logging.basicConfig(format="%(levelname)s %(message)s", level=logging.INFO)
+    snap = Snap()
+    store = ConfigStore(snap.paths.common / ".env")
+    max_bytes = parse_size(store.get("LOGROTATE_MAX_SIZE") or "5M")
+    interval = float(store.get("LOGROTATE_CHECK_INTERVAL") or 30)
+    command = [
+        str(snap.paths.snap / "usr" / "sbin" / "logrotate"),
+        str(snap.paths.common / "etc" / "logrotate" / "logrotate.conf"),
+    ]
+
+    def rotate() -> None:
+        result = subprocess.run(command, capture_output=True, text=True)
+        if result.returncode != 0:
+            logging.error("failed to rotate logs. reason %s", result.stderr.strip())
+
+    logging.info("rotating logs larger than %s bytes. checking every %ss", max_bytes, interval)
+    watch(snap.paths.common / "var" / "log" / "slurm", max_bytes, interval, rotate)
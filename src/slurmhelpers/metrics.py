@@ -0,0 +1,247 @@
+# Copyright 2025 Canonical Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Export the health of the Slurm snap as a Prometheus textfile.
+
+The textfile is written for node_exporter's textfile collector at the end of
+every hook and periodically by the snap's `metrics` timer. It reports which
+services are active, how the last run of each hook went, whether the `.env`
+file was edited outside of a hook, the size of Slurm's logs, and when the munge
+key last changed.
+"""
+
+import hashlib
+import json
+import logging
+import os
+from os import PathLike
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Tuple, Union
+
+from snaphelpers import Snap
+
+from .config import write_atomic
+from .snapctl import SnapCtlClient
+
+# Textfile relative to $SNAP_COMMON. Point node_exporter's
+# `--collector.textfile.directory` at its parent directory.
+TEXTFILE = "var/lib/prometheus/node-exporter/slurm_snap.prom"
+# Digest of the `.env` file as last committed by a hook, relative to $SNAP_COMMON.
+ENV_DIGEST_FILE = ".env.sha256"
+# Only the tail of the hook metrics file is scanned for the last run of each hook.
+HOOK_METRICS_TAIL_BYTES = 64 * 1024
+
+
+class Metric(NamedTuple):
+    """A Prometheus metric family.
+
+    Attributes:
+        name: Name of the metric.
+        help: Description of the metric.
+        samples: Label sets and values of the metric's samples.
+    """
+
+    name: str
+    help: str
+    samples: List[Tuple[Dict[str, str], float]]
+
+
+def _digest(file: Path) -> Optional[str]:
+    """Hash the contents of a file, or return `None` if it does not exist."""
+    try:
+        return hashlib.sha256(file.read_bytes()).hexdigest()
+    except FileNotFoundError:
+        return None
+
+
+def record_env(common: Union[str, PathLike]) -> None:
+    """Record the digest of the `.env` file so later edits outside of hooks count as drift.
+
+    Args:
+        common: Path to $SNAP_COMMON.
+    """
+    common = Path(common)
+    digest = _digest(common / ".env")
+    if digest is not None:
+        (common / ENV_DIGEST_FILE).write_text(digest)
+
+
+def last_hook_runs(common: Union[str, PathLike]) -> Dict[str, Dict]:
+    """Get the `total` phase record of the last run of each hook.
+
+    Args:
+        common: Path to $SNAP_COMMON.
+    """
+    file = Path(common) / "hooks-metrics.jsonl"
+    try:
+        with file.open("rb") as f:
+            size = f.seek(0, os.SEEK_END)
+            f.seek(max(0, size - HOOK_METRICS_TAIL_BYTES))
+            lines = f.read().splitlines()
+    except FileNotFoundError:
+        return {}
+
+    if size > HOOK_METRICS_TAIL_BYTES:
+        # The first line is likely cut off.
+        lines = lines[1:]
+
+    runs = {}
+    for line in lines:
+        try:
+            record = json.loads(line)
+        except ValueError:
+            continue
+        if record.get("phase") == "total":
+            runs[record["hook"]] = record
+
+    return runs
+
+
+def collect(snap: Snap, snapctl: SnapCtlClient) -> List[Metric]:
+    """Collect the snap's health metrics.
+
+    Args:
+        snap: The Snap instance.
+        snapctl: `snapctl` client used to get the state of the snap's services.
+    """
+    from datetime import datetime
+
+    common = snap.paths.common
+    metrics = [
+        Metric(
+            "slurm_snap_service_active",
+            "Whether a service of the Slurm snap is active.",
+            [({"service": n}, float(s.active)) for n, s in sorted(snapctl.services().items())],
+        )
+    ]
+
+    runs = last_hook_runs(common)
+    metrics += [
+        Metric(
+            "slurm_snap_hook_duration_seconds",
+            "Wall time of the last run of a snap hook.",
+            [({"hook": h}, r["wall_ms"] / 1000) for h, r in sorted(runs.items())],
+        ),
+        Metric(
+            "slurm_snap_hook_last_run_timestamp_seconds",
+            "Time that the last run of a snap hook started.",
+            [
+                ({"hook": h}, datetime.fromisoformat(r["timestamp"]).timestamp())
+                for h, r in sorted(runs.items())
+            ],
+        ),
+        Metric(
+            "slurm_snap_hook_success",
+            "Whether the last run of a snap hook succeeded.",
+            [({"hook": h}, float(r["status"] == "ok")) for h, r in sorted(runs.items())],
+        ),
+    ]
+
+    try:
+        recorded = (common / ENV_DIGEST_FILE).read_text().strip()
+    except FileNotFoundError:
+        recorded = None
+    if recorded is not None:
+        drift = _digest(common / ".env") != recorded
+        metrics.append(
+            Metric(
+                "slurm_snap_env_drift",
+                "Whether the .env file changed since it was last written by a snap hook.",
+                [({}, float(drift))],
+            )
+        )
+
+    logs = []
+    for log in sorted((common / "var" / "log" / "slurm").glob("*")):
+        try:
+            st = log.stat()
+        except FileNotFoundError:
+            # Log was rotated between listing the directory and checking its size.
+            continue
+        if log.is_file():
+            logs.append(({"file": log.name}, float(st.st_size)))
+    metrics.append(
+        Metric("slurm_snap_log_size_bytes", "Size of a file under var/log/slurm.", logs)
+    )
+
+    try:
+        mtime = (common / "etc" / "munge" / "munge.key").stat().st_mtime
+        metrics.append(
+            Metric(
+                "slurm_snap_munge_key_mtime_seconds",
+                "Time that the munge key was last changed.",
+                [({}, mtime)],
+            )
+        )
+    except FileNotFoundError:
+        logging.debug("no munge key found. not reporting its modification time")
+
+    return metrics
+
+
+def _escape(value: str) -> str:
+    """Escape a label value for the Prometheus text format."""
+    return value.replace("\\", r"\\").replace("\n", r"\n").replace('"', r"\"")
+
+
+def render(metrics: List[Metric]) -> str:
+    """Render metrics in the Prometheus text exposition format.
+
+    Metrics without samples are omitted.
+
+    Args:
+        metrics: Metrics to render.
+    """
+    lines = []
+    for metric in metrics:
+        if not metric.samples:
+            continue
+        lines += [f"# HELP {metric.name} {metric.help}", f"# TYPE {metric.name} gauge"]
+        for labels, value in metric.samples:
+            label_str = ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items())
+            selector = f"{metric.name}{{{label_str}}}" if labels else metric.name
+            lines.append(f"{selector} {value!r}")
+
+    return "".join(line + "\n" for line in lines)
+
+
+def write_textfile(file: Union[str, PathLike], content: str) -> None:
+    """Atomically write a textfile so node_exporter never reads a partial file.
+
+    Args:
+        file: Path to write the textfile to.
+        content: Metrics in the Prometheus text exposition format.
+    """
+    write_atomic(file, content)
+
+
+def update(snap: Snap, snapctl: SnapCtlClient) -> None:
+    """Collect the snap's health metrics and write them to the textfile.
+
+    Args:
+        snap: The Snap instance.
+        snapctl: `snapctl` client used to get the state of the snap's services.
+    """
+    file = snap.paths.common / TEXTFILE
+    # Installations from before the directory was added to the manifest may not have it yet.
+    file.parent.mkdir(parents=True, exist_ok=True)
+    write_textfile(file, render(collect(snap, snapctl)))
+    logging.debug("wrote snap metrics to %s", file)
+
+
+def main() -> None:
+    """Entrypoint for the `metrics` snap app."""
+    logging.basicConfig(format="%(levelname)s %(message)s", level=logging.INFO)
+    snap = Snap()
+    update(snap, SnapCtlClient(snap))
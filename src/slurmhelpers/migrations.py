@@ -0,0 +1,148 @@
+# Copyright 2025 Canonical Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Versioned, incremental migrations of the Slurm snap's `.env` file.
+
+Each migration brings the state under $SNAP_COMMON from one schema version
+to the next. The schema version is stored in the `.env` file, so migrations
+that have already been applied are skipped. New migrations must be appended
+to `MIGRATIONS`; existing migrations must never be reordered or removed.
+"""
+
+import logging
+from typing import Callable, List
+
+from snaphelpers import Snap
+
+from .config import ConfigStore
+from .restart import RestartPlanner
+
+# Key that the schema version of the `.env` file is stored under.
+SCHEMA_KEY = "ENV_SCHEMA_VERSION"
+
+
+def _auto_size_defaults(snap: Snap, store: ConfigStore, restarts: RestartPlanner) -> None:
+    """Switch installations that still use the original fixed defaults to automatic sizing."""
+    from .models import Munged, Slurmrestd
+
+    if store.get("MUNGED_MAX_THREAD_COUNT_AUTO") is None:
+        munged = Munged(snap, store, restarts)
+        if store.get("MUNGED_MAX_THREAD_COUNT") in (None, "1"):
+            munged.max_thread_count = "auto"
+            logging.warning(
+                "switched `munged.max-thread-count` from the original default of 1 to auto (%s). "
+                "set `munged.max-thread-count` to keep a fixed thread count",
+                munged.max_thread_count,
+            )
+        else:
+            store.set("MUNGED_MAX_THREAD_COUNT_AUTO", "false")
+
+    if store.get("SLURMRESTD_PROFILE") is None:
+        slurmrestd = Slurmrestd(snap, store, restarts)
+        connections = store.get("SLURMRESTD_MAX_CONNECTIONS")
+        threads = store.get("SLURMRESTD_MAX_THREAD_COUNT")
+        if connections in (None, "124") and threads in (None, "20"):
+            slurmrestd.profile = "balanced"
+            slurmrestd.max_thread_count = "auto"
+            slurmrestd.max_connections = "auto"
+            logging.warning(
+                "switched `slurmrestd` from the original defaults of 20 threads and 124 "
+                "connections to the `balanced` profile (%s threads, %s connections). "
+                "set `slurmrestd.max-thread-count` and `slurmrestd.max-connections` "
+                "to keep fixed values",
+                slurmrestd.max_thread_count,
+                slurmrestd.max_connections,
+            )
+        else:
+            # Keep customized values, but record the profile explicitly.
+            store.set("SLURMRESTD_PROFILE", "balanced")
+            store.set("SLURMRESTD_MAX_CONNECTIONS_AUTO", "false")
+            store.set("SLURMRESTD_MAX_THREAD_COUNT_AUTO", "false")
+
+
+def _render_logrotate(snap: Snap, store: ConfigStore, restarts: RestartPlanner) -> None:
+    """Render the `logrotate` configuration from the compression-aware template."""
+    from .models import Logrotate
+
+    Logrotate(snap, store, restarts).write_config()
+
+
+def _render_slurmctld_profile(snap: Snap, store: ConfigStore, restarts: RestartPlanner) -> None:
+    """Render the managed `slurm.conf` include so that `slurm.conf` can include it."""
+    from .models import Slurmctld
+
+    Slurmctld(snap, store, restarts).write_profile()
+
+
+def _render_slurmdbd_tuning(snap: Snap, store: ConfigStore, restarts: RestartPlanner) -> None:
+    """Render the managed `slurmdbd.conf` include so that `slurmdbd.conf` can include it."""
+    from .models import Slurmdbd
+
+    Slurmdbd(snap, store, restarts).write_tuning()
+
+
+def _split_slurmrestd_budget(snap: Snap, store: ConfigStore, restarts: RestartPlanner) -> None:
+    """Record the per-worker budget of `slurmrestd` read by its wrapper."""
+    from .models import Slurmrestd
+
+    Slurmrestd(snap, store, restarts).render_worker_budget()
+
+
+# Migrations in order. Migration `n` brings the `.env` file to schema version `n + 1`.
+MIGRATIONS: List[Callable[[Snap, ConfigStore, RestartPlanner], None]] = [
+    _auto_size_defaults,
+    _render_logrotate,
+    _render_slurmctld_profile,
+    _render_slurmdbd_tuning,
+    _split_slurmrestd_budget,
+]
+
+# Schema version of a fresh installation.
+LATEST = len(MIGRATIONS)
+
+
+def version(store: ConfigStore) -> int:
+    """Get the schema version of the `.env` file.
+
+    Args:
+        store: The snap's configuration store.
+    """
+    return int(store.get(SCHEMA_KEY) or 0)
+
+
+def migrate(snap: Snap, store: ConfigStore, restarts: RestartPlanner) -> int:
+    """Apply the migrations that have not been applied to the `.env` file yet.
+
+    Args:
+        snap: The Snap instance.
+        store: The snap's configuration store.
+        restarts: The hook's restart planner.
+
+    Returns:
+        The number of migrations applied.
+    """
+    current = version(store)
+    pending = MIGRATIONS[current:]
+    if not pending:
+        logging.debug("snap configuration is at schema version %s. nothing to migrate", current)
+        return 0
+
+    for n, migration in enumerate(pending, start=current + 1):
+        logging.info(
+            "migrating snap configuration to schema version %s: %s", n, migration.__name__
+        )
+        migration(snap, store, restarts)
+        store.set(SCHEMA_KEY, str(n))
+
+    return len(pending)
@@ -15,27 +15,187 @@
 """Models for managing lifecycle operations inside the Slurm snap."""
 
 import logging
-import subprocess
+import os
+import re
+import string
 from abc import ABC, abstractmethod
-from typing import Dict, List, Optional
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple, Union
 
-import dotenv
 from snaphelpers import Snap
 
+from . import host, munge, profiling
+from .config import ConfigStore, write_atomic
+from .options import Option, diff, register, validate
+from .restart import RestartPlanner
+
+if TYPE_CHECKING:
+    from .probe import ProbeResult
+
+_RETENTION_RE = re.compile(r"^\d+(hours|days|months)$")
+
+
+def _check_config_server(v: str) -> None:
+    """Check that each controller in a configuration server list is a valid address."""
+    from . import probe
+
+    for server in v.split(","):
+        if server.strip():
+            probe.parse_server(server)
+
+
+def _check_listen_address(v: str) -> None:
+    """Check that a listen address is in `[host]:port` format."""
+    host, sep, port = v.rpartition(":")
+    if (
+        not sep
+        or any(c.isspace() for c in host)
+        or not port.isdigit()
+        or not 0 < int(port) < 65536
+    ):
+        raise ValueError(f"invalid listen address {v}. expected [host]:port")
+
+
+def _check_size(v: str) -> None:
+    """Check that a size is a valid `logrotate` size, e.g. `5M`."""
+    from .logwatch import parse_size
+
+    parse_size(v)
+
+
+def _check_rest_listen(v: str) -> None:
+    """Check that each `slurmrestd` listener is either `[host]:port` or `unix:/path`."""
+    from .restd import parse_listeners
+
+    parse_listeners(v)
+
+
+def _check_ttl(v: str) -> None:
+    """Check that a cache time-to-live list is `<endpoint>=<seconds>,...`."""
+    from .restproxy import parse_ttls
+
+    parse_ttls(v)
+
+
+def _check_collectors(v: str) -> None:
+    """Check that a comma-separated list only contains optional exporter collectors."""
+    if unknown := [
+        c for c in v.split(",") if c and c not in PrometheusSlurmExporter.collector_flags
+    ]:
+        raise ValueError(
+            f"invalid collectors {', '.join(unknown)}. "
+            f"expected any of {', '.join(PrometheusSlurmExporter.collector_flags)}"
+        )
+
+
+def _check_cpu_affinity(v: str) -> None:
+    """Check that a CPU list only contains CPUs that are online on the host."""
+    if not v:
+        return
+    if offline := sorted(host.parse_cpu_list(v) - host.online_cpus()):
+        raise ValueError(
+            f"invalid cpu affinity {v}. cpus {','.join(map(str, offline))} are not online"
+        )
+
+
+def _check_ionice(v: str) -> None:
+    """Check that an I/O scheduling setting is `<class>[:<level>]`, e.g. `best-effort:4`."""
+    if not v:
+        return
+    cls, sep, level = v.partition(":")
+    if cls == "idle" and not sep:
+        return
+    if cls in ("best-effort", "realtime") and (not sep or (level.isdigit() and int(level) <= 7)):
+        return
+    raise ValueError(
+        f"invalid ionice {v}. expected idle, best-effort[:<0-7>], or realtime[:<0-7>]"
+    )
+
+
+def _placement_options(namespace: str, prefix: str) -> List[Option]:
+    """Create the CPU affinity, nice, and I/O scheduling options of a daemon.
+
+    Args:
+        namespace: Namespace of the options, which is also the name of the daemon.
+        prefix: Prefix of the options' `.env` keys, e.g. `MUNGED`.
+    """
+    return [
+        Option(
+            namespace,
+            "cpu-affinity",
+            f"{prefix}_CPU_AFFINITY",
+            default="",
+            services=(namespace,),
+            check=_check_cpu_affinity,
+        ),
+        Option(
+            namespace,
+            "nice",
+            f"{prefix}_NICE",
+            int,
+            default=0,
+            minimum=-20,
+            maximum=19,
+            services=(namespace,),
+        ),
+        Option(
+            namespace,
+            "ionice",
+            f"{prefix}_IONICE",
+            default="",
+            services=(namespace,),
+            check=_check_ionice,
+        ),
+    ]
+
+
+def _check_purge_after(v: str) -> None:
+    """Check that a purge policy maps record types to retention periods, e.g. `job=12months`."""
+    for policy in v.split(","):
+        if not policy:
+            continue
+        record, sep, period = policy.partition("=")
+        if record not in Slurmdbd.record_types or not _RETENTION_RE.match(period):
+            raise ValueError(
+                f"invalid purge policy {policy}. expected <record>=<n>hours|days|months "
+                f"with record one of {', '.join(Slurmdbd.record_types)}"
+            )
+
+
+def _check_archive(v: str) -> None:
+    """Check that a comma-separated list only contains `slurmdbd` record types."""
+    if unknown := [r for r in v.split(",") if r and r not in Slurmdbd.record_types]:
+        raise ValueError(
+            f"invalid record types {', '.join(unknown)}. "
+            f"expected any of {', '.join(Slurmdbd.record_types)}"
+        )
+
 
 class _BaseModel(ABC):
 
-    def __init__(self, snap: Snap) -> None:
+    # Namespace of the model's snap configuration options, e.g. `slurmd`.
+    namespace = ""
+    # Snap configuration options managed by the model, keyed by name.
+    options: Dict[str, Option] = {}
+
+    def __init__(
+        self,
+        snap: Snap,
+        store: Optional[ConfigStore] = None,
+        restarts: Optional[RestartPlanner] = None,
+    ) -> None:
         self._snap = snap
-        self._env_file = snap.paths.common / ".env"
+        self._store = store if store is not None else ConfigStore(snap.paths.common / ".env")
+        self._restarts = restarts if restarts is not None else RestartPlanner(snap)
+        self._snapctl = self._restarts.snapctl
 
-    def _get_config(self, key: str) -> str:
+    def _get_config(self, key: str) -> Optional[str]:
         """Get a global configuration value.
 
         Args:
             key: Key of configuration value to retrieve from the .env file.
         """
-        return dotenv.get_key(self._env_file, key)
+        return self._store.get(key)
 
     def _set_config(self, key: str, value: str) -> None:
         """Set the global configuration of the Slurm snap.
@@ -46,12 +206,105 @@ class _BaseModel(ABC):
         values. These configuration values are used by service wrappers
         to control how the wrapped service is launched by the snap.
 
+        The value is staged in the model's `ConfigStore`. It is written
+        to the `.env` file when the store is committed.
+
         Args:
             key: Configuration to update/set.
             value: Value to set for configuration.
         """
         logging.info("setting %s to %s", key, value if value != "" else "''")
-        dotenv.set_key(self._env_file, key, value)
+        self._store.set(key, value)
+
+    def _get_option(self, name: str) -> Any:
+        """Get the value of a snap configuration option, or its default if unset.
+
+        Args:
+            name: Name of the option, e.g. `max-thread-count`.
+        """
+        return self.options[name].value(self._store)
+
+    def _set_option(self, name: str, value: Any) -> bool:
+        """Set the value of a snap configuration option.
+
+        The value is converted to the option's type before it is compared
+        with the current value, so an unchanged `"20"` is not a change.
+        The option's services are marked as needing a restart if the value changed.
+
+        Args:
+            name: Name of the option, e.g. `max-thread-count`.
+            value: New value of the option.
+
+        Returns:
+            Whether the value of the option changed.
+
+        Raises:
+            ValueError: Raised if the value is invalid for the option.
+        """
+        option = self.options[name]
+        v = option.coerce(value)
+        if option.value(self._store) == v:
+            logging.debug("no change for `%s.%s`. not updating", self.namespace, name)
+            return False
+
+        self._set_config(option.key, str(v))
+        if option.services:
+            self._needs_restart(list(option.services))
+        return True
+
+    def _set_auto(self, name: str, auto: bool) -> None:
+        """Set whether a snap configuration option is automatically sized.
+
+        Args:
+            name: Name of the option, e.g. `max-thread-count`.
+            auto: Whether the option is automatically sized.
+        """
+        option = self.options[name]
+        if (self._get_config(option.auto_key) == "true") != auto:
+            self._set_config(option.auto_key, str(auto).lower())
+
+    def _apply(self, config: Dict[str, Any]) -> Dict[str, Any]:
+        """Apply the options in a snap configuration payload that differ from their current value.
+
+        The whole payload is validated before any option is applied.
+
+        Args:
+            config: Snap configuration options in the model's namespace.
+
+        Returns:
+            The options that were applied.
+
+        Raises:
+            AttributeError: Raised if the payload contains unrecognized options.
+            ValueError: Raised if the payload contains invalid values.
+        """
+        changes = diff(self._store, validate({self.namespace: config})).get(self.namespace, {})
+        for name, value in changes.items():
+            with profiling.phase(f"{self.namespace}.{name}"):
+                setattr(self, self.options[name].attr, value)
+
+        return changes
+
+    def _write_managed(self, file: Path, content: str) -> bool:
+        """Atomically write a configuration file managed by the snap, if its content changed.
+
+        Args:
+            file: Path to the managed file.
+            content: Rendered content of the file.
+
+        Returns:
+            Whether the file was written.
+        """
+        try:
+            if file.read_text() == content:
+                logging.debug("%s is up to date. not writing", file)
+                return False
+        except FileNotFoundError:
+            pass
+
+        logging.info("writing managed configuration file %s", file)
+        write_atomic(file, content)
+        return True
 
     @abstractmethod
     def update_config(self, config: Dict[str, str]) -> None:  # pragma: no cover
@@ -65,44 +318,303 @@ class _BaseModel(ABC):
         raise NotImplementedError
 
     def _needs_restart(self, services: List[str]) -> None:
-        """Determine if specified list of services needs to be restarted.
+        """Mark the specified list of services as needing to be restarted.
 
         Args:
-            services: List of servers to check status of. If the service is active,
-                log that the service needs to be restarted to the log file.
+            services: List of services to restart once the latest configuration
+                changes have been committed. Only services that are active will
+                be restarted by the model's `RestartPlanner`.
         """
         for service in services:
-            if self._snap.services.list()[service].active:
-                logging.info(
-                    "service `%s` must be restarted to apply latest configuration changes",
-                    service,
-                )
+            logging.info(
+                "service `%s` must be restarted to apply latest configuration changes",
+                service,
+            )
+        self._restarts.request(*services)
 
 
-class Munged(_BaseModel):
-    """Manage lifecycle operations for the munge daemon."""
+class _DaemonModel(_BaseModel):
+    """Base model for daemons whose CPU affinity and priorities are set by their wrapper.
 
-    def __init__(self, *args) -> None:
-        super().__init__(*args)
+    Models of daemons must register the options created by `_placement_options`.
+    """
 
     @property
-    def max_thread_count(self) -> Optional[int]:
-        """Get the number of threads to spawn for processing credential requests."""
-        v = self._get_config("MUNGE_MAX_THREAD_COUNT")
+    def cpu_affinity(self) -> str:
+        """Get the CPUs that the daemon is pinned to. Empty if the daemon is not pinned."""
+        return self._get_option("cpu-affinity")
+
+    @cpu_affinity.setter
+    def cpu_affinity(self, v: str) -> None:
+        """Set the CPUs to pin the daemon to as a CPU list, e.g. `0-1`.
+
+        Every CPU in the list must be online. Set to an empty string to unpin the daemon.
+        """
+        self._set_option("cpu-affinity", v)
+
+    @property
+    def nice(self) -> int:
+        """Get the nice value that the daemon runs with."""
+        return self._get_option("nice")
+
+    @nice.setter
+    def nice(self, v: int) -> None:
+        """Set the nice value that the daemon runs with, from -20 to 19."""
+        self._set_option("nice", v)
+
+    @property
+    def ionice(self) -> str:
+        """Get the I/O scheduling class and level that the daemon runs with."""
+        return self._get_option("ionice")
+
+    @ionice.setter
+    def ionice(self, v: str) -> None:
+        """Set the I/O scheduling class and level that the daemon runs with.
+
+        Args:
+            v: `idle`, `best-effort[:<level>]`, or `realtime[:<level>]` with a level
+                from 0 (highest priority) to 7. Set to an empty string for the default.
+        """
+        self._set_option("ionice", v)
+
+
+class Logrotate(_BaseModel):
+    """Manage the `logrotate` configuration for the Slurm daemons' log files."""
+
+    # Compression engines and the multithreaded compressors that implement them:
+    # (command, file extension, default level, minimum level, maximum level, threads flag).
+    engines = {
+        "zstd": ("usr/bin/zstd", ".zst", 3, 1, 19, "-T{}"),
+        "xz": ("usr/bin/xz", ".xz", 6, 0, 9, "-T{}"),
+        "gzip": ("usr/bin/pigz", ".gz", 6, 1, 9, "-p {}"),
+        "bzip2": ("usr/bin/lbzip2", ".bz2", 9, 1, 9, "-n {}"),
+    }
+
+    namespace = "logrotate"
+    options = register(
+        Option(
+            "logrotate",
+            "compression",
+            "LOGROTATE_COMPRESSION",
+            default="bzip2",
+            choices=(*engines, "none"),
+        ),
+        # Bounds of the selected engine are checked when the configuration is rendered.
+        Option(
+            "logrotate",
+            "compression-level",
+            "LOGROTATE_COMPRESSION_LEVEL",
+            int,
+            minimum=0,
+            maximum=19,
+        ),
+        Option(
+            "logrotate",
+            "compression-threads",
+            "LOGROTATE_COMPRESSION_THREADS",
+            int,
+            default=1,
+            minimum=1,
+        ),
+        Option(
+            "logrotate", "trigger", "LOGROTATE_TRIGGER", default="daily", choices=("daily", "size")
+        ),
+        Option(
+            "logrotate",
+            "max-size",
+            "LOGROTATE_MAX_SIZE",
+            default="5M",
+            services=("logrotate-watch",),
+            check=_check_size,
+        ),
+        Option(
+            "logrotate",
+            "check-interval",
+            "LOGROTATE_CHECK_INTERVAL",
+            int,
+            default=30,
+            minimum=1,
+            services=("logrotate-watch",),
+        ),
+    )
+
+    @property
+    def compression(self) -> str:
+        """Get the compression engine used to compress rotated log files."""
+        return self._get_option("compression")
+
+    @compression.setter
+    def compression(self, v: str) -> None:
+        """Set the compression engine used to compress rotated log files.
+
+        Set to `none` to disable compression.
+        """
+        self._set_option("compression", v)
+
+    @property
+    def compression_level(self) -> int:
+        """Get the compression level. Defaults to the engine's default level."""
+        v = self._get_option("compression-level")
         if v is None:
+            return self.engines.get(self.compression, self.engines["bzip2"])[2]
+
+        return v
+
+    @compression_level.setter
+    def compression_level(self, v: int) -> None:
+        """Set the compression level."""
+        self._set_option("compression-level", v)
+
+    @property
+    def compression_threads(self) -> int:
+        """Get the number of threads used to compress a rotated log file."""
+        return self._get_option("compression-threads")
+
+    @compression_threads.setter
+    def compression_threads(self, v: int) -> None:
+        """Set the number of threads used to compress a rotated log file."""
+        self._set_option("compression-threads", v)
+
+    @property
+    def trigger(self) -> str:
+        """Get what triggers log rotation.
+
+        `daily` checks log sizes once a day at midnight. `size` continuously
+        watches log sizes with the `logrotate-watch` service.
+        """
+        return self._get_option("trigger")
+
+    @trigger.setter
+    def trigger(self, v: str) -> None:
+        """Set what triggers log rotation."""
+        if not self._set_option("trigger", v):
             return
 
-        return int(v)
+        # Started or stopped with the hook's restarts, once the configuration is committed.
+        if v == "size":
+            self._restarts.start("logrotate-watch")
+        else:
+            self._restarts.stop("logrotate-watch")
+
+    @property
+    def max_size(self) -> str:
+        """Get the size that log files are rotated at, e.g. `100k`, `5M`, or `1G`."""
+        return self._get_option("max-size")
+
+    @max_size.setter
+    def max_size(self, v: str) -> None:
+        """Set the size that log files are rotated at."""
+        self._set_option("max-size", v)
+
+    @property
+    def check_interval(self) -> int:
+        """Get the number of seconds between log size checks by `logrotate-watch`."""
+        return self._get_option("check-interval")
+
+    @check_interval.setter
+    def check_interval(self, v: int) -> None:
+        """Set the number of seconds between log size checks by `logrotate-watch`."""
+        self._set_option("check-interval", v)
+
+    def _render_compression(self) -> str:
+        """Render the compression directives of the `logrotate` configuration."""
+        if self.compression == "none":
+            return "nocompress"
+
+        command, ext, _, lower, upper, threads = self.engines[self.compression]
+        if not lower <= self.compression_level <= upper:
+            raise ValueError(
+                f"invalid {self.compression} compression level {self.compression_level}. "
+                f"expected a level between {lower} and {upper}"
+            )
+
+        return "\n    ".join(
+            [
+                "compress",
+                "delaycompress",
+                f"compresscmd {self._snap.paths.snap / command}",
+                f"compressoptions -{self.compression_level} "
+                + threads.format(self.compression_threads),
+                f"compressext {ext}",
+            ]
+        )
+
+    def write_config(self) -> None:
+        """Render the `logrotate` configuration from the current settings."""
+        logging.info("rendering `logrotate` configuration")
+        tmpl = (self._snap.paths.snap / "templates" / "logrotate.conf.tmpl").read_text()
+        config = string.Template(tmpl).safe_substitute(
+            SNAP=self._snap.paths.snap,
+            SNAP_COMMON=self._snap.paths.common,
+            MAX_SIZE=self.max_size,
+            COMPRESSION=self._render_compression(),
+        )
+        (self._snap.paths.common / "etc" / "logrotate" / "logrotate.conf").write_text(config)
+
+    def update_config(self, config: Dict[str, str]) -> None:
+        """Update configuration for `logrotate`."""
+        self._apply(config)
+        if self._store.dirty & {
+            "LOGROTATE_COMPRESSION",
+            "LOGROTATE_COMPRESSION_LEVEL",
+            "LOGROTATE_COMPRESSION_THREADS",
+            "LOGROTATE_MAX_SIZE",
+        }:
+            self.write_config()
+
+
+class Munged(_DaemonModel):
+    """Manage lifecycle operations for the munge daemon."""
+
+    namespace = "munged"
+    options = register(
+        Option(
+            "munged",
+            "max-thread-count",
+            "MUNGED_MAX_THREAD_COUNT",
+            int,
+            minimum=1,
+            auto=True,
+            services=("munged",),
+        ),
+        *_placement_options("munged", "MUNGED"),
+    )
+
+    @property
+    def max_thread_count(self) -> Optional[int]:
+        """Get the number of threads to spawn for processing credential requests."""
+        return self._get_option("max-thread-count")
 
     @max_thread_count.setter
-    def max_thread_count(self, v: int) -> None:
-        """Set the number of threads to spawn for processing credential requests."""
-        if self.max_thread_count == v:
-            logging.debug("No change for `munged` max thread count. Not updating.")
-            return
+    def max_thread_count(self, v: Union[int, str]) -> None:
+        """Set the number of threads to spawn for processing credential requests.
 
-        self._set_config("MUNGED_MAX_THREAD_COUNT", str(v))
-        self._needs_restart(["munged"])
+        If set to `auto`, the thread count is derived from the number of CPUs
+        available on the host, and re-evaluated each time the snap is configured.
+        """
+        auto = v == "auto"
+        self._set_auto("max-thread-count", auto)
+        if auto:
+            cpus = host.cpu_count()
+            v = max(2, min(cpus // 2, 32))
+            logging.info("derived `munged` max thread count %s from %s available cpus", v, cpus)
+
+        self._set_option("max-thread-count", v)
+
+    @property
+    def max_thread_count_auto(self) -> bool:
+        """Get whether the number of threads is automatically sized for the host."""
+        return self._get_config("MUNGED_MAX_THREAD_COUNT_AUTO") == "true"
+
+    @property
+    def key_file(self) -> Path:
+        """Get the path to the munge key used by `munged`."""
+        return self._snap.paths.common / "etc" / "munge" / "munge.key"
+
+    @property
+    def staged_key_file(self) -> Path:
+        """Get the path to the drop file that a new munge key is staged in before rotation."""
+        return self._snap.paths.common / "etc" / "munge" / "munge.key.new"
 
     def generate_key(self) -> None:
         """Generate a default munge.key secret for the munge daemon upon installation.
@@ -110,113 +622,863 @@ class Munged(_BaseModel):
         Replicates the daemon autostart feature from the  munge Debian package.
         """
         logging.info("generating new secret key file for service `munged`")
-        try:
-            subprocess.check_output(
-                [
-                    "mungectl",
-                    "key",
-                    f"--keyfile={self._snap.paths.common / 'etc/munge/munge.key'}",
-                    "generate",
-                ]
-            )
-        except subprocess.CalledProcessError as e:
-            logging.error("failed to generate a new munge key. reason %s", e)
-            raise
+        munge.write_key(self.key_file)
+        self._needs_restart(["munged"])
+
+    def stage_key(self, key: Optional[bytes] = None) -> None:
+        """Stage a new munge key for rotation.
+
+        Args:
+            key: Key to stage. A random key is generated if `None`.
+        """
+        logging.info("staging new munge key in %s", self.staged_key_file)
+        munge.write_key(self.staged_key_file, key)
+
+    def rotate_key(self) -> None:
+        """Swap the staged munge key in for the current key.
 
+        Raises:
+            FileNotFoundError: Raised if no munge key has been staged.
+        """
+        if not self.staged_key_file.exists():
+            raise FileNotFoundError(f"no munge key staged in {self.staged_key_file}")
+
+        logging.info("rotating munge key for service `munged`")
+        os.replace(self.staged_key_file, self.key_file)
         self._needs_restart(["munged"])
 
     def update_config(self, config: Dict[str, str]) -> None:
         """Update configuration for the `munged` service."""
-        for k in config.keys():
-            match k:
-                case "max-thread-count":
-                    self.max_thread_count = config[k]
-                case _:
-                    raise AttributeError(f"Unrecognized configuration option {k}")
+        changes = self._apply(config)
+        if "max-thread-count" not in changes and self.max_thread_count_auto:
+            # Available CPUs may have changed since the thread count was last derived.
+            with profiling.phase("munged.max-thread-count"):
+                self.max_thread_count = "auto"
+
+
+class PrometheusSlurmExporter(_BaseModel):
+    """Manage lifecycle operations for the Prometheus Slurm exporter."""
+
+    # Optional collectors and the exporter flags that enable them. Jobs, nodes,
+    # and partitions are always collected.
+    collector_flags = {
+        "diags": "-slurm.collect-diags",
+        "licenses": "-slurm.collect-licenses",
+        "limits": "-slurm.collect-limits",
+    }
+
+    namespace = "prometheus-slurm-exporter"
+    options = register(
+        Option(
+            "prometheus-slurm-exporter",
+            "listen-address",
+            "PROMETHEUS_SLURM_EXPORTER_LISTEN_ADDRESS",
+            default=":9092",
+            services=("prometheus-slurm-exporter",),
+            check=_check_listen_address,
+        ),
+        Option(
+            "prometheus-slurm-exporter",
+            "poll-interval",
+            "PROMETHEUS_SLURM_EXPORTER_POLL_INTERVAL",
+            int,
+            default=10,
+            minimum=1,
+            services=("prometheus-slurm-exporter",),
+        ),
+        Option(
+            "prometheus-slurm-exporter",
+            "collectors",
+            "PROMETHEUS_SLURM_EXPORTER_COLLECTORS",
+            default="",
+            services=("prometheus-slurm-exporter",),
+            check=_check_collectors,
+        ),
+    )
+
+    @property
+    def listen_address(self) -> str:
+        """Get the address that the exporter serves metrics on."""
+        return self._get_option("listen-address")
+
+    @listen_address.setter
+    def listen_address(self, v: str) -> None:
+        """Set the address that the exporter serves metrics on, e.g. `:9092`."""
+        self._set_option("listen-address", v)
+
+    @property
+    def poll_interval(self) -> int:
+        """Get the minimum number of seconds between polls of `slurmctld`."""
+        return self._get_option("poll-interval")
+
+    @poll_interval.setter
+    def poll_interval(self, v: int) -> None:
+        """Set the minimum number of seconds between polls of `slurmctld`.
+
+        Scrapes within the interval are answered from the exporter's cache
+        of the last poll instead of querying `slurmctld` again.
+        """
+        self._set_option("poll-interval", v)
+
+    @property
+    def collectors(self) -> List[str]:
+        """Get the optional collectors that are enabled."""
+        return [c for c in self._get_option("collectors").split(",") if c]
+
+    @collectors.setter
+    def collectors(self, v: str) -> None:
+        """Set the optional collectors to enable as a comma-separated list, e.g. `diags,limits`.
+
+        Each enabled collector adds queries against `slurmctld` to every poll.
+        """
+        self._set_option("collectors", v)
+
+    @property
+    def args(self) -> Optional[str]:
+        """Get the command line arguments rendered for the exporter."""
+        return self._get_config("PROMETHEUS_SLURM_EXPORTER_ARGS")
+
+    def render_args(self) -> None:
+        """Render the exporter's command line arguments from the current settings."""
+        args = [
+            f"-web.listen-address={self.listen_address}",
+            f"-slurm.poll-limit={self.poll_interval}",
+            *(self.collector_flags[c] for c in sorted(set(self.collectors))),
+        ]
+        v = " ".join(args)
+        if self.args == v:
+            logging.debug("no change for `prometheus-slurm-exporter` arguments. not updating")
+            return
+
+        self._set_config("PROMETHEUS_SLURM_EXPORTER_ARGS", v)
+        self._needs_restart(["prometheus-slurm-exporter"])
+
+    def update_config(self, config: Dict[str, str]) -> None:
+        """Update configuration for the `prometheus-slurm-exporter` service."""
+        self._apply(config)
+        if self._store.dirty & {option.key for option in self.options.values()}:
+            self.render_args()
+
+
+class Slurmctld(_BaseModel):
+    """Manage lifecycle operations for the slurmctld daemon."""
+
+    # Scheduler settings of each performance profile, rendered into the managed
+    # `slurm.conf` include. See https://slurm.schedmd.com/high_throughput.html
+    # and https://slurm.schedmd.com/big_sys.html for the guidance behind them.
+    profiles: Dict[str, Dict[str, str]] = {
+        # Leave Slurm's defaults untouched.
+        "default": {},
+        # Many short jobs: defer and batch scheduling attempts, purge finished
+        # jobs sooner, and rate limit users flooding `slurmctld` with RPCs.
+        "htc": {
+            "SchedulerParameters": (
+                "defer,batch_sched_delay=20,sched_min_interval=2000000,"
+                "default_queue_depth=1000,max_rpc_cnt=400"
+            ),
+            "SlurmctldParameters": (
+                "enable_rpc_queue,rl_enable,rl_bucket_size=100,rl_refill_rate=20"
+            ),
+            "MessageTimeout": "30",
+            "MaxJobCount": "200000",
+            "MinJobAge": "60",
+        },
+        # Many nodes: keep the backfill scheduler responsive and tolerate slow
+        # communication with a large number of `slurmd`s.
+        "large-cluster": {
+            "SchedulerParameters": (
+                "defer,bf_continue,bf_interval=60,bf_max_job_test=1000,"
+                "sched_min_interval=1000000,max_rpc_cnt=150"
+            ),
+            "SlurmctldParameters": "enable_rpc_queue,rl_enable",
+            "MessageTimeout": "60",
+            "TCPTimeout": "5",
+            "SlurmdTimeout": "600",
+        },
+    }
+
+    namespace = "slurmctld"
+    options = register(
+        # `slurmctld` is restarted when the rendered include changes, not when the option does.
+        Option(
+            "slurmctld",
+            "profile",
+            "SLURMCTLD_PROFILE",
+            default="default",
+            choices=tuple(profiles),
+        ),
+    )
+
+    @property
+    def profile(self) -> str:
+        """Get the performance profile of `slurmctld`."""
+        return self._get_option("profile")
+
+    @profile.setter
+    def profile(self, v: str) -> None:
+        """Set the performance profile of `slurmctld`.
+
+        Can be `default`, `htc` for high-throughput computing, or `large-cluster`.
+        """
+        self._set_option("profile", v)
+
+    @property
+    def profile_file(self) -> Path:
+        """Get the path to the managed `slurm.conf` include with the profile's settings."""
+        return self._snap.paths.common / "etc" / "slurm" / "slurmctld-profile.conf"
+
+    def render_profile(self) -> str:
+        """Render the managed `slurm.conf` include for the current profile."""
+        lines = [
+            "# Managed by the Slurm snap. Do not edit.",
+            "# Change with `snap set slurm slurmctld.profile=<profile>`.",
+            f"# Profile: {self.profile}",
+            *(f"{k}={v}" for k, v in self.profiles[self.profile].items()),
+        ]
+        return "".join(line + "\n" for line in lines)
+
+    def write_profile(self) -> None:
+        """Write the managed `slurm.conf` include, and restart `slurmctld` if it changed."""
+        if self._write_managed(self.profile_file, self.render_profile()):
+            self._needs_restart(["slurmctld"])
+
+    def update_config(self, config: Dict[str, str]) -> None:
+        """Update configuration for the `slurmctld` service."""
+        self._apply(config)
+        if "SLURMCTLD_PROFILE" in self._store.dirty:
+            self.write_profile()
 
 
-class Slurmd(_BaseModel):
+class Slurmd(_DaemonModel):
     """Manage lifecycle operations for the slurmd daemon."""
 
+    namespace = "slurmd"
+    options = register(
+        Option(
+            "slurmd",
+            "config-server",
+            "SLURMD_CONFIG_SERVER",
+            services=("slurmd",),
+            check=_check_config_server,
+        ),
+        Option(
+            "slurmd",
+            "config-server-order",
+            "SLURMD_CONFIG_SERVER_ORDER",
+            default="given",
+            choices=("given", "latency"),
+        ),
+        *_placement_options("slurmd", "SLURMD"),
+    )
+
     @property
     def config_server(self) -> Optional[str]:
         """Get comma-separated list of Slurm controllers.
 
         First controller in the list is the primary controller.
         """
-        return self._get_config("SLURMD_CONFIG_SERVER")
+        return self._get_option("config-server")
 
     @config_server.setter
     def config_server(self, v: str) -> None:
         """Set comma-separated list of Slurm controllers.
 
-        First controller in the list is the primary controller.
+        First controller in the list is the primary controller. If `config_server_order`
+        is `latency`, the controllers are probed and reordered by their round-trip time.
+        The controllers are only probed again if the set of controllers or the ordering
+        changes, so `slurmd` is not restarted because of jitter between probes.
+        """
+        v = self.options["config-server"].coerce(v)
+        if self.config_server_order == "latency" and v:
+            servers = [s.strip() for s in v.split(",") if s.strip()]
+            current = [s for s in (self.config_server or "").split(",") if s]
+            if (
+                sorted(servers) != sorted(current)
+                or "SLURMD_CONFIG_SERVER_ORDER" in self._store.dirty
+            ):
+                from .probe import rank
+
+                servers = rank(self.probe_config_servers(servers))
+            else:
+                # Keep the previously ranked order.
+                servers = current
+            v = ",".join(servers)
+
+        self._check_controllers(v)
+        self._set_option("config-server", v)
+
+    @property
+    def config_server_order(self) -> str:
+        """Get how the list of Slurm controllers is ordered."""
+        return self._get_option("config-server-order")
+
+    @config_server_order.setter
+    def config_server_order(self, v: str) -> None:
+        """Set how the list of Slurm controllers is ordered.
+
+        Args:
+            v: `given` to use the list as is, or `latency` to order the
+                controllers by reachability and round-trip time.
         """
-        if self.config_server == v:
-            logging.debug("no change for `slurmd` configuration server list. not updating")
+        self._set_option("config-server-order", v)
+
+    def _check_controllers(self, v: str) -> None:
+        """Warn about controllers that are not a `SlurmctldHost` in the local `slurm.conf`.
+
+        Nodes in configless mode have no local `slurm.conf`, so nothing is checked.
+        """
+        file = self._snap.paths.common / "etc" / "slurm" / "slurm.conf"
+        if not v or not file.exists():
+            return
+
+        from . import slurmconf
+        from .probe import parse_server
+
+        try:
+            conf = slurmconf.load(file, slurmconf.cache_file(self._snap.paths.common))
+        except (OSError, ValueError) as e:
+            logging.warning("cannot check controllers against %s. reason %s", file, e)
             return
 
-        self._set_config("SLURMD_CONFIG_SERVER", str(v))
-        self._needs_restart(["slurmd"])
+        if controllers := conf.controllers:
+            for server in v.split(","):
+                host, _ = parse_server(server)
+                if host not in controllers:
+                    logging.warning(
+                        "controller %s is not a SlurmctldHost in %s. expected one of %s",
+                        host,
+                        file,
+                        ", ".join(controllers),
+                    )
+
+    def probe_config_servers(self, servers: Optional[List[str]] = None) -> List["ProbeResult"]:
+        """Probe the `slurmctld` port of each Slurm controller concurrently.
+
+        Args:
+            servers: Controllers to probe. Defaults to the configured controllers.
+        """
+        if servers is None:
+            servers = [s for s in (self.config_server or "").split(",") if s]
+
+        from .probe import probe
+
+        logging.info("probing slurm controllers %s", ", ".join(servers))
+        return probe(servers)
 
     def update_config(self, config: Dict[str, str]) -> None:
         """Update configuration for the `slurmd` service."""
-        for k, v in config.items():
-            match k:
-                case "config-server":
-                    self.config_server = v
-                case _:
-                    raise AttributeError(f"Unrecognized configuration option {k}")
+        # Set the order first so that the controller list is ranked with the new order.
+        changes = self._apply(
+            dict(sorted(config.items(), key=lambda item: item[0] != "config-server-order"))
+        )
+        if "config-server-order" in changes and "config-server" not in changes:
+            # Rank the unchanged controller list with the new order.
+            with profiling.phase("slurmd.config-server"):
+                self.config_server = self.config_server or ""
+
+
+class Slurmdbd(_BaseModel):
+    """Manage lifecycle operations for the slurmdbd daemon."""
+
+    # Accounting record types and the `slurmdbd.conf` parameters that purge and archive them.
+    record_types = {
+        "event": ("PurgeEventAfter", "ArchiveEvents"),
+        "job": ("PurgeJobAfter", "ArchiveJobs"),
+        "resv": ("PurgeResvAfter", "ArchiveResvs"),
+        "step": ("PurgeStepAfter", "ArchiveSteps"),
+        "suspend": ("PurgeSuspendAfter", "ArchiveSuspend"),
+        "txn": ("PurgeTXNAfter", "ArchiveTXN"),
+        "usage": ("PurgeUsageAfter", "ArchiveUsage"),
+    }
+
+    namespace = "slurmdbd"
+    # `slurmdbd` is restarted when the rendered fragment changes, not when an option does.
+    options = register(
+        Option(
+            "slurmdbd", "purge-after", "SLURMDBD_PURGE_AFTER", default="", check=_check_purge_after
+        ),
+        Option("slurmdbd", "archive", "SLURMDBD_ARCHIVE", default="", check=_check_archive),
+        Option("slurmdbd", "commit-delay", "SLURMDBD_COMMIT_DELAY", int, minimum=0),
+        Option("slurmdbd", "max-query-days", "SLURMDBD_MAX_QUERY_DAYS", int, minimum=1),
+        Option("slurmdbd", "message-timeout", "SLURMDBD_MESSAGE_TIMEOUT", int, minimum=1),
+        Option("slurmdbd", "tcp-timeout", "SLURMDBD_TCP_TIMEOUT", int, minimum=1),
+    )
+
+    @property
+    def purge_after(self) -> Dict[str, str]:
+        """Get how long each type of accounting record is kept before it is purged."""
+        return dict(
+            policy.split("=", 1) for policy in self._get_option("purge-after").split(",") if policy
+        )
+
+    @purge_after.setter
+    def purge_after(self, v: str) -> None:
+        """Set how long each type of accounting record is kept before it is purged.
+
+        Args:
+            v: Comma-separated list of `<record>=<period>` policies, e.g.
+                `job=12months,step=3months`. Records without a policy are never purged.
+        """
+        self._set_option("purge-after", v)
+
+    @property
+    def archive(self) -> List[str]:
+        """Get the types of accounting records that are archived when they are purged."""
+        return [r for r in self._get_option("archive").split(",") if r]
+
+    @archive.setter
+    def archive(self, v: str) -> None:
+        """Set the types of accounting records that are archived when they are purged.
+
+        Args:
+            v: Comma-separated list of record types, e.g. `job,step`.
+        """
+        self._set_option("archive", v)
+
+    @property
+    def commit_delay(self) -> Optional[int]:
+        """Get the number of seconds that `slurmdbd` batches database commits for."""
+        return self._get_option("commit-delay")
+
+    @commit_delay.setter
+    def commit_delay(self, v: int) -> None:
+        """Set the number of seconds that `slurmdbd` batches database commits for.
+
+        Batching commits reduces the load on the database on busy clusters.
+        Set to 0 to commit every change immediately.
+        """
+        self._set_option("commit-delay", v)
+
+    @property
+    def max_query_days(self) -> Optional[int]:
+        """Get the largest time range in days that a single accounting query may span."""
+        return self._get_option("max-query-days")
+
+    @max_query_days.setter
+    def max_query_days(self, v: int) -> None:
+        """Set the largest time range in days that a single accounting query may span."""
+        self._set_option("max-query-days", v)
+
+    @property
+    def message_timeout(self) -> Optional[int]:
+        """Get the number of seconds permitted for a round-trip message to `slurmdbd`."""
+        return self._get_option("message-timeout")
+
+    @message_timeout.setter
+    def message_timeout(self, v: int) -> None:
+        """Set the number of seconds permitted for a round-trip message to `slurmdbd`."""
+        self._set_option("message-timeout", v)
+
+    @property
+    def tcp_timeout(self) -> Optional[int]:
+        """Get the number of seconds permitted to establish a TCP connection to `slurmdbd`."""
+        return self._get_option("tcp-timeout")
+
+    @tcp_timeout.setter
+    def tcp_timeout(self, v: int) -> None:
+        """Set the number of seconds permitted to establish a TCP connection to `slurmdbd`.
+
+        Raise on networks where connecting to `slurmdbd` is slow, e.g. across sites.
+        """
+        self._set_option("tcp-timeout", v)
+
+    @property
+    def tuning_file(self) -> Path:
+        """Get the path to the managed `slurmdbd.conf` include with the snap's settings."""
+        return self._snap.paths.common / "etc" / "slurm" / "slurmdbd-tuning.conf"
+
+    @property
+    def archive_dir(self) -> Path:
+        """Get the directory that purged accounting records are archived to."""
+        return self._snap.paths.common / "var" / "lib" / "slurm" / "slurmdbd" / "archive"
+
+    def render_tuning(self) -> str:
+        """Render the managed `slurmdbd.conf` include from the current settings."""
+        lines = [
+            "# Managed by the Slurm snap. Do not edit.",
+            "# Change with `snap set slurm slurmdbd.<option>=<value>`.",
+        ]
+        # Unset options are left out so that Slurm's defaults apply.
+        if self.commit_delay is not None:
+            lines.append(f"CommitDelay={self.commit_delay}")
+        if self.max_query_days is not None:
+            lines.append(f"MaxQueryTimeRange={self.max_query_days}-00:00:00")
+        if self.message_timeout is not None:
+            lines.append(f"MessageTimeout={self.message_timeout}")
+        if self.tcp_timeout is not None:
+            lines.append(f"TCPTimeout={self.tcp_timeout}")
 
+        purge_after = self.purge_after
+        for record, (purge, _) in self.record_types.items():
+            if record in purge_after:
+                lines.append(f"{purge}={purge_after[record]}")
 
-class Slurmrestd(_BaseModel):
+        if archive := set(self.archive):
+            lines.append(f"ArchiveDir={self.archive_dir}")
+            for record, (_, param) in self.record_types.items():
+                if record in archive:
+                    lines.append(f"{param}=yes")
+            if unpurged := sorted(archive - set(purge_after)):
+                logging.warning(
+                    "records %s are never purged, so they are never archived",
+                    ", ".join(unpurged),
+                )
+
+        return "".join(line + "\n" for line in lines)
+
+    def write_tuning(self) -> None:
+        """Write the managed `slurmdbd.conf` include, and restart `slurmdbd` if it changed."""
+        if self._write_managed(self.tuning_file, self.render_tuning()):
+            self._needs_restart(["slurmdbd"])
+
+    def update_config(self, config: Dict[str, str]) -> None:
+        """Update configuration for the `slurmdbd` service."""
+        self._apply(config)
+        if self._store.dirty & {option.key for option in self.options.values()}:
+            self.write_tuning()
+
+
+class Slurmrestd(_DaemonModel):
     """Manage lifecycle operations for the slurmrestd daemon."""
 
+    # Scaling factors used to automatically size `slurmrestd` for each tuning profile:
+    # (threads per cpu, minimum threads, maximum threads, connections per thread).
+    profiles = {
+        "small": (1, 2, 8, 4),
+        "balanced": (2, 8, 64, 6),
+        "high-throughput": (4, 16, 256, 16),
+    }
+
+    namespace = "slurmrestd"
+    options = register(
+        Option(
+            "slurmrestd",
+            "max-connections",
+            "SLURMRESTD_MAX_CONNECTIONS",
+            int,
+            minimum=1,
+            auto=True,
+            services=("slurmrestd",),
+        ),
+        Option(
+            "slurmrestd",
+            "max-thread-count",
+            "SLURMRESTD_MAX_THREAD_COUNT",
+            int,
+            minimum=1,
+            auto=True,
+            services=("slurmrestd",),
+        ),
+        Option(
+            "slurmrestd",
+            "profile",
+            "SLURMRESTD_PROFILE",
+            default="balanced",
+            choices=tuple(profiles),
+        ),
+        Option(
+            "slurmrestd",
+            "listen",
+            "SLURMRESTD_LISTEN",
+            default="",
+            services=("slurmrestd", "slurmrestd-proxy"),
+            check=_check_rest_listen,
+        ),
+        Option(
+            "slurmrestd",
+            "workers",
+            "SLURMRESTD_WORKERS",
+            int,
+            default=1,
+            minimum=1,
+            maximum=64,
+            services=("slurmrestd", "slurmrestd-proxy"),
+        ),
+        *_placement_options("slurmrestd", "SLURMRESTD"),
+    )
+
+    @property
+    def profile(self) -> str:
+        """Get the tuning profile used to automatically size `slurmrestd`."""
+        return self._get_option("profile")
+
+    @profile.setter
+    def profile(self, v: str) -> None:
+        """Set the tuning profile used to automatically size `slurmrestd`.
+
+        The maximum number of connections and the number of threads are
+        re-sized for the new profile unless they were explicitly set.
+        """
+        # Store the profile even if it is the default so that the setting is explicit.
+        option = self.options["profile"]
+        v = option.coerce(v)
+        if self._get_config(option.key) != v:
+            self._set_config(option.key, v)
+
+        for name in ("max-thread-count", "max-connections"):
+            sized = self.options[name]
+            if self._get_config(sized.key) is None or self._get_config(sized.auto_key) == "true":
+                setattr(self, sized.attr, "auto")
+
     @property
     def max_connections(self) -> Optional[int]:
         """Get the maximum number of client connections to process at one time."""
-        v = self._get_config("SLURMRESTD_MAX_CONNECTIONS")
-        if v is None:
-            return
-
-        return int(v)
+        return self._get_option("max-connections")
 
     @max_connections.setter
-    def max_connections(self, v: int) -> None:
-        """Set the maximum number of client connections to process at one time."""
-        if self.max_connections == v:
-            logging.debug("no change for `slurmrestd` max connections. not updating")
-            return
+    def max_connections(self, v: Union[int, str]) -> None:
+        """Set the maximum number of client connections to process at one time.
+
+        If set to `auto`, the maximum is derived from the thread count, the
+        tuning profile, and the file descriptor limit of the host.
+        """
+        auto = v == "auto"
+        self._set_auto("max-connections", auto)
+
+        if auto:
+            *_, per_thread = self.profiles[self.profile]
+            threads = self.max_thread_count or 1
+            nofile = host.nofile_limit()
+            # Leave headroom for each connection's upstream socket to `slurmctld`.
+            v = max(threads, min(threads * per_thread, (nofile - 64) // 2))
+            logging.info(
+                "derived `slurmrestd` max connections %s "
+                "(profile %s, %s threads, file descriptor limit %s)",
+                v,
+                self.profile,
+                threads,
+                nofile,
+            )
 
-        self._set_config("SLURMRESTD_MAX_CONNECTIONS", str(v))
-        self._needs_restart(["slurmrestd"])
+        self._set_option("max-connections", v)
+
+    @property
+    def max_connections_auto(self) -> bool:
+        """Get whether the maximum number of connections is automatically sized."""
+        return self._get_config("SLURMRESTD_MAX_CONNECTIONS_AUTO") == "true"
 
     @property
     def max_thread_count(self) -> Optional[int]:
         """Get the number of threads to spawn for processing client requests."""
-        v = self._get_config("SLURMRESTD_MAX_THREAD_COUNT")
-        if v is None:
-            return
-
-        return int(v)
+        return self._get_option("max-thread-count")
 
     @max_thread_count.setter
-    def max_thread_count(self, v: int) -> None:
-        """Set the number of threads to spawn for processing client requests."""
-        if self.max_thread_count == v:
-            logging.debug("no change for `slurmrestd` max thread count. not updating")
-            return
+    def max_thread_count(self, v: Union[int, str]) -> None:
+        """Set the number of threads to spawn for processing client requests.
+
+        If set to `auto`, the thread count is derived from the tuning profile
+        and the number of CPUs and amount of memory available on the host.
+        """
+        auto = v == "auto"
+        self._set_auto("max-thread-count", auto)
+
+        if auto:
+            per_cpu, lower, upper, _ = self.profiles[self.profile]
+            cpus = host.cpu_count()
+            memory = host.memory_total() // 2**20
+            # Budget at most 64 MiB of memory per worker thread.
+            v = max(lower, min(cpus * per_cpu, upper, memory // 64))
+            logging.info(
+                "derived `slurmrestd` max thread count %s (profile %s, %s cpus, %s MiB memory)",
+                v,
+                self.profile,
+                cpus,
+                memory,
+            )
+
+        self._set_option("max-thread-count", v)
+
+    @property
+    def max_thread_count_auto(self) -> bool:
+        """Get whether the number of threads is automatically sized."""
+        return self._get_config("SLURMRESTD_MAX_THREAD_COUNT_AUTO") == "true"
+
+    @property
+    def listen(self) -> List[str]:
+        """Get the addresses that `slurmrestd` listens on."""
+        from .restd import parse_listeners
+
+        return parse_listeners(self._get_option("listen"))
+
+    @listen.setter
+    def listen(self, v: str) -> None:
+        """Set the addresses that `slurmrestd` listens on as a comma-separated list.
 
-        self._set_config("SLURMRESTD_MAX_THREAD_COUNT", str(v))
-        self._needs_restart(["slurmrestd"])
+        Each address is either `[host]:port` or `unix:/path/to/socket`. If unset,
+        `slurmrestd` listens on port 6820 of the host's short hostname.
+        """
+        self._set_option("listen", v)
+
+    @property
+    def workers(self) -> int:
+        """Get the number of `slurmrestd` worker processes."""
+        return self._get_option("workers")
+
+    @workers.setter
+    def workers(self, v: int) -> None:
+        """Set the number of `slurmrestd` worker processes.
+
+        Each worker listens on its own ports and sockets derived from `listen`,
+        and gets an even share of the thread count and maximum connections.
+        """
+        self._set_option("workers", v)
+
+    @property
+    def worker_budget(self) -> Tuple[Optional[int], Optional[int]]:
+        """Get the thread count and maximum connections of each worker process."""
+        threads = self._get_config("SLURMRESTD_WORKER_THREAD_COUNT")
+        connections = self._get_config("SLURMRESTD_WORKER_MAX_CONNECTIONS")
+        return (
+            int(threads) if threads else None,
+            int(connections) if connections else None,
+        )
+
+    def render_worker_budget(self) -> None:
+        """Split the thread count and maximum connections evenly between worker processes.
+
+        Each worker gets at least one thread and at least one connection per thread.
+
+        Raises:
+            ValueError: Raised if the listeners of the workers would overlap.
+        """
+        from .restd import worker_listeners
+
+        workers = self.workers
+        worker_listeners(self.listen, workers)
+
+        threads = self._get_option("max-thread-count")
+        connections = self._get_option("max-connections")
+        budget = {}
+        if threads is not None:
+            budget["SLURMRESTD_WORKER_THREAD_COUNT"] = -(-threads // workers)
+        if connections is not None:
+            per_worker = -(-connections // workers)
+            budget["SLURMRESTD_WORKER_MAX_CONNECTIONS"] = max(
+                per_worker, budget.get("SLURMRESTD_WORKER_THREAD_COUNT", 1)
+            )
+
+        changed = False
+        for key, v in budget.items():
+            if self._get_config(key) != str(v):
+                self._set_config(key, str(v))
+                changed = True
+        if changed:
+            logging.info(
+                "derived `slurmrestd` worker budget of %s threads and %s connections (%s workers)",
+                *self.worker_budget,
+                workers,
+            )
+            self._needs_restart(["slurmrestd"])
 
     def update_config(self, config: Dict[str, str]) -> None:
         """Update configuration for the `slurmrestd` service."""
-        for k in config.keys():
-            match k:
-                case "max-connections":
-                    self.max_connections = config[k]
-                case "max-thread-count":
-                    self.max_thread_count = config[k]
-                case _:
-                    raise AttributeError(f"Unrecognized configuration option {k}")
+        self._apply(config)
+
+        # Re-derive automatically sized values since the host's resources, the
+        # profile, or the thread count may have changed. Connections are derived
+        # from the thread count, so the thread count must be derived first.
+        if self.max_thread_count_auto:
+            with profiling.phase("slurmrestd.max-thread-count"):
+                self.max_thread_count = "auto"
+        if self.max_connections_auto:
+            with profiling.phase("slurmrestd.max-connections"):
+                self.max_connections = "auto"
+        with profiling.phase("slurmrestd.workers"):
+            self.render_worker_budget()
+
+
+class SlurmrestdProxy(_BaseModel):
+    """Manage lifecycle operations for the caching proxy in front of `slurmrestd`."""
+
+    namespace = "slurmrestd-proxy"
+    options = register(
+        Option(
+            "slurmrestd-proxy",
+            "listen-address",
+            "SLURMRESTD_PROXY_LISTEN_ADDRESS",
+            default=":6830",
+            services=("slurmrestd-proxy",),
+            check=_check_listen_address,
+        ),
+        Option(
+            "slurmrestd-proxy",
+            "ttl",
+            "SLURMRESTD_PROXY_TTL",
+            default="jobs=5,nodes=30,partitions=60",
+            services=("slurmrestd-proxy",),
+            check=_check_ttl,
+        ),
+        Option(
+            "slurmrestd-proxy",
+            "max-entries",
+            "SLURMRESTD_PROXY_MAX_ENTRIES",
+            int,
+            default=1024,
+            minimum=1,
+            services=("slurmrestd-proxy",),
+        ),
+    )
+
+    @property
+    def listen_address(self) -> str:
+        """Get the address that the proxy listens on."""
+        return self._get_option("listen-address")
+
+    @listen_address.setter
+    def listen_address(self, v: str) -> None:
+        """Set the address that the proxy listens on, e.g. `:6830`."""
+        self._set_option("listen-address", v)
+
+    @property
+    def ttl(self) -> Dict[str, int]:
+        """Get the number of seconds that responses of each endpoint are cached for."""
+        from .restproxy import parse_ttls
+
+        return parse_ttls(self._get_option("ttl"))
+
+    @ttl.setter
+    def ttl(self, v: str) -> None:
+        """Set the number of seconds that responses of each endpoint are cached for.
+
+        Endpoints are matched against the last segment of the request path,
+        e.g. `jobs=5,nodes=30`. Responses of other endpoints are never cached.
+        """
+        self._set_option("ttl", v)
+
+    @property
+    def max_entries(self) -> int:
+        """Get the maximum number of responses to cache."""
+        return self._get_option("max-entries")
+
+    @max_entries.setter
+    def max_entries(self, v: int) -> None:
+        """Set the maximum number of responses to cache."""
+        self._set_option("max-entries", v)
+
+    @property
+    def args(self) -> Optional[str]:
+        """Get the command line arguments rendered for the proxy."""
+        return self._get_config("SLURMRESTD_PROXY_ARGS")
+
+    def render_args(self) -> None:
+        """Render the proxy's command line arguments from the current settings."""
+        ttl = ",".join(f"{k}={v}" for k, v in sorted(self.ttl.items()))
+        v = " ".join(
+            [
+                f"--listen-address={self.listen_address}",
+                f"--ttl={ttl}",
+                f"--max-entries={self.max_entries}",
+            ]
+        )
+        if self.args == v:
+            logging.debug("no change for `slurmrestd-proxy` arguments. not updating")
+            return
+
+        self._set_config("SLURMRESTD_PROXY_ARGS", v)
+        self._needs_restart(["slurmrestd-proxy"])
+
+    def update_config(self, config: Dict[str, str]) -> None:
+        """Update configuration for the `slurmrestd-proxy` service."""
+        self._apply(config)
+        if self._store.dirty & {option.key for option in self.options.values()}:
+            self.render_args()
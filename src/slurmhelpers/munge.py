@@ -0,0 +1,98 @@
+# Copyright 2025 Canonical Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Generate and rotate the munge key used by the Slurm snap.
+
+The `munge-rotate-key` snap app rotates the key in two steps:
+
+1. `stage` writes a new key to the drop file `etc/munge/munge.key.new`.
+   The new key is either generated or copied from a key file, so the same
+   staged key can be distributed to every node in the cluster.
+2. `swap` atomically moves the staged key over `etc/munge/munge.key` and
+   restarts `munged` once.
+"""
+
+import logging
+import os
+from os import PathLike
+from pathlib import Path
+from typing import Optional, Union
+
+from .config import write_atomic
+
+# Size of generated keys in bytes, i.e. the 1024 bits generated by `mungekey` by default.
+KEY_SIZE = 128
+# Smallest and largest key sizes in bytes accepted by `munged`.
+KEY_MIN_SIZE = 32
+KEY_MAX_SIZE = 1024 * 1024
+
+
+def write_key(file: Union[str, PathLike], key: Optional[bytes] = None) -> None:
+    """Atomically write a munge key readable only by its owner.
+
+    The key is written to a temporary file with mode 0600 in the same directory
+    and renamed over `file`, so `munged` never reads a partially written key.
+
+    Args:
+        file: Path to write the key to.
+        key: Key to write. A random key of `KEY_SIZE` bytes is generated if `None`.
+
+    Raises:
+        ValueError: Raised if the key is too small or too large for `munged`.
+    """
+    if key is None:
+        key = os.urandom(KEY_SIZE)
+    if not KEY_MIN_SIZE <= len(key) <= KEY_MAX_SIZE:
+        raise ValueError(
+            f"invalid munge key size {len(key)} bytes. "
+            f"expected between {KEY_MIN_SIZE} and {KEY_MAX_SIZE} bytes"
+        )
+
+    write_atomic(file, key, 0o600)
+
+
+def main() -> None:
+    """Entrypoint for the `munge-rotate-key` snap app."""
+    import argparse
+
+    from snaphelpers import Snap
+
+    from .config import ConfigStore
+    from .models import Munged
+    from .restart import RestartPlanner
+
+    parser = argparse.ArgumentParser(
+        prog="munge-rotate-key", description="Rotate the munge key with a single munged restart."
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    stage = subparsers.add_parser("stage", help="stage a new munge key in the drop file")
+    stage.add_argument(
+        "--key-file", type=Path, help="stage the key in this file instead of generating one"
+    )
+    subparsers.add_parser("swap", help="swap the staged munge key in and restart munged")
+    args = parser.parse_args()
+
+    logging.basicConfig(format="%(levelname)s %(message)s", level=logging.INFO)
+    snap = Snap()
+    restarts = RestartPlanner(snap)
+    munged = Munged(snap, ConfigStore(snap.paths.common / ".env"), restarts)
+    try:
+        if args.command == "stage":
+            munged.stage_key(args.key_file.read_bytes() if args.key_file else None)
+            logging.info("staged new munge key in %s", munged.staged_key_file)
+        else:
+            munged.rotate_key()
+            restarts.apply()
+    except (OSError, ValueError) as e:
+        parser.exit(1, f"error: {e}\n")
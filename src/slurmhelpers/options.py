@@ -0,0 +1,220 @@
+# Copyright 2025 Canonical Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Registry of the snap configuration options managed by the Slurm snap."""
+
+from typing import Any, Callable, Dict, NamedTuple, Optional, Tuple, Union
+
+from .config import ConfigStore
+
+# Registered options: namespace -> option name -> option.
+REGISTRY: Dict[str, Dict[str, "Option"]] = {}
+
+
+class Option(NamedTuple):
+    """A snap configuration option, e.g. `slurmrestd.max-thread-count`.
+
+    Attributes:
+        namespace: Namespace of the option, e.g. `slurmrestd`.
+        name: Name of the option within its namespace, e.g. `max-thread-count`.
+        key: Key the option's value is stored under in the `.env` file.
+        type: Type of the option's value. Either `str` or `int`.
+        default: Value used if the option has not been set.
+        choices: Allowed values. Any value is allowed if empty.
+        minimum: Smallest allowed value of an `int` option.
+        maximum: Largest allowed value of an `int` option.
+        auto: Whether `auto` is accepted in place of a value. Whether the value
+            is automatically sized is stored under the `<key>_AUTO` key.
+        services: Services to restart when the option's value changes.
+        check: Callable that raises `ValueError` if a value is invalid.
+    """
+
+    namespace: str
+    name: str
+    key: str
+    type: type = str
+    default: Any = None
+    choices: Tuple[str, ...] = ()
+    minimum: Optional[int] = None
+    maximum: Optional[int] = None
+    auto: bool = False
+    services: Tuple[str, ...] = ()
+    check: Optional[Callable[[str], Any]] = None
+
+    @property
+    def attr(self) -> str:
+        """Get the name of the model attribute that manages the option."""
+        return self.name.replace("-", "_")
+
+    @property
+    def auto_key(self) -> str:
+        """Get the key that stores whether the option is automatically sized."""
+        return f"{self.key}_AUTO"
+
+    def coerce(self, value: Any) -> Union[int, str]:
+        """Convert a value retrieved from `snapctl` to the option's type.
+
+        Args:
+            value: Value to convert.
+
+        Raises:
+            ValueError: Raised if the value is invalid for the option.
+        """
+        if self.auto and value == "auto":
+            return "auto"
+
+        if self.type is int:
+            try:
+                if isinstance(value, bool):
+                    raise ValueError
+                v = int(value)
+            except (TypeError, ValueError):
+                raise ValueError(
+                    f"invalid {self.namespace}.{self.name} {value}. "
+                    f"expected an integer{' or auto' if self.auto else ''}"
+                )
+
+            if self.minimum is not None and v < self.minimum:
+                raise ValueError(
+                    f"invalid {self.namespace}.{self.name} {v}. must be at least {self.minimum}"
+                )
+            if self.maximum is not None and v > self.maximum:
+                raise ValueError(
+                    f"invalid {self.namespace}.{self.name} {v}. must be at most {self.maximum}"
+                )
+            return v
+
+        v = str(value)
+        if self.choices and v not in self.choices:
+            raise ValueError(
+                f"invalid {self.namespace}.{self.name} {v}. "
+                f"expected one of {', '.join(self.choices)}"
+            )
+        if self.check is not None:
+            self.check(v)
+
+        return v
+
+    def value(self, store: ConfigStore) -> Any:
+        """Get the concrete value of the option stored in the `.env` file.
+
+        Args:
+            store: The snap's configuration store.
+        """
+        v = store.get(self.key)
+        if v is None:
+            return self.default
+
+        try:
+            return self.type(v)
+        except ValueError:
+            # Hand-edited `.env` file. Any new value is a change.
+            return v
+
+    def current(self, store: ConfigStore) -> Any:
+        """Get the current setting of the option, i.e. `auto` if automatically sized.
+
+        Args:
+            store: The snap's configuration store.
+        """
+        if self.auto and store.get(self.auto_key) == "true":
+            return "auto"
+
+        return self.value(store)
+
+
+def register(*options: Option) -> Dict[str, Option]:
+    """Register snap configuration options.
+
+    Args:
+        options: Options to register.
+
+    Returns:
+        The registered options keyed by name.
+    """
+    for option in options:
+        REGISTRY.setdefault(option.namespace, {})[option.name] = option
+
+    return {option.name: option for option in options}
+
+
+def validate(config: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """Validate a snap configuration payload before any of it is applied.
+
+    Namespaces without registered options are passed through as is.
+
+    Args:
+        config: Snap configuration options keyed by namespace,
+            e.g. as returned by `snap.config.get_options(...).as_dict()`.
+
+    Returns:
+        The configuration with each value converted to its option's type.
+
+    Raises:
+        AttributeError: Raised if the payload contains unrecognized options.
+        ValueError: Raised if the payload contains invalid values.
+    """
+    validated = {}
+    unknown = []
+    errors = []
+    for namespace, values in config.items():
+        if namespace not in REGISTRY:
+            validated[namespace] = values
+            continue
+
+        validated[namespace] = {}
+        for name, value in values.items():
+            option = REGISTRY[namespace].get(name)
+            if option is None:
+                unknown.append(f"{namespace}.{name}")
+                continue
+
+            try:
+                validated[namespace][name] = option.coerce(value)
+            except ValueError as e:
+                errors.append(str(e))
+
+    if unknown:
+        raise AttributeError(f"Unrecognized configuration option {', '.join(unknown)}")
+    if errors:
+        raise ValueError("; ".join(errors))
+
+    return validated
+
+
+def diff(store: ConfigStore, config: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """Get the options whose validated value differs from their current setting.
+
+    Args:
+        store: The snap's configuration store.
+        config: Validated snap configuration options keyed by namespace.
+
+    Returns:
+        The changed options keyed by namespace. Namespaces without registered
+        options, and namespaces without changes, are omitted.
+    """
+    changes = {}
+    for namespace, values in config.items():
+        if namespace not in REGISTRY:
+            continue
+
+        changed = {
+            name: value
+            for name, value in values.items()
+            if REGISTRY[namespace][name].current(store) != value
+        }
+        if changed:
+            changes[namespace] = changed
+
+    return changes
@@ -0,0 +1,126 @@
+# Copyright 2025 Canonical Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Probe the reachability and latency of Slurm controllers."""
+
+import logging
+import socket
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, NamedTuple, Optional, Tuple
+
+# Default port that `slurmctld` listens on.
+SLURMCTLD_PORT = 6817
+# Seconds to wait for a controller to accept a connection before marking it unreachable.
+PROBE_TIMEOUT = 1.0
+
+
+class ProbeResult(NamedTuple):
+    """Result of probing a Slurm controller.
+
+    Attributes:
+        server: Controller as given in the configuration server list.
+        rtt_ms: Time taken to open a TCP connection in milliseconds.
+            `None` if the controller is unreachable.
+        error: Reason the controller is unreachable.
+    """
+
+    server: str
+    rtt_ms: Optional[float]
+    error: Optional[str] = None
+
+    @property
+    def reachable(self) -> bool:
+        """Check if the controller accepted a connection."""
+        return self.rtt_ms is not None
+
+
+def parse_server(server: str) -> Tuple[str, int]:
+    """Split a `host[:port]` controller address into its host and port.
+
+    Args:
+        server: Controller address. IPv6 addresses must be enclosed in brackets.
+
+    Raises:
+        ValueError: Raised if the port is not a valid port number.
+    """
+    server = server.strip()
+    if server.startswith("["):
+        host, _, rest = server[1:].partition("]")
+        port = rest.removeprefix(":")
+    elif server.count(":") == 1:
+        host, port = server.split(":")
+    else:
+        # No port given, or a bare IPv6 address.
+        host, port = server, ""
+
+    if not port:
+        return host, SLURMCTLD_PORT
+    if not port.isdigit() or not 0 < int(port) < 65536:
+        raise ValueError(f"invalid port {port} for slurm controller {server}")
+
+    return host, int(port)
+
+
+def _probe(server: str, timeout: float) -> ProbeResult:
+    """Time opening a TCP connection to a Slurm controller."""
+    host, port = parse_server(server)
+    start = time.perf_counter()
+    try:
+        with socket.create_connection((host, port), timeout=timeout):
+            rtt = (time.perf_counter() - start) * 1000
+    except OSError as e:
+        return ProbeResult(server, None, str(e) or type(e).__name__)
+
+    return ProbeResult(server, round(rtt, 3))
+
+
+def probe(servers: List[str], timeout: float = PROBE_TIMEOUT) -> List[ProbeResult]:
+    """Probe Slurm controllers concurrently.
+
+    Args:
+        servers: Controller addresses in `host[:port]` format.
+        timeout: Seconds to wait for each controller to accept a connection.
+
+    Returns:
+        Probe results in the same order as `servers`.
+    """
+    if not servers:
+        return []
+
+    with ThreadPoolExecutor(max_workers=len(servers)) as pool:
+        results = list(pool.map(lambda s: _probe(s, timeout), servers))
+
+    for result in results:
+        if result.reachable:
+            logging.info("slurm controller %s reachable in %sms", result.server, result.rtt_ms)
+        else:
+            logging.warning(
+                "slurm controller %s unreachable. reason %s", result.server, result.error
+            )
+
+    return results
+
+
+def rank(results: List[ProbeResult]) -> List[str]:
+    """Order controllers by reachability, then by round-trip time.
+
+    Unreachable controllers keep their original relative order at the end of the list.
+
+    Args:
+        results: Probe results as returned by `probe`.
+    """
+    reachable = sorted((r for r in results if r.reachable), key=lambda r: r.rtt_ms)
+    unreachable = [r for r in results if not r.reachable]
+    return [r.server for r in reachable + unreachable]
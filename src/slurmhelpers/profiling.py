@@ -0,0 +1,182 @@
+# Copyright 2025 Canonical Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Measure the time spent in each phase of a Slurm snap hook."""
+
+import json
+import logging
+import sys
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from os import PathLike
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+# Audit events counted as file operations.
+# See https://docs.python.org/3/library/audit_events.html
+FILE_EVENTS = frozenset(
+    {
+        "open",
+        "os.chmod",
+        "os.chown",
+        "os.link",
+        "os.mkdir",
+        "os.remove",
+        "os.rename",
+        "os.rmdir",
+        "os.symlink",
+        "os.truncate",
+        "os.utime",
+    }
+)
+# Rotate the metrics file once it grows beyond this size in bytes.
+METRICS_MAX_BYTES = 1024 * 1024
+
+_active: Optional["HookProfiler"] = None
+_audit_hook_installed = False
+_counters = {"subprocesses": 0, "file_ops": 0}
+
+
+def _audit(event: str, _: Any) -> None:
+    """Count subprocesses and file operations while a hook is being profiled."""
+    if _active is None:
+        return
+
+    if event == "subprocess.Popen":
+        _counters["subprocesses"] += 1
+    elif event in FILE_EVENTS:
+        _counters["file_ops"] += 1
+
+
+@contextmanager
+def phase(name: str) -> Iterator[None]:
+    """Record a phase of the hook that is currently being profiled.
+
+    Does nothing if no hook is being profiled.
+
+    Args:
+        name: Name of the phase.
+    """
+    if _active is None:
+        yield
+        return
+
+    with _active.phase(name):
+        yield
+
+
+class HookProfiler:
+    """Record wall time, subprocesses, and file operations for each phase of a hook.
+
+    Phase records are appended as JSON lines to `hooks-metrics.jsonl` under
+    $SNAP_COMMON once the hook completes. If the `hooks.profile` file exists
+    under $SNAP_COMMON, the hook run is also profiled with `cProfile`. The
+    profile is dumped next to the metrics file and the trigger file is removed,
+    so only a single hook run is profiled.
+
+    Args:
+        hook: Name of the hook being profiled.
+        common: Path to $SNAP_COMMON.
+    """
+
+    def __init__(self, hook: str, common: Union[str, PathLike]) -> None:
+        global _audit_hook_installed
+        if not _audit_hook_installed:
+            sys.addaudithook(_audit)
+            _audit_hook_installed = True
+
+        self._hook = hook
+        self._common = Path(common)
+        self._records: List[Dict[str, Any]] = []
+        self._profile = None
+
+    @property
+    def metrics_file(self) -> Path:
+        """Get the path to the JSON lines file that phase records are appended to."""
+        return self._common / "hooks-metrics.jsonl"
+
+    @property
+    def records(self) -> List[Dict[str, Any]]:
+        """Get the phase records collected so far."""
+        return list(self._records)
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Record the wall time and I/O of a phase of the hook.
+
+        Args:
+            name: Name of the phase.
+        """
+        start = time.perf_counter()
+        counters = dict(_counters)
+        status = "error"
+        try:
+            yield
+            status = "ok"
+        finally:
+            self._records.append(
+                {
+                    "timestamp": datetime.now(timezone.utc).isoformat(),
+                    "hook": self._hook,
+                    "phase": name,
+                    "status": status,
+                    "wall_ms": round((time.perf_counter() - start) * 1000, 3),
+                    **{k: v - counters[k] for k, v in _counters.items()},
+                }
+            )
+
+    def __enter__(self) -> "HookProfiler":
+        """Start profiling the hook."""
+        global _active
+        _active = self
+
+        trigger = self._common / "hooks.profile"
+        if trigger.exists():
+            import cProfile
+
+            trigger.unlink()
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+
+        self._total = self.phase("total")
+        self._total.__enter__()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        """Stop profiling the hook and write the collected records."""
+        global _active
+        self._total.__exit__(*exc_info)
+        _active = None
+
+        if self._profile is not None:
+            self._profile.disable()
+            stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S")
+            dump = self._common / f"hooks-{self._hook}-{stamp}.prof"
+            self._profile.dump_stats(dump)
+            logging.info("wrote cProfile statistics for `%s` hook to %s", self._hook, dump)
+
+        try:
+            self._write()
+        except OSError as e:
+            logging.warning("failed to write hook metrics to %s. reason %s", self.metrics_file, e)
+
+    def _write(self) -> None:
+        """Append the collected phase records to the metrics file."""
+        file = self.metrics_file
+        if file.exists() and file.stat().st_size > METRICS_MAX_BYTES:
+            file.replace(file.with_name(f"{file.name}.1"))
+
+        with file.open("a") as f:
+            f.writelines(json.dumps(record) + "\n" for record in self._records)
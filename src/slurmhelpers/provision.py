@@ -0,0 +1,204 @@
+# Copyright 2025 Canonical Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Provision the directories needed by Slurm and Munge under $SNAP_COMMON."""
+
+import logging
+import os
+import stat
+from os import PathLike
+from pathlib import Path
+from typing import List, NamedTuple, Optional, Tuple, Union
+
+
+class Directory(NamedTuple):
+    """A directory that must exist under $SNAP_COMMON.
+
+    Attributes:
+        path: Path of the directory relative to $SNAP_COMMON.
+        mode: Permission bits of the directory.
+        owner: User and group ID that must own the directory.
+            Ownership is left as is if `None`.
+    """
+
+    path: str
+    mode: int = 0o755
+    owner: Optional[Tuple[int, int]] = None
+
+
+class Operation(NamedTuple):
+    """A filesystem operation planned by the provisioner.
+
+    Attributes:
+        action: `mkdir`, `chmod`, or `chown`.
+        path: Absolute path of the directory to operate on.
+        arg: Mode for `mkdir` and `chmod`, or (uid, gid) for `chown`.
+    """
+
+    action: str
+    path: Path
+    arg: Union[int, Tuple[int, int]]
+
+
+# Status of the process, including its umask.
+PROC_STATUS = Path("/proc/self/status")
+
+# User and group ID of the `snap_daemon` user that `slurmrestd` runs as.
+SNAP_DAEMON = (584788, 584788)
+
+# Directories needed by Slurm and Munge. Parents are listed before their children.
+MANIFEST = [
+    # etc - configuration files
+    Directory("etc", 0o711),
+    Directory("etc/logrotate"),
+    Directory("etc/munge", 0o700, (0, 0)),
+    Directory("etc/slurm"),
+    Directory("etc/slurm/plugstack.conf.d"),
+    Directory("etc/slurm/epilog.d"),
+    Directory("etc/slurm/prolog.d"),
+    # var/lib - variable state information
+    Directory("var"),
+    Directory("var/lib"),
+    Directory("var/lib/munge", 0o711, (0, 0)),
+    Directory("var/lib/prometheus"),
+    Directory("var/lib/prometheus/node-exporter"),
+    Directory("var/lib/slurm"),
+    Directory("var/lib/slurm/checkpoint"),
+    Directory("var/lib/slurm/slurmctld"),
+    Directory("var/lib/slurm/slurmd"),
+    Directory("var/lib/slurm/slurmdbd"),
+    Directory("var/lib/slurm/slurmdbd/archive"),
+    Directory("var/lib/slurm/slurmrestd"),
+    # var/log - variable log data
+    Directory("var/log"),
+    Directory("var/log/slurm"),
+    # run - variable runtime data
+    Directory("run"),
+    Directory("run/munge"),
+    Directory("run/slurm"),
+    Directory("run/slurmrestd", 0o755, SNAP_DAEMON),
+]
+
+
+def _umask() -> int:
+    """Get the umask of the process without changing it.
+
+    `os.umask` can only read the umask by setting it, and files created by other
+    threads in the meantime, such as the hook's log file, would get the wrong mode.
+    `0o777` is returned if the umask cannot be read, so every new directory is `chmod`-ed.
+    """
+    try:
+        for line in PROC_STATUS.read_text().splitlines():
+            if line.startswith("Umask:"):
+                return int(line.split()[1], 8)
+    except (OSError, ValueError) as e:
+        logging.warning("failed to read umask of process. reason %s", e)
+
+    return 0o777
+
+
+def plan(
+    root: Union[str, PathLike], manifest: Optional[List[Directory]] = None
+) -> List[Operation]:
+    """Compute the minimal operations needed to bring directories in line with a manifest.
+
+    Each directory is `stat`-ed once. Directories that already have the right
+    mode and owner need no operations.
+
+    Args:
+        root: Directory that the manifest's paths are relative to, e.g. $SNAP_COMMON.
+        manifest: Directories to provision. Defaults to `MANIFEST`.
+
+    Raises:
+        NotADirectoryError: Raised if a path in the manifest exists but is not a directory.
+    """
+    root = Path(root)
+    umask = _umask()
+    uid, gid = os.geteuid(), os.getegid()
+
+    ops = []
+    for directory in manifest if manifest is not None else MANIFEST:
+        path = root / directory.path
+        try:
+            st = os.lstat(path)
+        except FileNotFoundError:
+            ops.append(Operation("mkdir", path, directory.mode))
+            if directory.mode & umask:
+                ops.append(Operation("chmod", path, directory.mode))
+            if directory.owner is not None and directory.owner != (uid, gid):
+                ops.append(Operation("chown", path, directory.owner))
+            continue
+
+        if not stat.S_ISDIR(st.st_mode):
+            raise NotADirectoryError(
+                f"cannot provision {path}. path exists but is not a directory"
+            )
+        if stat.S_IMODE(st.st_mode) != directory.mode:
+            ops.append(Operation("chmod", path, directory.mode))
+        if directory.owner is not None and directory.owner != (st.st_uid, st.st_gid):
+            ops.append(Operation("chown", path, directory.owner))
+
+    return ops
+
+
+def apply(ops: List[Operation]) -> None:
+    """Apply planned filesystem operations in order.
+
+    Args:
+        ops: Operations as returned by `plan`.
+    """
+    for op in ops:
+        logging.debug("%s %s %s", op.action, op.path, op.arg)
+        match op.action:
+            case "mkdir":
+                os.mkdir(op.path, op.arg)
+            case "chmod":
+                os.chmod(op.path, op.arg)
+            case "chown":
+                os.chown(op.path, *op.arg)
+
+
+def provision(
+    root: Union[str, PathLike], manifest: Optional[List[Directory]] = None
+) -> List[Operation]:
+    """Create missing directories and fix the mode and owner of existing ones.
+
+    Safe to run any number of times. Runs no operations if the
+    directories already match the manifest.
+
+    Args:
+        root: Directory that the manifest's paths are relative to, e.g. $SNAP_COMMON.
+        manifest: Directories to provision. Defaults to `MANIFEST`.
+
+    Returns:
+        The operations that were applied.
+    """
+    ops = plan(root, manifest)
+    if ops:
+        logging.info("applying %s filesystem operations under %s", len(ops), root)
+    else:
+        logging.debug("directories under %s are up to date", root)
+    apply(ops)
+    return ops
+
+
+def main() -> None:
+    """Entrypoint for the `repair` snap app."""
+    from snaphelpers import Snap
+
+    logging.basicConfig(format="%(levelname)s %(message)s", level=logging.INFO)
+    ops = provision(Snap().paths.common)
+    for op in ops:
+        logging.info("repaired %s: %s", op.path, op.action)
+    logging.info("%s directories repaired", len({op.path for op in ops}))
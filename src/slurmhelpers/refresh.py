@@ -0,0 +1,202 @@
+# Copyright 2025 Canonical Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Detect which daemons need to be restarted after a snap refresh.
+
+The daemons use `refresh-mode: endure`, so snapd does not restart them on
+refresh. Instead, the `pre-refresh` hook records a fingerprint of each daemon's
+binaries and effective configuration, and the `post-refresh` hook restarts
+only the daemons whose fingerprint changed.
+"""
+
+import hashlib
+import json
+import logging
+import re
+from os import PathLike
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+from snaphelpers import Snap
+
+from .config import ConfigStore
+
+# Files that each daemon runs or loads. Paths are relative to $SNAP, except for
+# `slurmhelpers/` modules, which are found next to this module wherever it is installed.
+SERVICE_FILES: Dict[str, List[str]] = {
+    "munged": ["sbin/munged", "sbin/munged.wrapper", "sbin/placement.sh"],
+    "slurmctld": ["sbin/slurmctld", "sbin/slurmctld.wrapper", "lib/slurm/libslurmfull.so"],
+    "slurmd": [
+        "sbin/slurmd",
+        "sbin/slurmstepd",
+        "sbin/slurmd.wrapper",
+        "sbin/placement.sh",
+        "lib/slurm/libslurmfull.so",
+    ],
+    "slurmdbd": ["sbin/slurmdbd", "sbin/slurmdbd.wrapper", "lib/slurm/libslurmfull.so"],
+    "slurmrestd": [
+        "sbin/slurmrestd",
+        "sbin/slurmrestd.wrapper",
+        "sbin/placement.sh",
+        "lib/slurm/libslurmfull.so",
+        "slurmhelpers/restd.py",
+    ],
+    "prometheus-slurm-exporter": [
+        "bin/prometheus-slurm-exporter",
+        "sbin/prometheus-slurm-exporter.wrapper",
+    ],
+    "slurmrestd-proxy": [
+        "sbin/slurmrestd-proxy.wrapper",
+        "slurmhelpers/restd.py",
+        "slurmhelpers/restproxy.py",
+    ],
+}
+
+
+# Variables that a wrapper reads, e.g. `$SLURMD_CONFIG_SERVER` or `${SLURMRESTD_PROXY_ARGS}`.
+_WRAPPER_VAR_RE = re.compile(r"\$\{?([A-Z][A-Z0-9_]*)")
+
+
+def _resolve(snap: Snap, file: str) -> Path:
+    """Get the absolute path of a file listed in `SERVICE_FILES`."""
+    if file.startswith("slurmhelpers/"):
+        return Path(__file__).parent.parent / file
+
+    return snap.paths.snap / file
+
+
+def _hash_file(file: Path) -> str:
+    """Hash the contents of a file, or return `missing` if it does not exist."""
+    digest = hashlib.sha256()
+    try:
+        with file.open("rb") as f:
+            while chunk := f.read(1024 * 1024):
+                digest.update(chunk)
+    except FileNotFoundError:
+        return "missing"
+
+    return digest.hexdigest()
+
+
+def _env_keys(snap: Snap, service: str) -> List[str]:
+    """Get the `.env` keys that a service reads.
+
+    These are the keys of the options that affect the service, and the keys
+    that its wrapper reads, such as arguments derived from several options.
+
+    Args:
+        snap: The Snap instance.
+        service: Name of the service.
+    """
+    from .options import REGISTRY
+
+    keys = {
+        option.key
+        for options in REGISTRY.values()
+        for option in options.values()
+        if service in option.services
+    }
+    for file in SERVICE_FILES[service]:
+        if file.endswith(".wrapper"):
+            try:
+                keys.update(_WRAPPER_VAR_RE.findall(_resolve(snap, file).read_text()))
+            except FileNotFoundError:
+                pass
+
+    return sorted(keys)
+
+
+def fingerprints(snap: Snap, store: ConfigStore) -> Dict[str, str]:
+    """Fingerprint the binaries and effective configuration of each daemon.
+
+    Files shared by several daemons are only hashed once.
+
+    Args:
+        snap: The Snap instance.
+        store: The snap's configuration store.
+    """
+    # Importing the models registers their options.
+    from . import models  # noqa: F401
+
+    hashes: Dict[str, str] = {}
+    result = {}
+    for service, files in SERVICE_FILES.items():
+        digest = hashlib.sha256()
+        for file in files:
+            if file not in hashes:
+                hashes[file] = _hash_file(_resolve(snap, file))
+            digest.update(f"{file}={hashes[file]}\n".encode())
+        for key in _env_keys(snap, service):
+            # Options added by the refresh are unset until migrated, and are
+            # not a change in the effective configuration.
+            if (value := store.get(key)) is not None:
+                digest.update(f"{key}={value}\n".encode())
+        result[service] = digest.hexdigest()
+
+    return result
+
+
+def state_file(common: Union[str, PathLike]) -> Path:
+    """Get the file that the `pre-refresh` hook records fingerprints in.
+
+    Args:
+        common: Path to $SNAP_COMMON.
+    """
+    return Path(common) / ".refresh-state.json"
+
+
+def save_state(common: Union[str, PathLike], state: Dict[str, str]) -> None:
+    """Record the fingerprints taken before a refresh.
+
+    Args:
+        common: Path to $SNAP_COMMON.
+        state: Fingerprints as returned by `fingerprints`.
+    """
+    state_file(common).write_text(json.dumps(state))
+
+
+def pop_state(common: Union[str, PathLike]) -> Optional[Dict[str, str]]:
+    """Get and remove the fingerprints taken before a refresh.
+
+    Args:
+        common: Path to $SNAP_COMMON.
+
+    Returns:
+        The recorded fingerprints, or `None` if none were recorded, e.g. when
+        refreshing from a revision without a `pre-refresh` hook.
+    """
+    file = state_file(common)
+    try:
+        state = json.loads(file.read_text())
+    except FileNotFoundError:
+        return None
+    except ValueError:
+        logging.warning("ignoring corrupt refresh state %s", file)
+        state = None
+
+    file.unlink()
+    return state
+
+
+def changed_services(before: Optional[Dict[str, str]], after: Dict[str, str]) -> List[str]:
+    """Get the daemons whose fingerprint changed during a refresh.
+
+    Args:
+        before: Fingerprints taken before the refresh. If `None`, every daemon is changed.
+        after: Fingerprints taken after the refresh.
+    """
+    if before is None:
+        return sorted(after)
+
+    return sorted(s for s, fp in after.items() if before.get(s) != fp)
@@ -0,0 +1,143 @@
+# Copyright 2025 Canonical Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Plan and apply service restarts for the Slurm snap."""
+
+import logging
+from typing import Dict, List, Optional, Set
+
+from snaphelpers import Snap
+
+from .snapctl import SnapCtlClient
+
+# Services that must be restarted before a given service is restarted.
+# Keep in sync with the `after` ordering of the apps in `snap/snapcraft.yaml`.
+SERVICE_DEPENDENCIES: Dict[str, List[str]] = {
+    "slurmctld": ["munged"],
+    "slurmd": ["munged"],
+    "slurmdbd": ["munged"],
+    "slurmrestd": ["munged"],
+    "prometheus-slurm-exporter": ["munged"],
+    "slurmrestd-proxy": ["slurmrestd"],
+}
+
+
+class RestartPlanner:
+    """Collect services that need to be restarted and restart them in batches.
+
+    Models request restarts as configuration changes. The planner uses the
+    snapshot of service state memoized by its `snapctl` client, and `apply` restarts
+    only the requested services that are active. Services are restarted in
+    dependency order with one `snapctl restart` call per stage, so `munged` is
+    restarted first and the services that depend on it are restarted together.
+
+    Models can also request that services be started or stopped, e.g. when an
+    option enables a service. These are applied together with the restarts, once
+    the configuration is committed, so each service gets a single action.
+
+    Args:
+        snap: The Snap instance.
+        snapctl: `snapctl` client shared by the hook. Used to query and restart services.
+    """
+
+    def __init__(self, snap: Snap, snapctl: Optional[SnapCtlClient] = None) -> None:
+        self._snap = snap
+        self._snapctl = snapctl if snapctl is not None else SnapCtlClient(snap)
+        self._requested: Set[str] = set()
+        self._start: Set[str] = set()
+        self._stop: Set[str] = set()
+
+    @property
+    def snapctl(self) -> SnapCtlClient:
+        """Get the `snapctl` client used by the planner."""
+        return self._snapctl
+
+    @property
+    def requested(self) -> Set[str]:
+        """Get the set of services that have been requested to restart."""
+        return set(self._requested)
+
+    def _active_services(self) -> Set[str]:
+        """Get the set of active services from a single snapshot of service state."""
+        return {name for name, service in self._snapctl.services().items() if service.active}
+
+    def request(self, *services: str) -> None:
+        """Request that services be restarted to apply the latest configuration changes.
+
+        Args:
+            services: Names of the services to restart.
+        """
+        self._requested.update(services)
+
+    def start(self, *services: str) -> None:
+        """Request that services be started and enabled at boot.
+
+        Inactive services are started instead of restarted, since starting them applies
+        the latest configuration.
+
+        Args:
+            services: Names of the services to start.
+        """
+        self._start.update(services)
+        self._stop.difference_update(services)
+
+    def stop(self, *services: str) -> None:
+        """Request that services be stopped and disabled at boot.
+
+        Args:
+            services: Names of the services to stop.
+        """
+        self._stop.update(services)
+        self._start.difference_update(services)
+
+    def plan(self) -> List[List[str]]:
+        """Get the stages of services to restart, ordered by service dependencies.
+
+        Services within a stage do not depend on each other and can be restarted together.
+        """
+        pending = (self._requested - self._stop) & self._active_services()
+        stages = []
+        while pending:
+            stage = sorted(
+                s for s in pending if not pending.intersection(SERVICE_DEPENDENCIES.get(s, []))
+            )
+            stages.append(stage)
+            pending.difference_update(stage)
+
+        return stages
+
+    def apply(self) -> None:
+        """Stop, restart, and start the requested services."""
+        if not self._requested | self._start | self._stop:
+            logging.debug("no services need to be restarted")
+            return
+
+        # Plan from the service state before any service is stopped or started.
+        stages = self.plan()
+        for service in sorted(self._requested - self._stop - self._active_services()):
+            logging.debug("service `%s` is not active. not restarting", service)
+
+        if self._stop:
+            logging.info("stopping services %s", ", ".join(f"`{s}`" for s in sorted(self._stop)))
+            self._snapctl.stop(*sorted(self._stop), disable=True)
+        for stage in stages:
+            logging.info("restarting services %s", ", ".join(f"`{s}`" for s in stage))
+            self._snapctl.restart(*stage)
+        if self._start:
+            logging.info("starting services %s", ", ".join(f"`{s}`" for s in sorted(self._start)))
+            self._snapctl.start(*sorted(self._start), enable=True)
+
+        self._requested.clear()
+        self._start.clear()
+        self._stop.clear()
@@ -0,0 +1,176 @@
+# Copyright 2025 Canonical Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Run one or more `slurmrestd` worker processes for the `slurmrestd` service.
+
+`slurmrestd` cannot share a listening socket between processes, so each worker
+listens on its own copy of the configured listeners: worker `i` listens on each
+TCP port plus `i`, and on each Unix socket with `-<i>` appended to its stem.
+Worker 0 listens on the configured listeners as given.
+"""
+
+import logging
+import os
+import signal
+import socket
+import subprocess
+from pathlib import Path
+from typing import List, Optional, Sequence
+
+# Port that `slurmrestd` listens on if no listeners are configured.
+DEFAULT_PORT = 6820
+
+
+def default_listeners() -> List[str]:
+    """Get the listeners used if `slurmrestd.listen` is unset, i.e. `<short hostname>:6820`."""
+    return [f"{socket.gethostname().split('.')[0]}:{DEFAULT_PORT}"]
+
+
+def parse_listeners(listen: str) -> List[str]:
+    """Parse a comma-separated list of listeners, e.g. `:6820,unix:/run/slurmrestd.sock`.
+
+    Args:
+        listen: Listeners to parse. The default listeners are used if empty.
+
+    Raises:
+        ValueError: Raised if a listener is neither `[host]:port` nor `unix:/path`.
+    """
+    listeners = [v.strip() for v in listen.split(",") if v.strip()]
+    for listener in listeners:
+        if listener.startswith("unix:"):
+            if not listener[5:].startswith("/"):
+                raise ValueError(f"invalid listener {listener}. unix socket path must be absolute")
+            continue
+
+        host, sep, port = listener.rpartition(":")
+        if not sep or not port.isdigit() or not 0 < int(port) < 65536:
+            raise ValueError(f"invalid listener {listener}. expected [host]:port or unix:/path")
+
+    return listeners or default_listeners()
+
+
+def worker_listeners(listeners: Sequence[str], workers: int) -> List[List[str]]:
+    """Get the listeners of each worker.
+
+    Args:
+        listeners: Listeners of the `slurmrestd` service.
+        workers: Number of worker processes.
+
+    Raises:
+        ValueError: Raised if a worker's port is out of range or if workers' listeners overlap.
+    """
+    result = []
+    seen = set()
+    for i in range(workers):
+        own = []
+        for listener in listeners:
+            if listener.startswith("unix:"):
+                path = Path(listener[5:])
+                if i:
+                    path = path.with_name(f"{path.stem}-{i}{path.suffix}")
+                own.append(f"unix:{path}")
+            else:
+                host, _, port = listener.rpartition(":")
+                if int(port) + i > 65535:
+                    raise ValueError(
+                        f"listener {listener} leaves no port for slurmrestd worker {i}"
+                    )
+                own.append(f"{host}:{int(port) + i}")
+
+        if overlap := seen.intersection(own):
+            raise ValueError(
+                f"listeners of slurmrestd workers overlap on {', '.join(sorted(overlap))}"
+            )
+        seen.update(own)
+        result.append(own)
+
+    return result
+
+
+def supervise(commands: List[List[str]]) -> int:
+    """Run worker processes until one of them exits, then stop the others.
+
+    `SIGTERM` and `SIGINT` are forwarded to every worker, so stopping the service
+    stops all of its workers. The service fails as a whole if any worker fails so
+    that snapd restarts every worker together.
+
+    Args:
+        commands: Command line of each worker.
+
+    Returns:
+        The exit status of the first worker to exit.
+    """
+    procs = {}
+
+    def forward(signum: int, _) -> None:
+        for proc in procs.values():
+            proc.send_signal(signum)
+
+    signal.signal(signal.SIGTERM, forward)
+    signal.signal(signal.SIGINT, forward)
+    for i, command in enumerate(commands):
+        proc = subprocess.Popen(command)
+        procs[proc.pid] = proc
+        logging.info("started slurmrestd worker %s (pid %s)", i, proc.pid)
+
+    pid, status = os.wait()
+    exited = procs.pop(pid)
+    exited.returncode = os.waitstatus_to_exitcode(status)
+    logging.info("slurmrestd worker (pid %s) exited with %s", pid, exited.returncode)
+
+    for proc in procs.values():
+        proc.terminate()
+    for proc in procs.values():
+        try:
+            proc.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            logging.warning("slurmrestd worker (pid %s) did not stop. killing", proc.pid)
+            proc.kill()
+            proc.wait()
+
+    # A worker killed by a signal has a negative exit code.
+    return exited.returncode if exited.returncode >= 0 else 1
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Entrypoint of the `slurmrestd` service's worker supervisor."""
+    import argparse
+    import sys
+
+    parser = argparse.ArgumentParser(
+        prog="slurmrestd-workers", description="Run one or more slurmrestd worker processes."
+    )
+    parser.add_argument("--listen", default="", help="comma-separated listeners of the service")
+    parser.add_argument("--workers", type=int, default=1, help="number of worker processes")
+    parser.add_argument("--max-connections", help="maximum connections of each worker")
+    parser.add_argument("--max-thread-count", help="number of threads of each worker")
+    parser.add_argument("command", nargs="+", help="slurmrestd command line without listeners")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(format="%(levelname)s %(message)s", level=logging.INFO)
+    try:
+        listeners = worker_listeners(parse_listeners(args.listen), max(1, args.workers))
+    except ValueError as e:
+        parser.exit(1, f"error: {e}\n")
+
+    command = list(args.command)
+    if args.max_connections:
+        command += ["--max-connections", args.max_connections]
+    if args.max_thread_count:
+        command += ["-t", args.max_thread_count]
+
+    if len(listeners) == 1:
+        os.execvp(command[0], command + listeners[0])
+
+    sys.exit(supervise([command + own for own in listeners]))
@@ -0,0 +1,381 @@
+# Copyright 2025 Canonical Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Cache and coalesce read-only requests to `slurmrestd`.
+
+The proxy fronts the `slurmrestd` service. `GET` requests to endpoints with a
+time-to-live, e.g. `.../jobs`, are answered from a cache until their response
+expires, and concurrent identical requests share a single upstream request.
+Responses are only shared between requests with identical authentication
+headers. All other requests are forwarded as is. Upstream requests are spread
+round-robin across the `slurmrestd` workers.
+"""
+
+import http.client
+import itertools
+import logging
+import re
+import socket
+import threading
+import time
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Hashable, List, NamedTuple, Optional, Sequence, Tuple
+
+# Headers that identify the client to `slurmrestd`.
+AUTH_HEADERS = ("authorization", "x-slurm-user-name", "x-slurm-user-token")
+# Headers that select the representation of a response.
+VARY_HEADERS = ("accept", "accept-encoding")
+# Hop-by-hop headers, which only apply to a single connection and are never forwarded.
+HOP_HEADERS = frozenset(
+    {
+        "connection",
+        "keep-alive",
+        "proxy-authenticate",
+        "proxy-authorization",
+        "te",
+        "trailer",
+        "transfer-encoding",
+        "upgrade",
+    }
+)
+
+_TTL_RE = re.compile(r"^([\w-]+)=(\d+)$")
+
+
+class Response(NamedTuple):
+    """A response from `slurmrestd`.
+
+    Attributes:
+        status: HTTP status code.
+        reason: HTTP reason phrase.
+        headers: End-to-end headers of the response.
+        body: Body of the response.
+    """
+
+    status: int
+    reason: str
+    headers: List[Tuple[str, str]]
+    body: bytes
+
+
+def parse_ttls(v: str) -> Dict[str, int]:
+    """Parse the time-to-live of each endpoint, e.g. `jobs=5,nodes=30`.
+
+    Endpoints are matched against the last segment of a request's path.
+
+    Args:
+        v: Comma-separated list of `<endpoint>=<seconds>`.
+
+    Raises:
+        ValueError: Raised if an entry is not `<endpoint>=<seconds>`.
+    """
+    ttls = {}
+    for entry in v.split(","):
+        if not entry:
+            continue
+        if not (m := _TTL_RE.match(entry)):
+            raise ValueError(f"invalid cache ttl {entry}. expected <endpoint>=<seconds>")
+        ttls[m.group(1)] = int(m.group(2))
+
+    return ttls
+
+
+def endpoint(path: str) -> str:
+    """Get the endpoint of a request path, e.g. `jobs` for `/slurm/v0.0.40/jobs?state=RUNNING`."""
+    path = path.partition("?")[0].rstrip("/")
+    return path.rpartition("/")[2]
+
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    """HTTP connection over a Unix socket."""
+
+    def __init__(self, path: str, timeout: float) -> None:
+        super().__init__("localhost", timeout=timeout)
+        self._path = path
+
+    def connect(self) -> None:
+        """Connect to the Unix socket."""
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self._path)
+
+
+def connect(address: str, timeout: float) -> http.client.HTTPConnection:
+    """Create a connection to a `slurmrestd` listener.
+
+    Args:
+        address: Listener of `slurmrestd`, either `[host]:port` or `unix:/path`.
+        timeout: Socket timeout in seconds.
+    """
+    if address.startswith("unix:"):
+        return _UnixHTTPConnection(address[5:], timeout)
+
+    host, _, port = address.rpartition(":")
+    host = host.strip("[]")
+    if host in ("", "0.0.0.0", "::"):
+        # Wildcard listeners accept local connections.
+        host = "localhost"
+    return http.client.HTTPConnection(host, int(port), timeout=timeout)
+
+
+class _Flight:
+    """An upstream request that concurrent identical requests wait for."""
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.response: Optional[Response] = None
+        self.error: Optional[BaseException] = None
+
+
+class ResponseCache:
+    """Cache of successful responses that coalesces concurrent identical requests.
+
+    Args:
+        max_entries: Maximum number of cached responses. The least recently used
+            response is evicted first.
+        clock: Monotonic clock in seconds.
+    """
+
+    def __init__(self, max_entries: int = 1024, clock: Callable[[], float] = time.monotonic):
+        self.max_entries = max_entries
+        self._clock = clock
+        self._entries: "OrderedDict[Hashable, Tuple[float, Response]]" = OrderedDict()
+        self._flights: Dict[Hashable, _Flight] = {}
+        self._lock = threading.Lock()
+        self.stats = {"hit": 0, "miss": 0, "coalesced": 0}
+
+    def get(
+        self, key: Hashable, ttl: float, fetch: Callable[[], Response]
+    ) -> Tuple[Response, str]:
+        """Get a response from the cache, or fetch it if there is no fresh response.
+
+        Only one of several concurrent calls with the same key fetches the
+        response. The others wait for it and share its response or error.
+
+        Args:
+            key: Key of the request.
+            ttl: Seconds that a successful response stays fresh.
+            fetch: Callable that requests the response from upstream.
+
+        Returns:
+            The response and whether it was a `hit`, `miss`, or `coalesced`.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > self._clock():
+                self._entries.move_to_end(key)
+                self.stats["hit"] += 1
+                return entry[1], "hit"
+
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+                self.stats["miss"] += 1
+            else:
+                self.stats["coalesced"] += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.response, "coalesced"
+
+        try:
+            flight.response = fetch()
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+                if flight.response is not None and flight.response.status == 200:
+                    self._entries[key] = (self._clock() + ttl, flight.response)
+                    self._entries.move_to_end(key)
+                    while len(self._entries) > self.max_entries:
+                        self._entries.popitem(last=False)
+            flight.done.set()
+
+        return flight.response, "miss"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Answer a client's requests from the cache or from `slurmrestd`."""
+
+    protocol_version = "HTTP/1.1"
+    server: "Proxy"
+
+    def log_message(self, format: str, *args) -> None:
+        """Log requests at debug level instead of writing them to stderr."""
+        logging.debug("%s %s", self.address_string(), format % args)
+
+    def do_GET(self) -> None:
+        """Answer a `GET` request from the cache if its endpoint has a time-to-live."""
+        ttl = self.server.ttls.get(endpoint(self.path), 0)
+        if ttl <= 0:
+            self._pass()
+            return
+
+        key = (
+            self.path,
+            tuple(self.headers.get(h, "") for h in AUTH_HEADERS + VARY_HEADERS),
+        )
+        try:
+            response, status = self.server.cache.get(key, ttl, self._forward)
+        except (OSError, http.client.HTTPException) as e:
+            self._bad_gateway(e)
+            return
+
+        self._send(response, status)
+
+    def _pass(self) -> None:
+        """Forward a request to `slurmrestd` without caching its response."""
+        if "chunked" in self.headers.get("transfer-encoding", "").lower():
+            self.send_error(411, "Chunked request bodies are not supported")
+            return
+
+        try:
+            response = self._forward()
+        except (OSError, http.client.HTTPException) as e:
+            self._bad_gateway(e)
+            return
+
+        self._send(response, "bypass")
+
+    do_HEAD = do_POST = do_PUT = do_PATCH = do_DELETE = do_OPTIONS = _pass  # noqa: N815
+
+    def _forward(self) -> Response:
+        """Forward the request and its end-to-end headers to the next `slurmrestd` worker."""
+        length = int(self.headers.get("content-length") or 0)
+        body = self.rfile.read(length) if length else None
+        conn = connect(self.server.next_upstream(), self.server.upstream_timeout)
+        try:
+            conn.putrequest(self.command, self.path, skip_host=True, skip_accept_encoding=True)
+            for k, v in self.headers.items():
+                if k.lower() not in HOP_HEADERS:
+                    conn.putheader(k, v)
+            conn.endheaders(body)
+            r = conn.getresponse()
+            data = r.read()
+        finally:
+            conn.close()
+
+        # The body of a response to `HEAD` is empty, so keep its `Content-Length` as is.
+        headers = [
+            (k, v)
+            for k, v in r.getheaders()
+            if k.lower() not in HOP_HEADERS
+            and (k.lower() != "content-length" or self.command == "HEAD")
+        ]
+        return Response(r.status, r.reason, headers, data)
+
+    def _send(self, response: Response, cache_status: str) -> None:
+        """Send a response to the client."""
+        self.send_response(response.status, response.reason)
+        for k, v in response.headers:
+            self.send_header(k, v)
+        if self.command != "HEAD":
+            self.send_header("Content-Length", str(len(response.body)))
+        self.send_header("X-Cache", cache_status)
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(response.body)
+
+    def _bad_gateway(self, e: BaseException) -> None:
+        """Tell the client that `slurmrestd` could not be reached."""
+        logging.warning("request %s %s to slurmrestd failed: %s", self.command, self.path, e)
+        self.send_error(502, "slurmrestd is unavailable")
+
+
+class Proxy(ThreadingHTTPServer):
+    """Caching proxy in front of one or more `slurmrestd` workers.
+
+    Args:
+        address: `(host, port)` to listen on.
+        upstreams: Listener of each `slurmrestd` worker.
+        ttls: Seconds that responses of each endpoint stay fresh.
+        cache: Cache of responses.
+        upstream_timeout: Socket timeout of requests to `slurmrestd` in seconds.
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        address: Tuple[str, int],
+        upstreams: Sequence[str],
+        ttls: Dict[str, int],
+        cache: Optional[ResponseCache] = None,
+        upstream_timeout: float = 60,
+    ) -> None:
+        if ":" in address[0]:
+            self.address_family = socket.AF_INET6
+        super().__init__(address, _Handler)
+        self.ttls = ttls
+        self.cache = cache if cache is not None else ResponseCache()
+        self.upstream_timeout = upstream_timeout
+        self._upstreams = itertools.cycle(upstreams)
+        self._upstreams_lock = threading.Lock()
+
+    def next_upstream(self) -> str:
+        """Get the listener of the `slurmrestd` worker to send the next request to."""
+        with self._upstreams_lock:
+            return next(self._upstreams)
+
+
+def upstreams(listen: str, workers: int) -> List[str]:
+    """Get one listener of each `slurmrestd` worker, preferring Unix sockets.
+
+    Args:
+        listen: Value of `slurmrestd.listen`.
+        workers: Value of `slurmrestd.workers`.
+    """
+    from . import restd
+
+    return [
+        next((v for v in own if v.startswith("unix:")), own[0])
+        for own in restd.worker_listeners(restd.parse_listeners(listen), workers)
+    ]
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Entrypoint of the `slurmrestd-proxy` snap service."""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog="slurmrestd-proxy", description="Cache read-only requests to slurmrestd."
+    )
+    parser.add_argument("--listen-address", default=":6830", help="[host]:port to listen on")
+    parser.add_argument(
+        "--ttl", default="jobs=5,nodes=30,partitions=60", help="<endpoint>=<seconds>,..."
+    )
+    parser.add_argument("--max-entries", type=int, default=1024, help="cache size")
+    parser.add_argument("--upstream-listen", default="", help="value of slurmrestd.listen")
+    parser.add_argument("--upstream-workers", type=int, default=1, help="slurmrestd workers")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(format="%(levelname)s %(message)s", level=logging.INFO)
+    try:
+        ttls = parse_ttls(args.ttl)
+        targets = upstreams(args.upstream_listen, max(1, args.upstream_workers))
+        host, _, port = args.listen_address.rpartition(":")
+        proxy = Proxy(
+            (host.strip("[]"), int(port)), targets, ttls, ResponseCache(args.max_entries)
+        )
+    except (OSError, ValueError) as e:
+        parser.exit(1, f"error: {e}\n")
+
+    logging.info("proxying %s to slurmrestd at %s", args.listen_address, ", ".join(targets))
+    proxy.serve_forever()
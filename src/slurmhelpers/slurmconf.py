@@ -0,0 +1,680 @@
+# Copyright 2025 Canonical Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Parse and index `slurm.conf` and the files it includes.
+
+Hostlists such as `node[0001-9999]` are kept as compressed ranges, so a
+configuration describing thousands of nodes stays small in memory. Parsed
+configurations are cached by the inode, modification time, and size of every
+file read, and can be persisted to a JSON cache file so that short-lived
+processes such as hooks and service wrappers do not parse `slurm.conf` again.
+"""
+
+import glob
+import json
+import logging
+import os
+import re
+from bisect import bisect_right
+from itertools import accumulate, product
+from os import PathLike
+from pathlib import Path
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple, Union
+
+from .config import write_atomic
+
+_BRACKET_RE = re.compile(r"\[([^\]]*)\]")
+_TRAILING_DIGITS_RE = re.compile(r"^(.*?)(\d+)$")
+# `Key=Value`, optionally with whitespace around `=`. Whitespace after `=` that is followed
+# by another key belongs to an empty value, as in `Key= Other=Value`.
+_TOKEN_RE = re.compile(r'([A-Za-z][\w-]*)\s*=(?:\s+(?![A-Za-z][\w-]*\s*=))?("[^"]*"|\S*)')
+_COMMENT_RE = re.compile(r"(?<!\\)#.*")
+
+# Lines that describe a record rather than global parameters, keyed by their first key.
+_RECORD_KEYS = ("downnodes", "frontendname", "nodeset", "switchname")
+
+# Inode, modification time in nanoseconds, and size of a file.
+Stamp = Tuple[int, int, int]
+
+
+class RangeSet:
+    """A set of optionally zero-padded numbers stored as ranges, e.g. `0001-0100,0200`.
+
+    Args:
+        ranges: Sorted `(first, last, width)` ranges. Numbers are zero-padded to `width` digits.
+    """
+
+    __slots__ = ("ranges",)
+
+    def __init__(self, ranges: List[Tuple[int, int, int]]) -> None:
+        self.ranges = ranges
+
+    @classmethod
+    def parse(cls, text: str) -> "RangeSet":
+        """Parse the contents of a hostlist bracket, e.g. `0001-0100,0200`.
+
+        Raises:
+            ValueError: Raised if the text is not a list of numbers and number ranges.
+        """
+        ranges = []
+        for part in text.split(","):
+            first, _, last = part.strip().partition("-")
+            last = last or first
+            if not (first.isdigit() and last.isdigit()) or int(first) > int(last):
+                raise ValueError(f"invalid hostlist range {part}")
+            width = len(first) if first.startswith("0") and len(first) > 1 else 0
+            ranges.append((int(first), int(last), width))
+
+        return cls(_merge(ranges))
+
+    def __contains__(self, digits: str) -> bool:
+        """Check whether a number, written with its zero-padding, is in the set."""
+        n = int(digits)
+        return any(lo <= n <= hi and str(n).zfill(w) == digits for lo, hi, w in self.ranges)
+
+    def __len__(self) -> int:
+        """Get the number of numbers in the set."""
+        return sum(hi - lo + 1 for lo, hi, _ in self.ranges)
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over the zero-padded numbers in the set."""
+        for lo, hi, w in self.ranges:
+            for n in range(lo, hi + 1):
+                yield str(n).zfill(w)
+
+    def __str__(self) -> str:
+        """Format the set as the contents of a hostlist bracket."""
+        return ",".join(
+            str(lo).zfill(w) if lo == hi else f"{str(lo).zfill(w)}-{str(hi).zfill(w)}"
+            for lo, hi, w in self.ranges
+        )
+
+
+def _merge(ranges: List[Tuple[int, int, int]]) -> List[Tuple[int, int, int]]:
+    """Sort ranges and merge overlapping and adjacent ranges that format numbers alike."""
+    merged: List[Tuple[int, int, int]] = []
+    for lo, hi, w in sorted(ranges):
+        if merged:
+            plo, phi, pw = merged[-1]
+            # `09` followed by `10` continues `01-09` since both are at least 2 digits wide.
+            if lo <= phi + 1 and (w == pw or (w == 0 and len(str(lo)) >= pw)):
+                merged[-1] = (plo, max(phi, hi), pw)
+                continue
+        merged.append((lo, hi, w))
+
+    return merged
+
+
+# A hostlist pattern alternates literal text and range sets,
+# e.g. ("rack", [1-2], "-node", [01-10], "") for `rack[1-2]-node[01-10]`.
+Pattern = Tuple[Union[str, RangeSet], ...]
+
+
+class HostList:
+    """A compressed list of hosts, e.g. `node[0001-9999],login[1-2]`.
+
+    Hosts are never expanded unless the list is iterated over.
+
+    Args:
+        patterns: Hostlist patterns as returned by `HostList.parse`.
+    """
+
+    __slots__ = ("patterns",)
+
+    def __init__(self, patterns: List[Pattern]) -> None:
+        self.patterns = patterns
+
+    @classmethod
+    def parse(cls, text: str) -> "HostList":
+        """Parse a hostlist expression, compressing numbered hosts into ranges.
+
+        Args:
+            text: Hostlist expression, e.g. `node[01-10],node11,gpu1`.
+
+        Raises:
+            ValueError: Raised if a hostlist range is invalid.
+        """
+        patterns: List[Pattern] = []
+        for expr in _split_top_level(text):
+            if "[" in expr:
+                parts = _BRACKET_RE.split(expr)
+                patterns.append(
+                    tuple(RangeSet.parse(p) if i % 2 else p for i, p in enumerate(parts))
+                )
+            elif match := _TRAILING_DIGITS_RE.match(expr):
+                patterns.append((match[1], RangeSet.parse(match[2]), ""))
+            elif expr:
+                patterns.append((expr,))
+
+        return cls(_compress(patterns))
+
+    def to_list(self) -> List[List]:
+        """Serialize the list's patterns without expanding them."""
+        return [[seg.ranges if i % 2 else seg for i, seg in enumerate(p)] for p in self.patterns]
+
+    @classmethod
+    def from_list(cls, data: List[List]) -> "HostList":
+        """Deserialize patterns serialized with `to_list`."""
+        return cls(
+            [
+                tuple(
+                    RangeSet([tuple(r) for r in seg]) if i % 2 else seg for i, seg in enumerate(p)
+                )
+                for p in data
+            ]
+        )
+
+    def __contains__(self, host: str) -> bool:
+        """Check whether a host is in the list without expanding the list."""
+        return any(_match(host, pattern) for pattern in self.patterns)
+
+    def __len__(self) -> int:
+        """Get the number of hosts in the list."""
+        total = 0
+        for pattern in self.patterns:
+            count = 1
+            for segment in pattern[1::2]:
+                count *= len(segment)
+            total += count
+        return total
+
+    def __iter__(self) -> Iterator[str]:
+        """Expand the list into host names, one at a time."""
+        for pattern in self.patterns:
+            for numbers in product(*pattern[1::2]):
+                literals = pattern[0::2]
+                yield "".join(
+                    str(literals[i]) + (numbers[i] if i < len(numbers) else "")
+                    for i in range(len(literals))
+                )
+
+    def __str__(self) -> str:
+        """Format the list as a compact hostlist expression."""
+        out = []
+        for pattern in self.patterns:
+            text = ""
+            for i, segment in enumerate(pattern):
+                if i % 2 == 0:
+                    text += segment
+                elif len(segment) == 1:
+                    text += next(iter(segment))
+                else:
+                    text += f"[{segment}]"
+            out.append(text)
+
+        return ",".join(out)
+
+
+def _split_top_level(text: str) -> List[str]:
+    """Split a hostlist expression on the commas that are not inside brackets."""
+    exprs, depth, start = [], 0, 0
+    for i, c in enumerate(text):
+        if c == "[":
+            depth += 1
+        elif c == "]":
+            depth -= 1
+        elif c == "," and depth == 0:
+            exprs.append(text[start:i].strip())
+            start = i + 1
+    exprs.append(text[start:].strip())
+    return exprs
+
+
+def _compress(patterns: List[Pattern]) -> List[Pattern]:
+    """Merge single-range patterns that share a prefix, e.g. `node1,node[2-3]` to `node[1-3]`."""
+    compressed: List[Pattern] = []
+    # Keep patterns in their original order, and merge each group into its first position.
+    order: Dict[str, int] = {}
+    for pattern in patterns:
+        prefix = pattern[0] if len(pattern) == 3 and pattern[2] == "" else None
+        if prefix is None:
+            compressed.append(pattern)
+        elif prefix in order:
+            i = order[prefix]
+            ranges = compressed[i][1].ranges + pattern[1].ranges
+            compressed[i] = (prefix, RangeSet(_merge(ranges)), "")
+        else:
+            order[prefix] = len(compressed)
+            compressed.append(pattern)
+
+    return compressed
+
+
+def _match(host: str, pattern: Pattern, i: int = 0) -> bool:
+    """Check whether a host matches a hostlist pattern from segment `i` onwards."""
+    if i == len(pattern):
+        return host == ""
+
+    segment = pattern[i]
+    if i % 2 == 0:
+        return host.startswith(segment) and _match(host[len(segment) :], pattern, i + 1)
+
+    digits = len(host) - len(host.lstrip("0123456789"))
+    return any(
+        host[:n] in segment and _match(host[n:], pattern, i + 1) for n in range(digits, 0, -1)
+    )
+
+
+class Node(NamedTuple):
+    """A `NodeName` line of `slurm.conf`.
+
+    Attributes:
+        names: Hosts that the line describes.
+        attrs: Settings of the hosts, including those inherited from `NodeName=DEFAULT`.
+    """
+
+    names: HostList
+    attrs: Dict[str, str]
+
+
+class Partition(NamedTuple):
+    """A `PartitionName` line of `slurm.conf`.
+
+    Attributes:
+        name: Name of the partition.
+        nodes: Hosts in the partition. `None` if the partition contains all nodes.
+        attrs: Settings of the partition, including those inherited from `PartitionName=DEFAULT`.
+    """
+
+    name: str
+    nodes: Optional[HostList]
+    attrs: Dict[str, str]
+
+
+def _tokenize(line: str, where: str) -> List[Tuple[str, str]]:
+    """Split a `slurm.conf` line into `key=value` pairs.
+
+    Raises:
+        ValueError: Raised if the line contains anything but `key=value` pairs.
+    """
+    tokens = [(m[1], m[2].strip('"')) for m in _TOKEN_RE.finditer(line)]
+    if _TOKEN_RE.sub("", line).strip():
+        raise ValueError(f"cannot parse {where}: {line}")
+    return tokens
+
+
+class SlurmConf:
+    """Indexed contents of `slurm.conf` and the files it includes.
+
+    Parameter names are case-insensitive, like in Slurm.
+    """
+
+    def __init__(self) -> None:
+        self.parameters: Dict[str, List[str]] = {}
+        self.nodes: List[Node] = []
+        self.partitions: Dict[str, Partition] = {}
+        self.records: Dict[str, List[Dict[str, str]]] = {}
+        self.stamps: Dict[str, Stamp] = {}
+        self._index: Optional[_NodeIndex] = None
+
+    @property
+    def files(self) -> List[Path]:
+        """Get the files and include directories that the configuration was read from."""
+        return [Path(f) for f in self.stamps]
+
+    @property
+    def controllers(self) -> List[str]:
+        """Get the hostnames of the Slurm controllers, primary first."""
+        hosts = self.get_all("SlurmctldHost") or self.get_all("ControlMachine")
+        return [host.split("(")[0] for host in hosts]
+
+    def get(self, key: str, default: Optional[str] = None) -> Optional[str]:
+        """Get the value of a parameter. The last value wins if it is set more than once.
+
+        Args:
+            key: Name of the parameter, e.g. `SchedulerParameters`.
+            default: Value returned if the parameter is not set.
+        """
+        values = self.parameters.get(key.lower())
+        return values[-1] if values else default
+
+    def get_all(self, key: str) -> List[str]:
+        """Get every value of a parameter that can be set more than once, e.g. `SlurmctldHost`.
+
+        Args:
+            key: Name of the parameter.
+        """
+        return list(self.parameters.get(key.lower(), []))
+
+    def all_nodes(self) -> HostList:
+        """Get every host defined by a `NodeName` line."""
+        return HostList(_compress([p for node in self.nodes for p in node.names.patterns]))
+
+    def node(self, host: str) -> Optional[Dict[str, str]]:
+        """Get the settings of a host, or `None` if no `NodeName` line defines it.
+
+        Args:
+            host: Name of the host, e.g. `node0042`.
+        """
+        if self._index is None:
+            self._index = _NodeIndex(self.nodes)
+
+        attrs = None
+        for i in self._index.lookup(host):
+            attrs = {**(attrs or {}), **self.nodes[i].attrs}
+        return attrs
+
+    def partitions_of(self, host: str) -> List[str]:
+        """Get the names of the partitions that contain a host.
+
+        Args:
+            host: Name of the host.
+        """
+        return [
+            p.name
+            for p in self.partitions.values()
+            if (p.nodes is None and self.node(host) is not None)
+            or (p.nodes is not None and host in p.nodes)
+        ]
+
+    def includes(self, name: str) -> bool:
+        """Check whether a file with the given name was included.
+
+        Args:
+            name: File name, e.g. `slurmctld-profile.conf`.
+        """
+        return any(Path(f).name == name for f in list(self.stamps)[1:])
+
+    def fresh(self) -> bool:
+        """Check whether none of the files read have changed since they were parsed."""
+        return all(_stamp(Path(f)) == stamp for f, stamp in self.stamps.items())
+
+    def to_dict(self) -> Dict:
+        """Serialize the configuration for the JSON cache file."""
+        return {
+            "parameters": self.parameters,
+            "nodes": [[n.names.to_list(), n.attrs] for n in self.nodes],
+            "partitions": [
+                [p.name, None if p.nodes is None else p.nodes.to_list(), p.attrs]
+                for p in self.partitions.values()
+            ],
+            "records": self.records,
+            "stamps": self.stamps,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "SlurmConf":
+        """Deserialize a configuration from the JSON cache file."""
+        conf = cls()
+        conf.parameters = data["parameters"]
+        conf.nodes = [Node(HostList.from_list(names), attrs) for names, attrs in data["nodes"]]
+        conf.partitions = {
+            name: Partition(name, None if nodes is None else HostList.from_list(nodes), attrs)
+            for name, nodes, attrs in data["partitions"]
+        }
+        conf.records = data["records"]
+        conf.stamps = {f: tuple(s) for f, s in data["stamps"].items()}
+        return conf
+
+
+class _NodeIndex:
+    """Find the `NodeName` lines that define a host without scanning every line.
+
+    Lines of the common `prefix[ranges]` form are indexed by prefix and sorted by
+    their first number. Any other line is checked on every lookup.
+
+    Args:
+        nodes: `NodeName` lines to index.
+    """
+
+    def __init__(self, nodes: List[Node]) -> None:
+        ranged: Dict[str, List[Tuple[int, int, int, int]]] = {}
+        self._other: List[Tuple[int, Pattern]] = []
+        for i, node in enumerate(nodes):
+            for pattern in node.names.patterns:
+                if len(pattern) == 3 and pattern[2] == "":
+                    ranged.setdefault(pattern[0], []).extend(
+                        (lo, hi, w, i) for lo, hi, w in pattern[1].ranges
+                    )
+                else:
+                    self._other.append((i, pattern))
+
+        # Per prefix: sorted ranges, their first numbers, and the running maximum of
+        # their last numbers, which bounds how far back a lookup has to search.
+        self._ranged = {}
+        for prefix, ranges in ranged.items():
+            ranges.sort()
+            self._ranged[prefix] = (
+                ranges,
+                [r[0] for r in ranges],
+                list(accumulate((r[1] for r in ranges), max)),
+            )
+
+    def lookup(self, host: str) -> List[int]:
+        """Get the indexes of the `NodeName` lines that define a host, in file order."""
+        found = {i for i, pattern in self._other if _match(host, pattern)}
+        if (match := _TRAILING_DIGITS_RE.match(host)) and match[1] in self._ranged:
+            ranges, firsts, maxes = self._ranged[match[1]]
+            digits, n = match[2], int(match[2])
+            j = bisect_right(firsts, n) - 1
+            while j >= 0 and maxes[j] >= n:
+                lo, hi, w, i = ranges[j]
+                if n <= hi and str(n).zfill(w) == digits:
+                    found.add(i)
+                j -= 1
+
+        return sorted(found)
+
+
+def _stamp(file: Path) -> Optional[Stamp]:
+    """Get the inode, modification time, and size of a file, or `None` if it is missing."""
+    try:
+        st = os.stat(file)
+    except FileNotFoundError:
+        return None
+    return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+
+def _lines(file: Path) -> Iterator[Tuple[int, str]]:
+    """Read the logical lines of a `slurm.conf` file without comments or continuations."""
+    pending, start = "", 0
+    with file.open() as f:
+        for n, raw in enumerate(f, start=1):
+            line = raw.rstrip("\n")
+            # `#` starts a comment unless it is escaped as `\#`.
+            if "#" in line:
+                line = _COMMENT_RE.sub("", line).replace(r"\#", "#")
+            if not pending:
+                start = n
+            if line.endswith("\\"):
+                pending += line[:-1]
+                continue
+            line, pending = (pending + line).strip(), ""
+            if line:
+                yield start, line
+
+
+def _parse_file(
+    file: Path,
+    conf: SlurmConf,
+    defaults: Dict[str, Dict[str, str]],
+    including: Tuple[str, ...] = (),
+) -> None:
+    """Parse a `slurm.conf` file into `conf`, following `Include` lines.
+
+    Args:
+        file: File to parse.
+        conf: Configuration to parse the file into.
+        defaults: Settings of `NodeName=DEFAULT` and `PartitionName=DEFAULT` lines so far.
+        including: Files whose `Include` lines led to this file.
+    """
+    including += (str(file),)
+    conf.stamps[str(file)] = _stamp(file)
+    for n, line in _lines(file):
+        where = f"{file}:{n}"
+        keyword, _, rest = line.partition(" ")
+        if keyword.lower() == "include":
+            pattern = Path(rest.strip().strip('"'))
+            if not pattern.is_absolute():
+                pattern = file.parent / pattern
+            matches = sorted(glob.glob(str(pattern)))
+            if glob.has_magic(str(pattern)):
+                # New files matching the pattern change the directory's modification time.
+                conf.stamps[str(pattern.parent)] = _stamp(pattern.parent)
+            elif not matches:
+                raise FileNotFoundError(f"cannot include {pattern} from {where}. file not found")
+            for match in matches:
+                if match in including:
+                    raise ValueError(f"recursive include of {match} from {where}")
+                _parse_file(Path(match), conf, defaults, including)
+            continue
+
+        tokens = _tokenize(line, where)
+        first, value = tokens[0][0].lower(), tokens[0][1]
+        attrs = dict(tokens[1:])
+        if first in ("nodename", "partitionname"):
+            if value.upper() == "DEFAULT":
+                defaults.setdefault(first, {}).update(attrs)
+                continue
+            attrs = {**defaults.get(first, {}), **attrs}
+            if first == "nodename":
+                conf.nodes.append(Node(HostList.parse(value), attrs))
+            else:
+                nodes = attrs.get("Nodes", "")
+                conf.partitions[value] = Partition(
+                    value, None if nodes.upper() == "ALL" else HostList.parse(nodes), attrs
+                )
+        elif first in _RECORD_KEYS:
+            conf.records.setdefault(first, []).append(dict(tokens))
+        else:
+            for key, v in tokens:
+                conf.parameters.setdefault(key.lower(), []).append(v)
+
+
+def parse(file: Union[str, PathLike]) -> SlurmConf:
+    """Parse `slurm.conf` and the files it includes.
+
+    Args:
+        file: Path to `slurm.conf`.
+
+    Raises:
+        FileNotFoundError: Raised if the file or a file it includes does not exist.
+        ValueError: Raised if a line cannot be parsed or a file includes itself.
+    """
+    conf = SlurmConf()
+    _parse_file(Path(file), conf, {})
+    return conf
+
+
+# Parsed configurations of this process, keyed by the path of `slurm.conf`.
+_cache: Dict[str, SlurmConf] = {}
+
+
+def cache_file(common: Union[str, PathLike]) -> Path:
+    """Get the JSON file that parsed configurations are cached in between processes.
+
+    Args:
+        common: Path to $SNAP_COMMON.
+    """
+    return Path(common) / ".slurm-conf-cache.json"
+
+
+def _read_cache(file: Path, conf_file: str) -> Optional[SlurmConf]:
+    """Read a cached configuration, or `None` if there is no usable cached configuration."""
+    try:
+        data = json.loads(file.read_text())
+        if data.get("file") != conf_file:
+            return None
+        return SlurmConf.from_dict(data["conf"])
+    except FileNotFoundError:
+        return None
+    except (KeyError, TypeError, ValueError):
+        logging.warning("ignoring corrupt slurm.conf cache %s", file)
+        return None
+
+
+def _write_cache(file: Path, conf_file: str, conf: SlurmConf) -> None:
+    """Atomically write a parsed configuration to the cache file."""
+    write_atomic(file, json.dumps({"file": conf_file, "conf": conf.to_dict()}), 0o600)
+
+
+def load(file: Union[str, PathLike], cache: Optional[Union[str, PathLike]] = None) -> SlurmConf:
+    """Get the parsed `slurm.conf`, only parsing it again if a file it reads has changed.
+
+    Args:
+        file: Path to `slurm.conf`.
+        cache: JSON file to share the parsed configuration with other processes.
+            See `cache_file`. Only this process' cache is used if `None`.
+
+    Raises:
+        FileNotFoundError: Raised if the file or a file it includes does not exist.
+        ValueError: Raised if a line cannot be parsed or a file includes itself.
+    """
+    key = str(file)
+    conf = _cache.get(key)
+    if conf is None and cache is not None:
+        conf = _read_cache(Path(cache), key)
+    if conf is not None and conf.fresh():
+        _cache[key] = conf
+        return conf
+
+    logging.debug("parsing %s", file)
+    conf = parse(file)
+    _cache[key] = conf
+    if cache is not None:
+        try:
+            _write_cache(Path(cache), key, conf)
+        except OSError as e:
+            logging.warning("failed to write slurm.conf cache %s. reason %s", cache, e)
+
+    return conf
+
+
+def main() -> None:
+    """Entrypoint for the `slurm-conf` snap app."""
+    import argparse
+    import sys
+
+    from snaphelpers import Snap
+
+    parser = argparse.ArgumentParser(prog="slurm-conf", description="Query slurm.conf.")
+    parser.add_argument(
+        "--file", type=Path, help="file to query instead of slurm.conf, e.g. slurmdbd.conf"
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("check", help="check that slurm.conf and its includes can be parsed")
+    get = subparsers.add_parser("get", help="print the value of a parameter")
+    get.add_argument("key")
+    nodes = subparsers.add_parser("nodes", help="print the hostlist of all or a partition's nodes")
+    nodes.add_argument("partition", nargs="?")
+    includes = subparsers.add_parser("includes", help="check whether a file is included")
+    includes.add_argument("name")
+    args = parser.parse_args()
+
+    common = Snap().paths.common
+    try:
+        if args.file is not None:
+            # Other files, such as slurmdbd.conf, may contain secrets and are never cached.
+            conf = parse(args.file)
+        else:
+            conf = load(common / "etc" / "slurm" / "slurm.conf", cache_file(common))
+    except (OSError, ValueError) as e:
+        parser.exit(1, f"error: {e}\n")
+
+    match args.command:
+        case "get":
+            value = conf.get(args.key)
+            if value is None:
+                sys.exit(1)
+            print(value)
+        case "nodes":
+            if args.partition is None:
+                print(conf.all_nodes())
+            elif args.partition not in conf.partitions:
+                parser.exit(1, f"error: no partition {args.partition}\n")
+            else:
+                partition = conf.partitions[args.partition]
+                print("ALL" if partition.nodes is None else partition.nodes)
+        case "includes":
+            sys.exit(0 if conf.includes(args.name) else 1)
@@ -0,0 +1,129 @@
+# Copyright 2025 Canonical Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Access `snapctl` with as few calls as possible during a hook."""
+
+import logging
+from copy import deepcopy
+from typing import Any, Dict, Optional, Set
+
+from snaphelpers import Snap, SnapCtl
+from snaphelpers._ctl import ServiceInfo
+
+from . import profiling
+
+
+class SnapCtlClient:
+    """Fetch snap configuration and service state once per hook.
+
+    Every `snapctl` call starts a subprocess, so results are memoized for the
+    rest of the hook. Configuration is fetched with a single `snapctl get` and
+    service state with a single `snapctl services`. A cached result is only
+    invalidated by a write that changes it, e.g. starting a service invalidates
+    the cached service state.
+
+    Args:
+        snap: The Snap instance.
+        snapctl: `snapctl` backend. Defaults to running the `snapctl` command.
+    """
+
+    def __init__(self, snap: Snap, snapctl: Optional[SnapCtl] = None) -> None:
+        self._snapctl = snapctl if snapctl is not None else SnapCtl(env=snap.environ)
+        self._config: Dict[str, Any] = {}
+        self._fetched: Set[str] = set()
+        self._services: Optional[Dict[str, ServiceInfo]] = None
+        self._calls = 0
+
+    @property
+    def calls(self) -> int:
+        """Get the number of `snapctl` calls made by the client."""
+        return self._calls
+
+    def config(self, *namespaces: str) -> Dict[str, Any]:
+        """Get the snap configuration options of the given namespaces.
+
+        Namespaces that have not been fetched yet are fetched with a single
+        `snapctl get` call. Unset namespaces are omitted from the result.
+
+        Args:
+            namespaces: Namespaces to get, e.g. `slurmd`.
+        """
+        if missing := [n for n in namespaces if n not in self._fetched]:
+            logging.debug("fetching snap configuration for %s", ", ".join(missing))
+            with profiling.phase("snapctl.get"):
+                self._calls += 1
+                self._config.update(self._snapctl.config_get(*missing))
+            self._fetched.update(missing)
+
+        return {n: deepcopy(self._config[n]) for n in namespaces if n in self._config}
+
+    def set_config(self, options: Dict[str, Any]) -> None:
+        """Set snap configuration options.
+
+        Args:
+            options: Options to set. Keys can use dotted notation, e.g. `slurmd.config-server`.
+        """
+        with profiling.phase("snapctl.set"):
+            self._calls += 1
+            self._snapctl.config_set(options)
+
+        # Only refetch the namespaces that were written.
+        written = {key.split(".")[0] for key in options}
+        self._fetched.difference_update(written)
+        for namespace in written:
+            self._config.pop(namespace, None)
+
+    def services(self) -> Dict[str, ServiceInfo]:
+        """Get the state of the snap's services, keyed by service name."""
+        if self._services is None:
+            with profiling.phase("snapctl.services"):
+                self._calls += 1
+                self._services = {info.name: info for info in self._snapctl.services()}
+
+        return dict(self._services)
+
+    def start(self, *services: str, enable: bool = False) -> None:
+        """Start services, and optionally enable them at boot.
+
+        Args:
+            services: Names of the services to start.
+            enable: Whether to also enable the services.
+        """
+        with profiling.phase("snapctl.start"):
+            self._calls += 1
+            self._snapctl.start(*services, enable=enable)
+        self._services = None
+
+    def stop(self, *services: str, disable: bool = False) -> None:
+        """Stop services, and optionally disable them at boot.
+
+        Args:
+            services: Names of the services to stop.
+            disable: Whether to also disable the services.
+        """
+        with profiling.phase("snapctl.stop"):
+            self._calls += 1
+            self._snapctl.stop(*services, disable=disable)
+        self._services = None
+
+    def restart(self, *services: str) -> None:
+        """Restart services.
+
+        Args:
+            services: Names of the services to restart.
+        """
+        with profiling.phase("snapctl.restart"):
+            self._calls += 1
+            self._snapctl.restart(*services)
+        self._services = None
@@ -0,0 +1,31 @@
+#!/usr/bin/env python3
+# Copyright 2025 Canonical Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Configure benchmarks."""
+
+import pytest
+
+# Reuse the mock `Snap` and filesystem fixtures from the unit tests so that the
+# benchmarks exercise the hooks under the same conditions as the unit tests.
+from tests.unit.conftest import env, fake_fs, snap, snapctl  # noqa: F401
+
+
+@pytest.fixture
+def host(mocker):
+    """Pin the host resources used to size the snap's services."""
+    mocker.patch("slurmhelpers.host.cpu_count", return_value=64)
+    mocker.patch("slurmhelpers.host.memory_total", return_value=256 * 2**30)
+    mocker.patch("slurmhelpers.host.nofile_limit", return_value=524288)
+    yield
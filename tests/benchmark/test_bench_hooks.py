@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+# Copyright 2025 Canonical Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Benchmark the Python-based hooks of the Slurm snap."""
+
+import shutil
+from pathlib import Path
+
+import pytest
+
+from slurmhelpers import hooks
+
+COMMON = Path("/var/snap/slurm/common")
+
+# Options accepted by the `configure` hook, in the order they are enabled as the
+# number of options under benchmark grows.
+OPTIONS = [
+    ("slurmd", "config-server", "ctl-0:6817,ctl-1:6817"),
+    ("munged", "max-thread-count", 16),
+    ("slurmrestd", "profile", "high-throughput"),
+    ("slurmrestd", "max-thread-count", 32),
+    ("slurmrestd", "max-connections", 512),
+]
+
+
+def _reset_common() -> None:
+    """Remove all state created under $SNAP_COMMON by a previous hook run."""
+    shutil.rmtree(COMMON)
+    COMMON.mkdir(parents=True)
+
+
+@pytest.mark.benchmark(group="install")
+def test_install(benchmark, snap, fake_fs, host) -> None:
+    """Benchmark the `install` hook on a fresh installation."""
+    fake_fs.create_file("/snap/slurm/1/templates/logrotate.conf.tmpl", contents="$SNAP_COMMON\n")
+    benchmark.pedantic(hooks.install, args=(snap,), setup=_reset_common, rounds=50)
+
+
+@pytest.mark.benchmark(group="configure")
+@pytest.mark.parametrize("env_size", [10, 100, 1000])
+@pytest.mark.parametrize("option_count", [0, 1, 3, 5])
+def test_configure(benchmark, snap, snapctl, fake_fs, host, env_size, option_count) -> None:
+    """Benchmark the `configure` hook for growing `.env` files and option counts."""
+    env = "".join(f"UNMANAGED_KEY_{i}='{i}'\n" for i in range(env_size))
+    options = {}
+    for service, key, value in OPTIONS[:option_count]:
+        options.setdefault(service, {})[key] = value
+    snapctl.config = options
+
+    def setup():
+        (COMMON / ".env").write_text(env)
+
+    benchmark.extra_info.update({"env_size": env_size, "option_count": option_count})
+    benchmark.pedantic(hooks.configure, args=(snap,), setup=setup, rounds=50)
@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+# Copyright 2025 Canonical Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Benchmark reading new lines from a large Slurm log."""
+
+import pytest
+
+from slurmhelpers.logreader import LogReader
+
+LINE = "[2025-01-01T00:00:00.000] sched: Allocate JobId={} NodeList=node0001 #CPUs=4\n"
+
+
+@pytest.mark.benchmark(group="logreader")
+def test_read_new_lines(benchmark, tmp_path) -> None:
+    """Benchmark reading 100 new lines appended to a log of 200,000 lines."""
+    log = tmp_path / "slurmctld.log"
+    log.write_text("".join(LINE.format(n) for n in range(200_000)))
+    reader = LogReader(tmp_path, tmp_path / "checkpoint.json")
+    for _ in reader.records():
+        pass
+    read_to = reader.positions["slurmctld.log"]
+    with log.open("a") as f:
+        f.write("".join(LINE.format(n) for n in range(100)))
+
+    def read():
+        reader.positions["slurmctld.log"] = read_to
+        return list(reader.records())
+
+    assert len(benchmark(read)) == 100
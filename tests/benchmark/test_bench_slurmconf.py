@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+# Copyright 2025 Canonical Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Benchmark parsing and querying a `slurm.conf` of a 10,000 node cluster."""
+
+import pytest
+
+from slurmhelpers import slurmconf
+
+
+@pytest.fixture
+def conf_file(tmp_path):
+    """Write a `slurm.conf` with one `NodeName` line per rack of 10 nodes."""
+    lines = ["ClusterName=hpc", "SlurmctldHost=ctld-0"]
+    lines += [
+        f"NodeName=node[{r * 10:05}-{r * 10 + 9:05}] CPUs=64 Feature=rack{r}" for r in range(1000)
+    ]
+    lines.append("PartitionName=compute Nodes=ALL Default=YES")
+    file = tmp_path / "slurm.conf"
+    file.write_text("\n".join(lines) + "\n")
+    yield file
+
+
+@pytest.mark.benchmark(group="slurmconf")
+def test_parse(benchmark, conf_file) -> None:
+    """Benchmark a cold parse of `slurm.conf`."""
+    conf = benchmark(slurmconf.parse, conf_file)
+    assert str(conf.all_nodes()) == "node[00000-09999]"
+
+
+@pytest.mark.benchmark(group="slurmconf")
+def test_load_cached(benchmark, conf_file, tmp_path) -> None:
+    """Benchmark loading `slurm.conf` from the cache file in a new process and querying it."""
+    cache = tmp_path / "cache.json"
+    slurmconf.load(conf_file, cache)
+
+    def load():
+        slurmconf._cache.clear()
+        return slurmconf.load(conf_file, cache).node("node09999")
+
+    assert benchmark(load)["Feature"] == "rack999"
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+# Copyright 2025 Canonical Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Benchmark interpreter cold start and import time of the snap hooks.
+
+Every hook run by snapd starts a new Python interpreter, so the cost of
+starting the interpreter and importing the hooks is paid on every
+`snap install`, `snap refresh`, and `snap set` invocation.
+"""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+import slurmhelpers
+
+SRC = Path(slurmhelpers.__file__).parents[1]
+
+
+def _python(*args: str) -> str:
+    """Run a fresh Python interpreter with `slurmhelpers` importable."""
+    env = {**os.environ, "PYTHONPATH": str(SRC)}
+    return subprocess.run(
+        [sys.executable, *args], env=env, capture_output=True, text=True, check=True
+    ).stderr
+
+
+def _import_times(module: str) -> dict:
+    """Get cumulative import time in microseconds of each top-level import.
+
+    Uses the output of `python -X importtime`.
+    """
+    times = {}
+    for line in _python("-X", "importtime", "-c", f"import {module}").splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[12:].split("|")
+        # Nested imports are indented under the module that imports them.
+        name = name[1:]
+        if not name.startswith(" "):
+            times[name.strip()] = int(cumulative)
+    return times
+
+
+@pytest.mark.benchmark(group="startup")
+def test_interpreter(benchmark) -> None:
+    """Benchmark bare interpreter start as a baseline for hook startup."""
+    benchmark.pedantic(_python, args=("-c", "pass"), rounds=20)
+
+
+@pytest.mark.benchmark(group="startup")
+@pytest.mark.parametrize(
+    "module", ["slurmhelpers.hooks", "slurmhelpers.models", "snaphelpers", "dotenv"]
+)
+def test_import(benchmark, module) -> None:
+    """Benchmark interpreter start plus import of the hooks and their dependencies."""
+    benchmark.extra_info["import_time_us"] = _import_times(module)
+    benchmark.pedantic(_python, args=("-c", f"import {module}"), rounds=20)
@@ -15,18 +15,87 @@
 
 """Configure unit tests."""
 
-from unittest.mock import MagicMock, PropertyMock
+from copy import deepcopy
+from typing import Any, Dict, List, Optional, Tuple
 
 import pytest
-from snaphelpers import Snap, SnapConfig, SnapConfigOptions, SnapServices
+from snaphelpers import Snap
 from snaphelpers._ctl import ServiceInfo
 
-from slurmhelpers.models import Munged, Slurmd, Slurmrestd
+from slurmhelpers.models import (
+    Logrotate,
+    Munged,
+    PrometheusSlurmExporter,
+    Slurmctld,
+    Slurmd,
+    Slurmdbd,
+    Slurmrestd,
+    SlurmrestdProxy,
+)
+
+
+class FakeSnapCtl:
+    """Stand-in for `snapctl` that keeps snap state in memory instead of talking to snapd.
+
+    Args:
+        config: Snap configuration options keyed by namespace.
+        services: Whether each of the snap's services is active, keyed by service name.
+    """
+
+    def __init__(
+        self,
+        config: Optional[Dict[str, Any]] = None,
+        services: Optional[Dict[str, bool]] = None,
+    ) -> None:
+        self.config = config if config is not None else {}
+        self.active = services if services is not None else {}
+        self.enabled: Dict[str, bool] = dict(self.active)
+        self.calls: List[Tuple[str, ...]] = []
+
+    def config_get(self, *keys: str) -> Dict[str, Any]:
+        """Get snap configuration options, omitting unset keys."""
+        self.calls.append(("get", *keys))
+        return {k: deepcopy(self.config[k]) for k in keys if k in self.config}
+
+    def config_set(self, configs: Dict[str, Any]) -> None:
+        """Set snap configuration options using dotted keys."""
+        self.calls.append(("set", *configs))
+        for key, value in configs.items():
+            namespace, _, name = key.partition(".")
+            self.config.setdefault(namespace, {})[name] = value
+
+    def services(self, *services: str) -> List[ServiceInfo]:
+        """Get the state of the snap's services."""
+        self.calls.append(("services", *services))
+        return [
+            ServiceInfo(name, self.enabled.get(name, False), active, [])
+            for name, active in self.active.items()
+            if not services or name in services
+        ]
+
+    def start(self, *services: str, enable: bool = False) -> None:
+        """Start services."""
+        self.calls.append(("start", *services))
+        for service in services:
+            self.active[service] = True
+            self.enabled[service] = self.enabled.get(service, False) or enable
+
+    def stop(self, *services: str, disable: bool = False) -> None:
+        """Stop services."""
+        self.calls.append(("stop", *services))
+        for service in services:
+            self.active[service] = False
+            self.enabled[service] = self.enabled.get(service, False) and not disable
+
+    def restart(self, *services: str, reload: bool = False) -> None:
+        """Restart services."""
+        self.calls.append(("restart", *services))
 
 
 @pytest.fixture
 def fake_fs(fs):
     """Mock filesystem for configuration hook unit tests."""
+    fs.create_dir("/var/snap/slurm/common")
     yield fs
 
 
@@ -48,37 +117,29 @@ def env():
 
 
 @pytest.fixture
-def snap(env):
-    """Create a mock `Snap` object with configuration preloaded."""
-    snap = Snap(environ=env)
-    config_options = MagicMock(SnapConfigOptions)
-    config_options.as_dict.return_value = {
-        "munged": {},
-        "slurmd": {},
-        "slurmrestd": {},
-    }
-    config = MagicMock(SnapConfig)
-    config.get_options.return_value = config_options
-    snap.config = config
-    snap.services = MagicMock(SnapServices)
-    yield snap
+def snapctl():
+    """Create a fake `snapctl` backend with configuration preloaded."""
+    yield FakeSnapCtl(config={"munged": {}, "slurmd": {}, "slurmrestd": {}})
+
+
+@pytest.fixture
+def snap(env, snapctl, mocker):
+    """Create a `Snap` object whose `snapctl` calls go to the fake `snapctl` backend."""
+    mocker.patch("slurmhelpers.snapctl.SnapCtl", return_value=snapctl)
+    yield Snap(environ=env)
 
 
 @pytest.fixture
-def snap_empty_config(env):
-    """Create a mock `Snap` object with empty configuration."""
-    snap = Snap(environ=env)
-    snap.config = MagicMock(SnapConfig)
-    snap.services = MagicMock(SnapServices)
+def snap_empty_config(snap, snapctl):
+    """Create a `Snap` object with empty configuration."""
+    snapctl.config.clear()
     yield snap
 
 
 @pytest.fixture
-def base_model(snap):
+def base_model(snap, snapctl):
     """Create a mock `_BaseModel` object."""
-    service = MagicMock(ServiceInfo)
-    type(service).active = PropertyMock(return_value=False)
-    snap.services.list.return_value = {"test": service}
+    snapctl.active["test"] = False
     # Use the `Slurm` data model since `_BaseModel` is an abstract class.
     # `_BaseModel` cannot be directly instantiated since `update_config`
     # is an abstract method.
@@ -86,18 +147,50 @@ def base_model(snap):
 
 
 @pytest.fixture
-def munged(snap):
+def logrotate(snap, fake_fs):
+    """Create a mock `Logrotate` object."""
+    yield Logrotate(snap)
+
+
+@pytest.fixture
+def munged(snap, fake_fs):
     """Create a mock `Munge` object."""
     yield Munged(snap)
 
 
 @pytest.fixture
-def slurmd(snap):
+def exporter(snap, fake_fs):
+    """Create a mock `PrometheusSlurmExporter` object."""
+    yield PrometheusSlurmExporter(snap)
+
+
+@pytest.fixture
+def slurmctld(snap, fake_fs):
+    """Create a mock `Slurmctld` object."""
+    fake_fs.create_dir("/var/snap/slurm/common/etc/slurm")
+    yield Slurmctld(snap)
+
+
+@pytest.fixture
+def slurmd(snap, fake_fs):
     """Create a mock `Slurmd` object."""
     yield Slurmd(snap)
 
 
 @pytest.fixture
-def slurmrestd(snap):
+def slurmdbd(snap, fake_fs):
+    """Create a mock `Slurmdbd` object."""
+    fake_fs.create_dir("/var/snap/slurm/common/etc/slurm")
+    yield Slurmdbd(snap)
+
+
+@pytest.fixture
+def slurmrestd(snap, fake_fs):
     """Create a mock `Slurmrestd` object."""
     yield Slurmrestd(snap)
+
+
+@pytest.fixture
+def slurmrestd_proxy(snap, fake_fs):
+    """Create a mock `SlurmrestdProxy` object."""
+    yield SlurmrestdProxy(snap)
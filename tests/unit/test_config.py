@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+# Copyright 2025 Canonical Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test the in-memory configuration store for the snap's `.env` file."""
+
+import os
+from pathlib import Path
+
+import dotenv
+import pytest
+
+from slurmhelpers.config import ConfigStore, write_atomic
+
+ENV_FILE = "/var/snap/slurm/common/.env"
+
+
+class TestWriteAtomic:
+    """Test atomically replacing files."""
+
+    def test_write_atomic(self, mocker, fake_fs) -> None:
+        """Test that files are replaced with their final mode and no temporary file is left."""
+        file = Path("/var/snap/slurm/common/munge.key")
+        fake_fs.create_file(file, contents="old")
+        write_atomic(file, b"new", 0o600)
+        assert file.read_bytes() == b"new"
+        assert file.stat().st_mode & 0o777 == 0o600
+
+        # A failed write leaves the original file as is.
+        mocker.patch("os.replace", side_effect=OSError("disk full"))
+        with pytest.raises(OSError):
+            write_atomic(file, "newer")
+        assert file.read_bytes() == b"new"
+        assert os.listdir(file.parent) == ["munge.key"]
+
+
+class TestConfigStore:
+    """Test the `ConfigStore` class."""
+
+    def test_get(self, mocker, fake_fs) -> None:
+        """Test that the `.env` file is only parsed once."""
+        fake_fs.create_file(ENV_FILE, contents="SLURMD_CONFIG_SERVER='localhost:6817'\n")
+        dotenv_values = mocker.spy(dotenv, "dotenv_values")
+        store = ConfigStore(ENV_FILE)
+        assert store.get("SLURMD_CONFIG_SERVER") == "localhost:6817"
+        assert store.get("SLURMRESTD_MAX_CONNECTIONS") is None
+        dotenv_values.assert_called_once()
+
+    def test_get_no_file(self, fake_fs) -> None:
+        """Test reading configuration before the `.env` file exists."""
+        assert ConfigStore(ENV_FILE).get("SLURMD_CONFIG_SERVER") is None
+
+    def test_set(self, fake_fs) -> None:
+        """Test that changes are only tracked for values that differ."""
+        fake_fs.create_file(ENV_FILE, contents="MUNGED_MAX_THREAD_COUNT='1'\n")
+        store = ConfigStore(ENV_FILE)
+        store.set("MUNGED_MAX_THREAD_COUNT", "1")
+        assert store.dirty == set()
+
+        store.set("MUNGED_MAX_THREAD_COUNT", "4")
+        store.set("SLURMD_CONFIG_SERVER", "")
+        assert store.dirty == {"MUNGED_MAX_THREAD_COUNT", "SLURMD_CONFIG_SERVER"}
+        assert store.get("MUNGED_MAX_THREAD_COUNT") == "4"
+
+        # Values that cannot be sourced by the service wrappers are rejected.
+        with pytest.raises(ValueError):
+            store.set("SLURMD_CONFIG_SERVER", "it's")
+
+    def test_commit(self, fake_fs) -> None:
+        """Test that pending changes are written in a single atomic replace."""
+        fake_fs.create_file(ENV_FILE, contents="MUNGED_MAX_THREAD_COUNT='1'\n")
+        os.chmod(ENV_FILE, 0o600)
+        store = ConfigStore(ENV_FILE)
+        store.set("SLURMD_CONFIG_SERVER", "ctl-0,ctl-1")
+        store.commit()
+
+        assert Path(ENV_FILE).read_text() == (
+            "MUNGED_MAX_THREAD_COUNT='1'\nSLURMD_CONFIG_SERVER='ctl-0,ctl-1'\n"
+        )
+        assert Path(ENV_FILE).stat().st_mode & 0o777 == 0o600
+        assert store.dirty == set()
+        assert os.listdir(Path(ENV_FILE).parent) == [".env"]
+
+        # Committing with no pending changes does not rewrite the file.
+        mtime = Path(ENV_FILE).stat().st_mtime_ns
+        store.commit()
+        assert Path(ENV_FILE).stat().st_mtime_ns == mtime
@@ -18,59 +18,20 @@
 Current Python-based hooks include:
   - `install`
   - `configure`
+  - `pre-refresh`
+  - `post-refresh`
 """
 
-import os
+import json
 import pathlib
 
+import pytest
+
 from slurmhelpers import hooks
 
 mock_logrotate_config = """
 $SNAP_COMMON/var/log/slurm/*.log {
-    weekly
-    rotate 4
-    size=5M
-    create 640 slurm root
-    missingok
-    nocopytruncate
-    nomail
-    notifempty
-    noolddir
-    sharedscripts
-    compress
-    delaycompress
-    compresscmd $SNAP/bin/bzip2
-    compressext .bz2
-    postrotate
-        $SNAP/usr/bin/pkill -x --signal SIGUSR2 slurmctld
-        $SNAP/usr/bin/pkill -x --signal SIGUSR2 slurmd
-        $SNAP/usr/bin/pkill -x --signal SIGUSR2 slurmdbd
-        exit 0
-    endscript
-}
-""".strip()
-target_logrotate_config = """
-/var/snap/slurm/common/var/log/slurm/*.log {
-    weekly
-    rotate 4
-    size=5M
-    create 640 slurm root
-    missingok
-    nocopytruncate
-    nomail
-    notifempty
-    noolddir
-    sharedscripts
-    compress
-    delaycompress
-    compresscmd /snap/slurm/x1/bin/bzip2
-    compressext .bz2
-    postrotate
-        /snap/slurm/x1/usr/bin/pkill -x --signal SIGUSR2 slurmctld
-        /snap/slurm/x1/usr/bin/pkill -x --signal SIGUSR2 slurmd
-        /snap/slurm/x1/usr/bin/pkill -x --signal SIGUSR2 slurmdbd
-        exit 0
-    endscript
+    $COMPRESSION
 }
 """.strip()
 
@@ -78,36 +39,152 @@ target_logrotate_config = """
 class TestHooks:
     """Test the hooks and relevant branches from slurmhelpers.hooks."""
 
-    def test_install_hook(self, mocker, snap) -> None:
+    def test_install_hook(self, mocker, snap, fake_fs) -> None:
         """Test `install` hook."""
-        mocker.patch("subprocess.check_output")
-        mocker.patch("pathlib.Path.chmod")
-        mocker.patch("pathlib.Path.mkdir")
-        mocker.patch("pathlib.Path.touch")
-        mocker.patch("pathlib.Path.read_text")
-        mocker.patch("pathlib.Path.write_text")
-        mocker.patch("pathlib.Path.write_bytes")
-        mocker.patch("dotenv.set_key")
+        mocker.patch("slurmhelpers.host.cpu_count", return_value=1)
+        mocker.patch("slurmhelpers.host.memory_total", return_value=2**30)
+        mocker.patch("slurmhelpers.host.nofile_limit", return_value=1024)
+        fake_fs.create_file(
+            "/snap/slurm/1/templates/logrotate.conf.tmpl", contents=mock_logrotate_config
+        )
         hooks.install(snap)
 
-    def test_setup_logrotate(self, mocker, snap) -> None:
-        """Test `_setup_logrotate` helper method."""
-        mocker.patch("pathlib.Path.read_text", return_value=mock_logrotate_config)
-        mocker.patch("pathlib.Path.write_text")
-        os.environ["SNAP"] = "/snap/slurm/x1"
-        os.environ["SNAP_COMMON"] = "/var/snap/slurm/common"
+        # Assert that the logrotate configuration was rendered.
+        logrotate = pathlib.Path("/var/snap/slurm/common/etc/logrotate/logrotate.conf")
+        assert "compresscmd /snap/slurm/1/usr/bin/lbzip2" in logrotate.read_text()
+
+        # Assert that the managed `slurm.conf` include was rendered.
+        profile = pathlib.Path("/var/snap/slurm/common/etc/slurm/slurmctld-profile.conf")
+        assert "Profile: default" in profile.read_text()
 
-        # Assert that logrotate template was rendered correctly.
-        hooks._setup_logrotate(snap)
-        pathlib.Path.write_text.assert_called_once_with(target_logrotate_config)
+        # Assert that a munge key was generated.
+        key = pathlib.Path("/var/snap/slurm/common/etc/munge/munge.key")
+        assert key.stat().st_mode & 0o777 == 0o600
+
+        # Assert that the default configuration was committed to the `.env` file.
+        config = pathlib.Path("/var/snap/slurm/common/.env").read_text()
+        assert "MUNGED_MAX_THREAD_COUNT='2'" in config
+        assert "MUNGED_MAX_THREAD_COUNT_AUTO='true'" in config
+        assert "SLURMRESTD_PROFILE='balanced'" in config
+        assert "SLURMRESTD_MAX_THREAD_COUNT='8'" in config
+        assert "SLURMRESTD_MAX_CONNECTIONS='48'" in config
+        assert (
+            "PROMETHEUS_SLURM_EXPORTER_ARGS='-web.listen-address=:9092 -slurm.poll-limit=10'"
+            in config
+        )
+
+    def test_refresh_hooks(self, mocker, snap, snapctl, fake_fs) -> None:
+        """Test that a refresh only restarts the daemons that changed."""
+        mocker.patch("slurmhelpers.host.cpu_count", return_value=1)
+        mocker.patch("slurmhelpers.host.memory_total", return_value=2**30)
+        mocker.patch("slurmhelpers.host.nofile_limit", return_value=1024)
+        fake_fs.create_file(
+            "/snap/slurm/1/templates/logrotate.conf.tmpl", contents=mock_logrotate_config
+        )
+        slurmd = fake_fs.create_file("/snap/slurm/1/sbin/slurmd", contents="old")
+        fake_fs.create_file("/snap/slurm/1/sbin/munged", contents="munged")
+        hooks.install(snap)
+        snapctl.active.update({"munged": True, "slurmd": True, "slurmrestd": True})
+        snapctl.calls.clear()
 
-    def test_configure_hook(self, mocker, snap) -> None:
+        # Only `slurmd` changed.
+        hooks.pre_refresh(snap)
+        slurmd.set_contents("new")
+        pathlib.Path("/var/snap/slurm/common/var/log/slurm").rmdir()
+        hooks.post_refresh(snap)
+        assert pathlib.Path("/var/snap/slurm/common/var/log/slurm").is_dir()
+        assert [c for c in snapctl.calls if c[0] == "restart"] == [("restart", "slurmd")]
+
+        # Nothing changed.
+        snapctl.calls.clear()
+        hooks.pre_refresh(snap)
+        hooks.post_refresh(snap)
+        assert [c for c in snapctl.calls if c[0] == "restart"] == []
+
+    def test_configure_hook(self, mocker, snap, fake_fs) -> None:
         """Test `configure` hook."""
         mocker.patch("slurmhelpers.models.Munged.update_config")
         mocker.patch("slurmhelpers.models.Slurmd.update_config")
         mocker.patch("slurmhelpers.models.Slurmrestd.update_config")
         hooks.configure(snap)
 
-    def test_configure_hook_no_config(self, snap_empty_config) -> None:
+        # Assert that the phases of the hook were recorded.
+        metrics = pathlib.Path("/var/snap/slurm/common/hooks-metrics.jsonl").read_text()
+        phases = [json.loads(line)["phase"] for line in metrics.splitlines()]
+        assert phases == ["snapctl.get", "options.diff", "total"]
+
+    def test_install_hook_metrics(self, mocker, snap, fake_fs) -> None:
+        """Test that the `install` hook writes the snap's metrics."""
+        mocker.patch("slurmhelpers.host.cpu_count", return_value=1)
+        mocker.patch("slurmhelpers.host.memory_total", return_value=2**30)
+        mocker.patch("slurmhelpers.host.nofile_limit", return_value=1024)
+        fake_fs.create_file(
+            "/snap/slurm/1/templates/logrotate.conf.tmpl", contents=mock_logrotate_config
+        )
+        hooks.install(snap)
+
+        textfile = pathlib.Path(
+            "/var/snap/slurm/common/var/lib/prometheus/node-exporter/slurm_snap.prom"
+        ).read_text()
+        assert 'slurm_snap_hook_success{hook="install"} 1.0' in textfile
+        assert "slurm_snap_env_drift 0.0" in textfile
+
+    def test_configure_hook_metrics_failure(self, mocker, snap, fake_fs) -> None:
+        """Test that failing to write the snap's metrics does not fail the hook."""
+        mocker.patch("slurmhelpers.models.Munged.update_config")
+        mocker.patch("slurmhelpers.models.Slurmd.update_config")
+        mocker.patch("slurmhelpers.models.Slurmrestd.update_config")
+        mocker.patch("slurmhelpers.metrics.update", side_effect=ValueError("bad metric"))
+        hooks.configure(snap)
+
+    def test_configure_hook_snapctl_calls(self, snap, snapctl, fake_fs) -> None:
+        """Test that the number of `snapctl` calls does not grow with the number of options."""
+        snapctl.active.update({"munged": True, "slurmd": True, "slurmrestd": True})
+        snapctl.config = {"munged": {"max-thread-count": 4}, "slurmd": {"config-server": "ctld-0"}}
+        hooks.configure(snap)
+        calls = len(snapctl.calls)
+
+        snapctl.calls.clear()
+        snapctl.config = {
+            "hooks": {"log-level": "info", "log-format": "json"},
+            "munged": {"max-thread-count": 8},
+            "slurmd": {"config-server": "ctld-1", "config-server-order": "given"},
+            "slurmrestd": {"max-thread-count": 16, "max-connections": 64},
+        }
+        hooks.configure(snap)
+        assert len(snapctl.calls) == calls
+        # The last `services` call reports service state in the snap's metrics.
+        assert [c[0] for c in snapctl.calls] == [
+            "get",
+            "services",
+            "restart",
+            "restart",
+            "services",
+        ]
+
+    def test_configure_hook_no_config(self, snap_empty_config, fake_fs) -> None:
         """Test `configure` when snap configuration is empty."""
         hooks.configure(snap_empty_config)
+
+    def test_configure_hook_logging(self, snap, snapctl, fake_fs) -> None:
+        """Test configuring the log settings of the hooks."""
+        snapctl.config = {"hooks": {"log-level": "info", "log-format": "json"}}
+        hooks.configure(snap)
+        config = pathlib.Path("/var/snap/slurm/common/.env").read_text()
+        assert "HOOKS_LOG_LEVEL='info'" in config
+        assert "HOOKS_LOG_FORMAT='json'" in config
+
+        # Bad log levels are rejected.
+        snapctl.config = {"hooks": {"log-level": "verbose"}}
+        with pytest.raises(ValueError):
+            hooks.configure(snap)
+
+    def test_configure_hook_invalid_payload(self, snap, snapctl, fake_fs) -> None:
+        """Test that nothing is applied if any option in the payload is invalid."""
+        snapctl.config = {
+            "hooks": {"log-level": "info"},
+            "munged": {"max-thread-count": "lots"},
+        }
+        with pytest.raises(ValueError):
+            hooks.configure(snap)
+        assert not pathlib.Path("/var/snap/slurm/common/.env").exists()
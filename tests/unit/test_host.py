@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+# Copyright 2025 Canonical Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test the host resource queries used to size the snap's services."""
+
+import pytest
+
+from slurmhelpers import host
+
+
+class TestHost:
+    """Test the host resource queries."""
+
+    def test_cpu_count(self, mocker, fake_fs) -> None:
+        """Test `cpu_count` with and without a cgroup cpu quota."""
+        mocker.patch("os.sched_getaffinity", return_value=set(range(16)))
+
+        # No cgroup hierarchy available.
+        assert host.cpu_count() == 16
+
+        # cgroup v2 without a quota. The root cgroup has no `cpu.max`.
+        fake_fs.create_file("/sys/fs/cgroup/cgroup.controllers", contents="cpu memory\n")
+        fake_fs.create_file("/proc/self/cgroup", contents="0::/system.slice/snap.slurm.scope\n")
+        scope = fake_fs.create_file(
+            "/sys/fs/cgroup/system.slice/snap.slurm.scope/cpu.max", contents="max 100000\n"
+        )
+        assert host.cpu_count() == 16
+
+        # Quotas of ancestors apply, and the tightest quota wins.
+        fake_fs.create_file("/sys/fs/cgroup/system.slice/cpu.max", contents="250000 100000\n")
+        assert host.cpu_count() == 3
+        scope.set_contents("150000 100000\n")
+        assert host.cpu_count() == 2
+
+    def test_cpu_count_cgroup_v1(self, mocker, fake_fs) -> None:
+        """Test `cpu_count` on hosts using the legacy cgroup hierarchy."""
+        mocker.patch("os.sched_getaffinity", return_value=set(range(16)))
+        fake_fs.create_file(
+            "/proc/self/cgroup", contents="5:memory:/\n4:cpu,cpuacct:/system.slice\n"
+        )
+        cpu = "/sys/fs/cgroup/cpu/system.slice"
+        fake_fs.create_file(f"{cpu}/cpu.cfs_quota_us", contents="400000\n")
+        fake_fs.create_file(f"{cpu}/cpu.cfs_period_us", contents="100000\n")
+        fake_fs.create_file("/sys/fs/cgroup/cpu/cpu.cfs_quota_us", contents="-1\n")
+        fake_fs.create_file("/sys/fs/cgroup/cpu/cpu.cfs_period_us", contents="100000\n")
+        assert host.cpu_count() == 4
+
+    def test_online_cpus(self, fake_fs) -> None:
+        """Test parsing the host's online cpus."""
+        fake_fs.create_file("/sys/devices/system/cpu/online", contents="0-3,8,10-14:2\n")
+        assert host.online_cpus() == {0, 1, 2, 3, 8, 10, 12, 14}
+        with pytest.raises(ValueError):
+            host.parse_cpu_list("3-1")
+        with pytest.raises(ValueError):
+            host.parse_cpu_list("0-1,a")
+
+    def test_memory_total(self, fake_fs) -> None:
+        """Test `memory_total` with and without a cgroup memory limit."""
+        fake_fs.create_file("/proc/meminfo", contents="MemTotal:       16384 kB\nMemFree: 1 kB\n")
+        assert host.memory_total() == 16384 * 1024
+
+        fake_fs.create_file("/sys/fs/cgroup/cgroup.controllers", contents="cpu memory\n")
+        fake_fs.create_file("/proc/self/cgroup", contents="0::/system.slice\n")
+        fake_fs.create_file("/sys/fs/cgroup/system.slice/memory.max", contents="1048576\n")
+        assert host.memory_total() == 1048576
+
+    def test_nofile_limit(self, mocker) -> None:
+        """Test `nofile_limit` returns the hard file descriptor limit."""
+        mocker.patch("resource.getrlimit", return_value=(1024, 524288))
+        assert host.nofile_limit() == 524288
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+# Copyright 2025 Canonical Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test logging for the snap's Python utility functions."""
+
+import gzip
+import json
+import logging
+
+import pytest
+
+from slurmhelpers import log
+
+
+@pytest.fixture
+def log_file(tmp_path):
+    """Create a path to a log file and stop logging to it after the test."""
+    yield tmp_path / "hooks.log"
+    log._stop_listener()
+
+
+class TestLog:
+    """Test `setup_logging` and its handlers."""
+
+    def test_setup_logging(self, log_file) -> None:
+        """Test that records are written to the log file at the configured level."""
+        log.setup_logging(log_file, level="info")
+        logging.debug("not recorded")
+        logging.info("recorded")
+        log._stop_listener()
+
+        content = log_file.read_text()
+        assert "not recorded" not in content
+        assert "root INFO recorded" in content
+
+    def test_setup_logging_json(self, log_file) -> None:
+        """Test that records can be written as JSON lines."""
+        log.setup_logging(log_file, json_format=True)
+        logging.warning("hello %s", "world")
+        log._stop_listener()
+
+        entry = json.loads(log_file.read_text())
+        assert entry["level"] == "WARNING"
+        assert entry["message"] == "hello world"
+
+    def test_rotation(self, mocker, log_file) -> None:
+        """Test that the log file is rotated by size into compressed backups."""
+        mocker.patch("slurmhelpers.log.LOG_MAX_BYTES", 1024)
+        log.setup_logging(log_file)
+        for i in range(200):
+            logging.info("message %d", i)
+        log._stop_listener()
+
+        backups = sorted(log_file.parent.glob("hooks.log.*.gz"))
+        assert [b.name for b in backups] == [f"hooks.log.{i}.gz" for i in (1, 2, 3)]
+        assert "message" in gzip.decompress(backups[0].read_bytes()).decode()
+        assert log_file.stat().st_size <= 1024
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+# Copyright 2025 Canonical Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test incrementally reading Slurm's log files."""
+
+from pathlib import Path
+
+from slurmhelpers import logreader
+from slurmhelpers.logreader import LogReader
+
+LOG_DIR = Path("/var/snap/slurm/common/var/log/slurm")
+CHECKPOINT = Path("/var/snap/slurm/common/.slurm-logs-checkpoint.json")
+
+
+def append(file: Path, text: str) -> None:
+    """Append text to a log file like a daemon would."""
+    with file.open("a") as f:
+        f.write(text)
+
+
+def messages(reader: LogReader) -> list:
+    """Read the messages of the new records."""
+    return [r["message"] for r in reader.records()]
+
+
+class TestLogReader:
+    """Test following log files across reads and rotations."""
+
+    def test_records(self, fake_fs) -> None:
+        """Test that only complete lines written since the last read are read."""
+        log = LOG_DIR / "slurmctld.log"
+        fake_fs.create_file(log, contents="[t0] one\n[t1] tw")
+        reader = LogReader(LOG_DIR, CHECKPOINT)
+        assert messages(reader) == ["one"]
+        append(log, "o\n[t2] three\n")
+        assert messages(reader) == ["two", "three"]
+        assert messages(reader) == []
+
+        # Positions persist across readers.
+        reader.save()
+        append(log, "[t3] four\n")
+        assert messages(LogReader(LOG_DIR, CHECKPOINT)) == ["four"]
+
+    def test_rotation(self, fake_fs) -> None:
+        """Test that lines written before a rotation are read from `<log>.1`."""
+        log = LOG_DIR / "slurmd.log"
+        fake_fs.create_file(log, contents="[t0] one\n")
+        reader = LogReader(LOG_DIR, CHECKPOINT)
+        assert messages(reader) == ["one"]
+
+        # The daemon writes more lines, then the log is rotated with `delaycompress`.
+        append(log, "[t1] two\n")
+        log.rename(LOG_DIR / "slurmd.log.1")
+        fake_fs.create_file(log, contents="[t2] three\n")
+        assert messages(reader) == ["two", "three"]
+        assert messages(reader) == []
+
+        # The daemon keeps appending to `<log>.1` until it reopens its log.
+        append(log, "[t3] four\n")
+        log.rename(LOG_DIR / "slurmd.log.1")
+        fake_fs.create_file(log)
+        append(LOG_DIR / "slurmd.log.1", "[t4] fi")
+        assert messages(reader) == ["four"]
+        append(LOG_DIR / "slurmd.log.1", "ve\n[t5] six")
+        assert messages(reader) == ["five"]
+        # Once it writes to the new log, the rest of `<log>.1` is complete.
+        append(log, "[t6] seven\n")
+        assert messages(reader) == ["six", "seven"]
+
+        # Lines of logs that were rotated more than once since the last read are lost.
+        for text in ("[t7] eight\n", "[t8] nine\n"):
+            (LOG_DIR / "slurmd.log.1").rename(LOG_DIR / "slurmd.log.2")
+            log.rename(LOG_DIR / "slurmd.log.1")
+            fake_fs.create_file(log, contents=text)
+        assert messages(reader) == ["nine"]
+
+        # Truncated logs are read from the start.
+        log.write_text("[t9] ten\n")
+        assert messages(reader) == ["ten"]
+
+    def test_parse_line(self) -> None:
+        """Test parsing `slurmctld` and `slurmd` log lines."""
+        assert logreader.parse_line(
+            "[2025-01-01T00:00:00.123] _slurm_rpc_submit_batch_job: JobId=42 InitPrio=1 usec=5"
+        ) == {
+            "timestamp": "2025-01-01T00:00:00.123",
+            "level": "info",
+            "component": "_slurm_rpc_submit_batch_job",
+            "job_id": 42,
+            "step": None,
+            "message": "JobId=42 InitPrio=1 usec=5",
+        }
+        record = logreader.parse_line("[2025-01-01T00:00:00.123] [42.batch] error: oom-kill")
+        assert (record["level"], record["job_id"], record["step"]) == ("error", 42, "batch")
+        assert record["message"] == "oom-kill"
+        record = logreader.parse_line("2025-01-01T00:00:00.123+00:00 debug:  Nodes are ready")
+        assert record["timestamp"] == "2025-01-01T00:00:00.123+00:00"
+        assert (record["level"], record["component"]) == ("debug", None)
+        assert record["message"] == "Nodes are ready"
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+# Copyright 2025 Canonical Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test the size-triggered log rotation service."""
+
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+from slurmhelpers import logwatch
+
+LOG_DIR = Path("/var/snap/slurm/common/var/log/slurm")
+
+
+class TestLogwatch:
+    """Test the `logrotate-watch` service."""
+
+    def test_parse_size(self) -> None:
+        """Test parsing `logrotate` sizes."""
+        assert logwatch.parse_size("512") == 512
+        assert logwatch.parse_size("100k") == 100 * 1024
+        assert logwatch.parse_size("5M") == 5 * 1024**2
+        assert logwatch.parse_size("1G") == 1024**3
+        with pytest.raises(ValueError):
+            logwatch.parse_size("5MB")
+
+    def test_watch(self, mocker, fake_fs) -> None:
+        """Test that logs are only rotated when a log crosses the size threshold."""
+        mocker.patch("time.sleep")
+        fake_fs.create_file(LOG_DIR / "slurmctld.log", st_size=1024)
+        fake_fs.create_file(LOG_DIR / "slurmd.log", st_size=10)
+        fake_fs.create_file(LOG_DIR / "slurmctld.log.1", st_size=4096)
+        rotate = MagicMock()
+
+        logwatch.watch(LOG_DIR, 2048, 30, rotate, iterations=2)
+        rotate.assert_not_called()
+
+        Path(LOG_DIR / "slurmd.log").write_bytes(b"x" * 4096)
+        assert logwatch.oversized_logs(LOG_DIR, 2048) == [LOG_DIR / "slurmd.log"]
+        logwatch.watch(LOG_DIR, 2048, 30, rotate, iterations=1)
+        rotate.assert_called_once()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+# Copyright 2025 Canonical Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test the snap's node_exporter textfile metrics."""
+
+import json
+import os
+from pathlib import Path
+
+from slurmhelpers import metrics
+from slurmhelpers.snapctl import SnapCtlClient
+
+COMMON = Path("/var/snap/slurm/common")
+
+
+class TestMetrics:
+    """Test collecting and writing the snap's health metrics."""
+
+    def test_update(self, snap, snapctl, fake_fs) -> None:
+        """Test that every metric family is written to the textfile."""
+        snapctl.active.update({"munged": True, "slurmd": False})
+        fake_fs.create_file(COMMON / "var/log/slurm/slurmd.log", st_size=2048)
+        key = fake_fs.create_file(COMMON / "etc/munge/munge.key")
+        os.utime(key.path, (1700000000, 1700000000))
+        fake_fs.create_file(
+            COMMON / "hooks-metrics.jsonl",
+            contents="".join(
+                json.dumps(r) + "\n"
+                for r in [
+                    {
+                        "hook": "install",
+                        "phase": "total",
+                        "status": "ok",
+                        "wall_ms": 2500.0,
+                        "timestamp": "2025-01-01T00:00:00+00:00",
+                    },
+                    {
+                        "hook": "configure",
+                        "phase": "snapctl.get",
+                        "status": "ok",
+                        "wall_ms": 10.0,
+                        "timestamp": "2025-01-02T00:00:00+00:00",
+                    },
+                    {
+                        "hook": "configure",
+                        "phase": "total",
+                        "status": "error",
+                        "wall_ms": 125.0,
+                        "timestamp": "2025-01-02T00:00:00+00:00",
+                    },
+                ]
+            ),
+        )
+        fake_fs.create_dir(COMMON / "var/lib/prometheus/node-exporter")
+
+        metrics.update(snap, SnapCtlClient(snap))
+        textfile = (COMMON / metrics.TEXTFILE).read_text()
+        assert 'slurm_snap_service_active{service="munged"} 1.0\n' in textfile
+        assert 'slurm_snap_service_active{service="slurmd"} 0.0\n' in textfile
+        assert 'slurm_snap_hook_duration_seconds{hook="install"} 2.5\n' in textfile
+        assert 'slurm_snap_hook_success{hook="configure"} 0.0\n' in textfile
+        assert (
+            'slurm_snap_hook_last_run_timestamp_seconds{hook="install"} 1735689600.0\n' in textfile
+        )
+        assert 'slurm_snap_log_size_bytes{file="slurmd.log"} 2048.0\n' in textfile
+        assert "slurm_snap_munge_key_mtime_seconds 1700000000.0\n" in textfile
+        assert "# TYPE slurm_snap_service_active gauge\n" in textfile
+        # Drift is only reported once a hook has recorded the `.env` file.
+        assert "slurm_snap_env_drift" not in textfile
+        # The textfile is replaced atomically, so no temporary files are left behind.
+        assert os.listdir(COMMON / "var/lib/prometheus/node-exporter") == ["slurm_snap.prom"]
+
+    def test_env_drift(self, snap, fake_fs) -> None:
+        """Test that edits to the `.env` file outside of hooks are reported as drift."""
+        env = fake_fs.create_file(COMMON / ".env", contents="MUNGED_MAX_THREAD_COUNT='2'\n")
+        metrics.record_env(COMMON)
+
+        def drift() -> float:
+            (family,) = [m for m in metrics.collect(snap, SnapCtlClient(snap)) if "env" in m.name]
+            return family.samples[0][1]
+
+        assert drift() == 0.0
+        env.set_contents("MUNGED_MAX_THREAD_COUNT='4'\n")
+        assert drift() == 1.0
+        metrics.record_env(COMMON)
+        assert drift() == 0.0
+
+    def test_render(self) -> None:
+        """Test rendering metrics in the Prometheus text format."""
+        rendered = metrics.render(
+            [
+                metrics.Metric("a", "Metric a.", [({"file": 'x"y'}, 1.5)]),
+                metrics.Metric("b", "Metric b.", []),
+            ]
+        )
+        assert rendered == '# HELP a Metric a.\n# TYPE a gauge\na{file="x\\"y"} 1.5\n'
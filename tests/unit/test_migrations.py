@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+# Copyright 2025 Canonical Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test the `.env` schema migrations and refresh fingerprints."""
+
+from pathlib import Path
+
+import pytest
+
+from slurmhelpers import migrations, refresh
+from slurmhelpers.config import ConfigStore
+from slurmhelpers.restart import RestartPlanner
+
+COMMON = Path("/var/snap/slurm/common")
+
+
+@pytest.fixture
+def store(fake_fs) -> ConfigStore:
+    """Create a configuration store with the `.env` file of an original installation."""
+    fake_fs.create_file(
+        COMMON / ".env",
+        contents=(
+            "MUNGED_MAX_THREAD_COUNT='1'\n"
+            "SLURMD_CONFIG_SERVER=''\n"
+            "SLURMRESTD_MAX_CONNECTIONS='124'\n"
+            "SLURMRESTD_MAX_THREAD_COUNT='32'\n"
+        ),
+    )
+    fake_fs.create_file("/snap/slurm/1/templates/logrotate.conf.tmpl", contents="$COMPRESSION")
+    fake_fs.create_dir(COMMON / "etc" / "logrotate")
+    fake_fs.create_dir(COMMON / "etc" / "slurm")
+    yield ConfigStore(COMMON / ".env")
+
+
+class TestMigrations:
+    """Test migrating the `.env` file between schema versions."""
+
+    def test_migrate(self, mocker, snap, store) -> None:
+        """Test that migrations are applied once and in order."""
+        mocker.patch("slurmhelpers.host.cpu_count", return_value=16)
+        mocker.patch("slurmhelpers.host.memory_total", return_value=2**34)
+        mocker.patch("slurmhelpers.host.nofile_limit", return_value=2**20)
+        restarts = RestartPlanner(snap)
+
+        assert migrations.migrate(snap, store, restarts) == migrations.LATEST
+        assert migrations.version(store) == migrations.LATEST
+        # Original defaults switch to automatic sizing. Customized values are kept.
+        assert store.get("MUNGED_MAX_THREAD_COUNT_AUTO") == "true"
+        assert store.get("MUNGED_MAX_THREAD_COUNT") == "8"
+        assert store.get("SLURMRESTD_MAX_THREAD_COUNT") == "32"
+        assert store.get("SLURMRESTD_MAX_THREAD_COUNT_AUTO") == "false"
+        assert (COMMON / "etc" / "logrotate" / "logrotate.conf").exists()
+        assert (COMMON / "etc" / "slurm" / "slurmctld-profile.conf").exists()
+        assert (COMMON / "etc" / "slurm" / "slurmdbd-tuning.conf").exists()
+
+        # Applied migrations are skipped.
+        assert migrations.migrate(snap, store, restarts) == 0
+
+    def test_migrate_original_defaults(self, mocker, snap, store, caplog) -> None:
+        """Test that switching the original fixed defaults to automatic sizing is logged."""
+        mocker.patch("slurmhelpers.host.cpu_count", return_value=2)
+        mocker.patch("slurmhelpers.host.memory_total", return_value=2**32)
+        mocker.patch("slurmhelpers.host.nofile_limit", return_value=2**20)
+        store.set("SLURMRESTD_MAX_THREAD_COUNT", "20")
+        migrations.migrate(snap, store, RestartPlanner(snap))
+
+        assert store.get("SLURMRESTD_MAX_THREAD_COUNT_AUTO") == "true"
+        assert store.get("SLURMRESTD_MAX_THREAD_COUNT") == "8"
+        assert (
+            "switched `slurmrestd` from the original defaults of 20 threads and 124 connections "
+            "to the `balanced` profile (8 threads, 48 connections)"
+        ) in caplog.text
+
+
+class TestRefresh:
+    """Test detecting the daemons that changed during a refresh."""
+
+    def test_fingerprints(self, mocker, snap, store) -> None:
+        """Test that fingerprints change with binaries and effective configuration."""
+        binary = Path("/snap/slurm/1/sbin/slurmrestd")
+        binary.parent.mkdir(parents=True)
+        binary.write_text("23.11.7")
+        before = refresh.fingerprints(snap, store)
+
+        refresh.save_state(COMMON, before)
+        assert refresh.pop_state(COMMON) == before
+        assert refresh.pop_state(COMMON) is None
+        assert refresh.changed_services(None, before) == sorted(before)
+
+        # Unrelated keys do not change any fingerprint.
+        store.set("HOOKS_LOG_LEVEL", "info")
+        assert refresh.changed_services(before, refresh.fingerprints(snap, store)) == []
+
+        # Options that a refresh adds are unset and do not change any fingerprint.
+        env_keys = refresh._env_keys
+        mocker.patch(
+            "slurmhelpers.refresh._env_keys",
+            side_effect=lambda snap, service: [*env_keys(snap, service), "MUNGED_NEW_OPTION"],
+        )
+        assert refresh.changed_services(before, refresh.fingerprints(snap, store)) == []
+
+        store.set("MUNGED_MAX_THREAD_COUNT", "4")
+        binary.write_text("24.05.1")
+        assert refresh.changed_services(before, refresh.fingerprints(snap, store)) == [
+            "munged",
+            "slurmrestd",
+        ]
+
+    def test_fingerprints_wrapper_keys(self, snap, store) -> None:
+        """Test that fingerprints change with the derived keys that wrappers read."""
+        wrapper = Path("/snap/slurm/1/sbin/prometheus-slurm-exporter.wrapper")
+        wrapper.parent.mkdir(parents=True)
+        wrapper.write_text('exec "${SNAP}"/bin/exporter $PROMETHEUS_SLURM_EXPORTER_ARGS\n')
+        store.set("PROMETHEUS_SLURM_EXPORTER_ARGS", "-slurm.poll-limit=10")
+        before = refresh.fingerprints(snap, store)
+
+        store.set("PROMETHEUS_SLURM_EXPORTER_ARGS", "-slurm.poll-limit=30")
+        assert refresh.changed_services(before, refresh.fingerprints(snap, store)) == [
+            "prometheus-slurm-exporter"
+        ]
@@ -15,55 +15,222 @@
 
 """Test models that wrap the configuration for the bundled daemons."""
 
-import subprocess
+from pathlib import Path
 
 import pytest
 
+from slurmhelpers import probe, slurmconf
+from slurmhelpers.models import Slurmd
+
+mock_logrotate_config = """
+$SNAP_COMMON/var/log/slurm/*.log {
+    rotate 4
+    size=$MAX_SIZE
+    create 640 slurm root
+    missingok
+    nocopytruncate
+    nomail
+    notifempty
+    noolddir
+    sharedscripts
+    $COMPRESSION
+    postrotate
+        $SNAP/usr/bin/pkill -x --signal SIGUSR2 slurmctld
+        $SNAP/usr/bin/pkill -x --signal SIGUSR2 slurmd
+        $SNAP/usr/bin/pkill -x --signal SIGUSR2 slurmdbd
+        exit 0
+    endscript
+}
+""".strip()
+target_logrotate_config = """
+/var/snap/slurm/common/var/log/slurm/*.log {{
+    rotate 4
+    size=5M
+    create 640 slurm root
+    missingok
+    nocopytruncate
+    nomail
+    notifempty
+    noolddir
+    sharedscripts
+    {compression}
+    postrotate
+        /snap/slurm/1/usr/bin/pkill -x --signal SIGUSR2 slurmctld
+        /snap/slurm/1/usr/bin/pkill -x --signal SIGUSR2 slurmd
+        /snap/slurm/1/usr/bin/pkill -x --signal SIGUSR2 slurmdbd
+        exit 0
+    endscript
+}}
+""".strip()
+
 
 class TestBaseModel:
     """Test the `_BaseModel` parent class for data models."""
 
     def test_needs_restart(self, base_model) -> None:
         """The `_needs_restart` method."""
-        # Test when service is inactive.
         base_model._needs_restart(["test"])
+        assert base_model._restarts.requested == {"test"}
+
+
+class TestLogrotateModel:
+    """Test the `Logrotate` data model."""
+
+    @pytest.fixture(autouse=True)
+    def template(self, fake_fs) -> None:
+        """Create the `logrotate` configuration template."""
+        fake_fs.create_file(
+            "/snap/slurm/1/templates/logrotate.conf.tmpl", contents=mock_logrotate_config
+        )
+        fake_fs.create_dir("/var/snap/slurm/common/etc/logrotate")
+
+    def test_write_config(self, logrotate) -> None:
+        """Test rendering the `logrotate` configuration with the default settings."""
+        logrotate.write_config()
+        assert Path(
+            "/var/snap/slurm/common/etc/logrotate/logrotate.conf"
+        ).read_text() == target_logrotate_config.format(
+            compression=(
+                "compress\n"
+                "    delaycompress\n"
+                "    compresscmd /snap/slurm/1/usr/bin/lbzip2\n"
+                "    compressoptions -9 -n 1\n"
+                "    compressext .bz2"
+            )
+        )
+
+    def test_update_config(self, logrotate) -> None:
+        """Test `update_config` method."""
+        config = Path("/var/snap/slurm/common/etc/logrotate/logrotate.conf")
+
+        # Select a multithreaded compression engine.
+        logrotate.update_config({"compression": "zstd", "compression-threads": 4})
+        assert "compresscmd /snap/slurm/1/usr/bin/zstd" in config.read_text()
+        assert "compressoptions -3 -T4" in config.read_text()
+        assert "compressext .zst" in config.read_text()
+
+        # Disable compression.
+        logrotate.update_config({"compression": "none"})
+        assert "    nocompress\n" in config.read_text()
+
+        # Bad option values are rejected.
+        with pytest.raises(ValueError):
+            logrotate.update_config({"compression": "lzma"})
+        with pytest.raises(ValueError):
+            logrotate.update_config({"compression": "gzip", "compression-level": 12})
+        with pytest.raises(ValueError):
+            logrotate.update_config({"compression-threads": 0})
+        with pytest.raises(AttributeError):
+            logrotate.update_config({"awgeez": "rick"})
+
+    def test_size_trigger(self, snapctl, logrotate) -> None:
+        """Test rotating logs by size with the `logrotate-watch` service."""
+        config = Path("/var/snap/slurm/common/etc/logrotate/logrotate.conf")
+
+        logrotate.update_config({"trigger": "size", "max-size": "100M", "check-interval": 10})
+        assert "size=100M" in config.read_text()
+        assert logrotate.check_interval == 10
+
+        # The watcher is only started once the configuration is applied, and not restarted.
+        assert not snapctl.active.get("logrotate-watch")
+        logrotate._restarts.apply()
+        assert [c for c in snapctl.calls if c[0] in ("start", "stop", "restart")] == [
+            ("start", "logrotate-watch")
+        ]
+        assert snapctl.active["logrotate-watch"]
+        assert snapctl.enabled["logrotate-watch"]
+
+        # Switching back to daily rotation stops the watcher.
+        logrotate.update_config({"trigger": "daily"})
+        logrotate._restarts.apply()
+        assert not snapctl.active["logrotate-watch"]
+        assert not snapctl.enabled["logrotate-watch"]
+
+        # Bad option values are rejected.
+        with pytest.raises(ValueError):
+            logrotate.update_config({"trigger": "hourly"})
+        with pytest.raises(ValueError):
+            logrotate.update_config({"max-size": "5 megabytes"})
+        with pytest.raises(ValueError):
+            logrotate.update_config({"check-interval": 0})
 
 
 class TestMungedModel:
     """Test the `Munged` data model."""
 
-    def test_max_thread_count(self, mocker, munged) -> None:
+    def test_max_thread_count(self, munged) -> None:
         """Test `max_thread_count` attribute."""
         # MUNGED_MAX_THREAD_COUNT does not exist in .env file.
-        mocker.patch("dotenv.get_key", return_value=None)
         assert munged.max_thread_count is None
 
+        # Set new MUNGED_MAX_THREAD_COUNT value.
+        munged.max_thread_count = 8
+        assert munged.max_thread_count == 8
+        assert munged._store.dirty == {"MUNGED_MAX_THREAD_COUNT"}
+
         # MUNGED_MAX_THREAD_COUNT exists in .env file.
-        mocker.patch("dotenv.get_key", return_value=16)
-        assert munged.max_thread_count == 16
+        munged._store.commit()
+        assert "MUNGED_MAX_THREAD_COUNT='8'" in munged._store.file.read_text()
 
         # New MUNGED_MAX_THREAD_COUNT is equivalent to old value.
-        mocker.patch("dotenv.get_key", return_value=16)
-        munged.max_thread_count = 16
-
-        # Set new MUNGED_MAX_THREAD_COUNT value.
-        mocker.patch("dotenv.set_key")
-        mocker.patch("dotenv.get_key", return_value=16)
         munged.max_thread_count = 8
-
-    def test_generate_key(self, mocker, munged) -> None:
+        assert munged._store.dirty == set()
+
+    def test_max_thread_count_auto(self, mocker, munged) -> None:
+        """Test automatically sizing `max_thread_count` for the host."""
+        # Small hosts still get the munge default of 2 threads.
+        mocker.patch("slurmhelpers.host.cpu_count", return_value=1)
+        munged.max_thread_count = "auto"
+        assert munged.max_thread_count == 2
+        assert munged.max_thread_count_auto
+
+        # Thread count is re-evaluated when `munged` is reconfigured.
+        mocker.patch("slurmhelpers.host.cpu_count", return_value=128)
+        munged.update_config({})
+        assert munged.max_thread_count == 32
+
+        # Setting an explicit thread count disables automatic sizing.
+        munged.max_thread_count = 4
+        assert not munged.max_thread_count_auto
+        munged.update_config({})
+        assert munged.max_thread_count == 4
+
+    def test_generate_key(self, fake_fs, munged) -> None:
         """Test `generate_key` method."""
-        # Generate key when `munge.key` file does not yet exist.
-        mocker.patch("subprocess.check_output")
+        fake_fs.create_dir("/var/snap/slurm/common/etc/munge")
         munged.generate_key()
+        assert len(munged.key_file.read_bytes()) == 128
+        assert munged.key_file.stat().st_mode & 0o777 == 0o600
+        assert munged._restarts.requested == {"munged"}
 
-        # Fail to generate new `munge.key`.
-        mocker.patch(
-            "subprocess.check_output",
-            side_effect=subprocess.CalledProcessError(0, ["mungectl", "key", "generate"]),
-        )
-        with pytest.raises(subprocess.CalledProcessError):
-            munged.generate_key()
+        # Keys are random.
+        key = munged.key_file.read_bytes()
+        munged.generate_key()
+        assert munged.key_file.read_bytes() != key
+
+    def test_rotate_key(self, fake_fs, munged) -> None:
+        """Test staging a munge key and swapping it in."""
+        fake_fs.create_dir("/var/snap/slurm/common/etc/munge")
+
+        # Nothing to swap in.
+        with pytest.raises(FileNotFoundError):
+            munged.rotate_key()
+
+        munged.generate_key()
+        munged._restarts.apply()
+        munged.stage_key(b"k" * 64)
+        assert munged.key_file.read_bytes() != b"k" * 64
+        assert munged._restarts.requested == set()
+
+        munged.rotate_key()
+        assert munged.key_file.read_bytes() == b"k" * 64
+        assert munged.key_file.stat().st_mode & 0o777 == 0o600
+        assert not munged.staged_key_file.exists()
+        assert munged._restarts.requested == {"munged"}
+
+        # Keys too small for `munged` are rejected.
+        with pytest.raises(ValueError):
+            munged.stage_key(b"short")
 
     def test_update_config(self, mocker, munged) -> None:
         """Test `update_config` method."""
@@ -76,22 +243,118 @@ class TestMungedModel:
         mocker.patch("slurmhelpers.models.Munged.max_thread_count")
         munged.update_config({"max-thread-count": 24})
 
+    def test_placement(self, mocker, munged) -> None:
+        """Test validating cpu affinity, nice, and ionice against the host."""
+        mocker.patch("slurmhelpers.host.online_cpus", return_value=set(range(8)))
+        munged.update_config({"cpu-affinity": "0-1", "nice": -5, "ionice": "best-effort:2"})
+        assert munged.cpu_affinity == "0-1"
+        assert munged.nice == -5
+        assert munged._store.dirty == {"MUNGED_CPU_AFFINITY", "MUNGED_NICE", "MUNGED_IONICE"}
+        assert munged._restarts.requested == {"munged"}
+
+        # CPUs that are not online and bad priorities are rejected.
+        with pytest.raises(ValueError, match="cpus 8,9 are not online"):
+            munged.update_config({"cpu-affinity": "6-9"})
+        with pytest.raises(ValueError):
+            munged.update_config({"nice": 20})
+        with pytest.raises(ValueError):
+            munged.update_config({"ionice": "best-effort:8"})
+        with pytest.raises(ValueError):
+            munged.update_config({"ionice": "idle:1"})
+
+
+class TestPrometheusSlurmExporterModel:
+    """Test the `PrometheusSlurmExporter` data model."""
+
+    def test_update_config(self, exporter) -> None:
+        """Test rendering the exporter's arguments from its options."""
+        exporter.render_args()
+        assert exporter.args == "-web.listen-address=:9092 -slurm.poll-limit=10"
+
+        exporter.update_config(
+            {
+                "listen-address": "127.0.0.1:9100",
+                "poll-interval": "30",
+                "collectors": "limits,diags",
+            }
+        )
+        assert exporter.args == (
+            "-web.listen-address=127.0.0.1:9100 -slurm.poll-limit=30 "
+            "-slurm.collect-diags -slurm.collect-limits"
+        )
+        assert exporter.collectors == ["limits", "diags"]
+        assert exporter._restarts.requested == {"prometheus-slurm-exporter"}
+
+        # Bad option values are rejected.
+        with pytest.raises(ValueError):
+            exporter.update_config({"listen-address": "9100"})
+        with pytest.raises(ValueError):
+            exporter.update_config({"poll-interval": 0})
+        with pytest.raises(ValueError):
+            exporter.update_config({"collectors": "jobs"})
+        with pytest.raises(AttributeError):
+            exporter.update_config({"awgeez": "rick"})
+
+
+class TestSlurmctldModel:
+    """Test the `Slurmctld` data model."""
+
+    def test_update_config(self, slurmctld) -> None:
+        """Test rendering the managed `slurm.conf` include for each profile."""
+        slurmctld.write_profile()
+        assert "Profile: default" in slurmctld.profile_file.read_text()
+        assert slurmctld._restarts.requested == {"slurmctld"}
+
+        slurmctld._restarts.apply()
+        slurmctld.update_config({"profile": "htc"})
+        profile = slurmctld.profile_file.read_text()
+        assert "SchedulerParameters=defer,batch_sched_delay=20," in profile
+        assert "MessageTimeout=30\n" in profile
+        assert slurmctld._restarts.requested == {"slurmctld"}
+
+        # Rendering the same profile again neither writes the include nor restarts `slurmctld`.
+        slurmctld._restarts.apply()
+        mtime = slurmctld.profile_file.stat().st_mtime_ns
+        slurmctld.write_profile()
+        assert slurmctld.profile_file.stat().st_mtime_ns == mtime
+        assert slurmctld._restarts.requested == set()
+
+        # Bad profiles are rejected.
+        with pytest.raises(ValueError):
+            slurmctld.update_config({"profile": "turbo"})
+        with pytest.raises(AttributeError):
+            slurmctld.update_config({"awgeez": "rick"})
+
 
 class TestSlurmdModel:
     """Test the `Slurmd` data model."""
 
-    def test_config_server(self, mocker, slurmd) -> None:
+    def test_config_server(self, snap, slurmd) -> None:
         """Test `config_server` property."""
         # SLURMD_CONFIG_SERVER does not exist in .env file.
         assert slurmd.config_server is None
 
         # SLURMD_CONFIG_SERVER exists in .env file.
-        mocker.patch("dotenv.get_key", return_value="localhost:6820")
+        slurmd._store.file.write_text("SLURMD_CONFIG_SERVER='localhost:6820'\n")
+        slurmd = Slurmd(snap)
         assert slurmd.config_server == "localhost:6820"
 
         # New SLURMD_CONFIG_SERVER is equivalent to old value.
-        mocker.patch("dotenv.get_key", return_value="localhost:6820")
         slurmd.config_server = "localhost:6820"
+        assert slurmd._store.dirty == set()
+
+    def test_config_server_controllers(self, slurmd, fake_fs, caplog) -> None:
+        """Test warning about controllers that the local `slurm.conf` does not define."""
+        slurmconf._cache.clear()
+        fake_fs.create_file(
+            "/var/snap/slurm/common/etc/slurm/slurm.conf", contents="SlurmctldHost=ctld-0\n"
+        )
+        slurmd.config_server = "ctld-0:6817"
+        assert "is not a SlurmctldHost" not in caplog.text
+
+        slurmd.config_server = "ctld-0,ctld-9"
+        assert "controller ctld-9 is not a SlurmctldHost" in caplog.text
+        assert slurmd.config_server == "ctld-0,ctld-9"
 
     def test_update_config(self, mocker, slurmd) -> None:
         """Test `update_config` method."""
@@ -104,47 +367,183 @@ class TestSlurmdModel:
         mocker.patch("slurmhelpers.models.Slurmd.config_server")
         slurmd.update_config({"config-server": "localhost:6820"})
 
+    def test_config_server_order(self, mocker, slurmd) -> None:
+        """Test ordering the configuration server list by latency."""
+        results = [
+            probe.ProbeResult("ctld-0", None, "timed out"),
+            probe.ProbeResult("ctld-1:6820", 2.5),
+            probe.ProbeResult("ctld-2", 0.5),
+        ]
+        probe_ = mocker.patch("slurmhelpers.probe.probe", return_value=results)
+
+        # Controllers are used as given by default.
+        slurmd.config_server = "ctld-0,ctld-1:6820,ctld-2"
+        assert slurmd.config_server == "ctld-0,ctld-1:6820,ctld-2"
+        probe_.assert_not_called()
+
+        # Controllers are ranked by reachability and latency.
+        slurmd.update_config(
+            {"config-server": "ctld-0,ctld-1:6820,ctld-2", "config-server-order": "latency"}
+        )
+        probe_.assert_called_once_with(["ctld-0", "ctld-1:6820", "ctld-2"])
+        assert slurmd.config_server == "ctld-2,ctld-1:6820,ctld-0"
+        assert slurmd._restarts.requested == {"slurmd"}
+
+        # The same controllers are not probed again.
+        slurmd._store.commit()
+        slurmd.update_config(
+            {"config-server": "ctld-0,ctld-1:6820,ctld-2", "config-server-order": "latency"}
+        )
+        probe_.assert_called_once()
+        assert slurmd._store.dirty == set()
+
+        # Switching back uses the list as given.
+        slurmd.update_config(
+            {"config-server": "ctld-0,ctld-1:6820,ctld-2", "config-server-order": "given"}
+        )
+        assert slurmd.config_server == "ctld-0,ctld-1:6820,ctld-2"
+
+        with pytest.raises(ValueError):
+            slurmd.config_server_order = "alphabetical"
+
+
+class TestSlurmdbdModel:
+    """Test the `Slurmdbd` data model."""
+
+    def test_update_config(self, slurmdbd) -> None:
+        """Test rendering the managed `slurmdbd.conf` include from the retention policy."""
+        slurmdbd.write_tuning()
+        # Slurm's defaults apply to unset options.
+        assert slurmdbd.tuning_file.read_text().splitlines()[2:] == []
+        slurmdbd._restarts.apply()
+
+        slurmdbd.update_config(
+            {
+                "purge-after": "step=3months,job=12months",
+                "archive": "job",
+                "commit-delay": 5,
+                "max-query-days": 31,
+                "tcp-timeout": 10,
+            }
+        )
+        assert slurmdbd.purge_after == {"step": "3months", "job": "12months"}
+        assert slurmdbd.tuning_file.read_text().splitlines()[2:] == [
+            "CommitDelay=5",
+            "MaxQueryTimeRange=31-00:00:00",
+            "TCPTimeout=10",
+            "PurgeJobAfter=12months",
+            "PurgeStepAfter=3months",
+            "ArchiveDir=/var/snap/slurm/common/var/lib/slurm/slurmdbd/archive",
+            "ArchiveJobs=yes",
+        ]
+        assert slurmdbd._restarts.requested == {"slurmdbd"}
+
+        # Rendering the same settings again does not restart `slurmdbd`.
+        slurmdbd._restarts.apply()
+        slurmdbd.write_tuning()
+        assert slurmdbd._restarts.requested == set()
+
+        # Bad option values are rejected.
+        with pytest.raises(ValueError):
+            slurmdbd.update_config({"purge-after": "job=1year"})
+        with pytest.raises(ValueError):
+            slurmdbd.update_config({"purge-after": "jobs=12months"})
+        with pytest.raises(ValueError):
+            slurmdbd.update_config({"archive": "job,jobs"})
+        with pytest.raises(ValueError):
+            slurmdbd.update_config({"commit-delay": -1})
+        with pytest.raises(ValueError):
+            slurmdbd.update_config({"tcp-timeout": 0})
+        with pytest.raises(AttributeError):
+            slurmdbd.update_config({"awgeez": "rick"})
+
 
 class TestSlurmrestdModel:
     """Test the `Slurmrestd` data model."""
 
-    def test_max_connections(self, mocker, slurmrestd) -> None:
+    def test_max_connections(self, slurmrestd) -> None:
         """Test `max_connections` property."""
         # SLURMRESTD_MAX_CONNECTIONS does not exist in .env file.
-        mocker.patch("dotenv.get_key", return_value=None)
         assert slurmrestd.max_connections is None
 
-        # SLURMRESTD_MAX_CONNECTIONS exists in .env file.
-        mocker.patch("dotenv.get_key", return_value=16)
+        # Set new SLURMRESTD_MAX_CONNECTIONS value.
+        slurmrestd.max_connections = 16
         assert slurmrestd.max_connections == 16
+        assert slurmrestd._store.dirty == {"SLURMRESTD_MAX_CONNECTIONS"}
 
         # New SLURMRESTD_MAX_CONNECTIONS is equivalent to old value.
-        mocker.patch("dotenv.get_key", return_value=16)
+        slurmrestd._store.commit()
         slurmrestd.max_connections = 16
+        assert slurmrestd._store.dirty == set()
 
-        # Set new SLURMRESTD_MAX_CONNECTIONS value.
-        mocker.patch("dotenv.set_key")
-        mocker.patch("dotenv.get_key", return_value=16)
-        slurmrestd.max_connections = 8
-
-    def test_max_thread_count(self, mocker, slurmrestd) -> None:
+    def test_max_thread_count(self, slurmrestd) -> None:
         """Test `max_thread_count` property."""
         # SLURMRESTD_MAX_THREAD_COUNT does not exist in .env file.
-        mocker.patch("dotenv.get_key", return_value=None)
         assert slurmrestd.max_thread_count is None
 
-        # SLURMRESTD_MAX_THREAD_COUNT exists in .env file.
-        mocker.patch("dotenv.get_key", return_value=16)
+        # Set new SLURMRESTD_MAX_THREAD_COUNT value.
+        slurmrestd.max_thread_count = 16
         assert slurmrestd.max_thread_count == 16
+        assert slurmrestd._store.dirty == {"SLURMRESTD_MAX_THREAD_COUNT"}
 
         # New SLURMRESTD_MAX_THREAD_COUNT is equivalent to old value.
-        mocker.patch("dotenv.get_key", return_value=16)
+        slurmrestd._store.commit()
         slurmrestd.max_thread_count = 16
+        assert slurmrestd._store.dirty == set()
+
+    def test_profile(self, mocker, slurmrestd) -> None:
+        """Test automatically sizing `slurmrestd` with a tuning profile."""
+        mocker.patch("slurmhelpers.host.cpu_count", return_value=32)
+        mocker.patch("slurmhelpers.host.memory_total", return_value=64 * 2**30)
+        mocker.patch("slurmhelpers.host.nofile_limit", return_value=4096)
+        assert slurmrestd.profile == "balanced"
+
+        slurmrestd.profile = "balanced"
+        assert slurmrestd.max_thread_count == 64
+        assert slurmrestd.max_connections == 384
+
+        # Connections are bounded by the file descriptor limit.
+        slurmrestd.update_config({"profile": "high-throughput"})
+        assert slurmrestd.max_thread_count == 128
+        assert slurmrestd.max_connections == 2016
+
+        # Threads are bounded by available memory.
+        mocker.patch("slurmhelpers.host.memory_total", return_value=2**30)
+        slurmrestd.update_config({})
+        assert slurmrestd.max_thread_count == 16
 
-        # Set new SLURMRESTD_MAX_THREAD_COUNT value.
-        mocker.patch("dotenv.set_key")
-        mocker.patch("dotenv.get_key", return_value=16)
-        slurmrestd.max_thread_count = 8
+        # Explicit values disable automatic sizing.
+        slurmrestd.update_config({"max-thread-count": 4})
+        assert not slurmrestd.max_thread_count_auto
+        assert slurmrestd.max_connections_auto
+        assert slurmrestd.max_connections == 64
+
+        # Changing the profile keeps explicit values.
+        slurmrestd.update_config({"profile": "small"})
+        assert slurmrestd.max_thread_count == 4
+        assert not slurmrestd.max_thread_count_auto
+        assert slurmrestd.max_connections == 16
+
+        # Unknown profiles are rejected.
+        with pytest.raises(ValueError):
+            slurmrestd.profile = "ludicrous"
+
+    def test_workers(self, slurmrestd) -> None:
+        """Test splitting the thread count and maximum connections between workers."""
+        slurmrestd.update_config({"max-thread-count": 16, "max-connections": 40})
+        assert slurmrestd.worker_budget == (16, 40)
+
+        slurmrestd.update_config({"listen": ":6820,unix:/run/rest.sock", "workers": 3})
+        assert slurmrestd.listen == [":6820", "unix:/run/rest.sock"]
+        assert slurmrestd.worker_budget == (6, 14)
+
+        # Workers of adjacent ports would listen on the same port.
+        with pytest.raises(ValueError):
+            slurmrestd.update_config({"listen": ":6820,:6821"})
+        with pytest.raises(ValueError):
+            slurmrestd.update_config({"listen": "unix:rest.sock"})
+        with pytest.raises(ValueError):
+            slurmrestd.update_config({"workers": 0})
 
     def test_update_config(self, mocker, slurmrestd) -> None:
         """Test `update_config` method."""
@@ -160,3 +559,21 @@ class TestSlurmrestdModel:
         mocker.patch("slurmhelpers.models.Slurmrestd.max_connections")
         mocker.patch("slurmhelpers.models.Slurmrestd.max_thread_count")
         slurmrestd.update_config({"max-connections": 24, "max-thread-count": 24})
+
+
+class TestSlurmrestdProxyModel:
+    """Test the `SlurmrestdProxy` data model."""
+
+    def test_update_config(self, slurmrestd_proxy) -> None:
+        """Test rendering the proxy's arguments from its options."""
+        slurmrestd_proxy.update_config({"ttl": "nodes=60,jobs=2", "max-entries": 64})
+        assert slurmrestd_proxy.ttl == {"nodes": 60, "jobs": 2}
+        assert slurmrestd_proxy.args == (
+            "--listen-address=:6830 --ttl=jobs=2,nodes=60 --max-entries=64"
+        )
+        assert slurmrestd_proxy._restarts.requested == {"slurmrestd-proxy"}
+
+        with pytest.raises(ValueError):
+            slurmrestd_proxy.update_config({"ttl": "jobs=-1"})
+        with pytest.raises(AttributeError):
+            slurmrestd_proxy.update_config({"awgeez": "rick"})
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+# Copyright 2025 Canonical Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test the registry of snap configuration options."""
+
+from pathlib import Path
+
+import pytest
+
+from slurmhelpers.config import ConfigStore
+from slurmhelpers.models import Munged
+from slurmhelpers.options import REGISTRY, diff, validate
+
+
+@pytest.fixture
+def store(fake_fs) -> ConfigStore:
+    """Create a configuration store backed by a fake `.env` file."""
+    yield ConfigStore(Path("/var/snap/slurm/common/.env"))
+
+
+class TestOptions:
+    """Test validating and diffing snap configuration payloads."""
+
+    def test_coerce(self) -> None:
+        """Test converting values retrieved from `snapctl` to the option's type."""
+        option = REGISTRY["munged"]["max-thread-count"]
+        assert option.coerce("20") == 20
+        assert option.coerce(20) == 20
+        assert option.coerce("auto") == "auto"
+        for bad in ("lots", 0, True, None):
+            with pytest.raises(ValueError):
+                option.coerce(bad)
+
+        assert REGISTRY["logrotate"]["max-size"].coerce("100M") == "100M"
+        with pytest.raises(ValueError):
+            REGISTRY["logrotate"]["max-size"].coerce("100 megs")
+
+    def test_validate(self) -> None:
+        """Test validating a whole payload."""
+        assert validate({"munged": {"max-thread-count": "20"}, "slurm": {"anything": "goes"}}) == {
+            "munged": {"max-thread-count": 20},
+            "slurm": {"anything": "goes"},
+        }
+
+        # All invalid values are reported at once.
+        with pytest.raises(ValueError, match="max-thread-count.*profile"):
+            validate({"slurmrestd": {"max-thread-count": -1, "profile": "ludicrous"}})
+
+        with pytest.raises(AttributeError):
+            validate({"slurmd": {"awgeez": "rick"}})
+
+    def test_diff(self, snap, store) -> None:
+        """Test that only options that differ from the current configuration are changed."""
+        munged = Munged(snap, store)
+        munged.max_thread_count = 20
+        store.commit()
+
+        # Unchanged values, including defaults and values given as strings, are not changes.
+        assert (
+            diff(
+                store,
+                validate(
+                    {"munged": {"max-thread-count": "20"}, "logrotate": {"trigger": "daily"}}
+                ),
+            )
+            == {}
+        )
+        assert diff(store, validate({"munged": {"max-thread-count": "auto"}})) == {
+            "munged": {"max-thread-count": "auto"}
+        }
+
+        # An unchanged value does not request a restart.
+        munged = Munged(snap, store)
+        munged.update_config({"max-thread-count": "20"})
+        assert munged._restarts.requested == set()
+        assert store.dirty == set()
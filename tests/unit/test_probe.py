@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+# Copyright 2025 Canonical Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test probing the reachability and latency of Slurm controllers."""
+
+import socket
+
+import pytest
+
+from slurmhelpers import probe
+
+
+@pytest.fixture
+def controller():
+    """Local TCP listener that stands in for a Slurm controller."""
+    with socket.create_server(("127.0.0.1", 0)) as server:
+        yield f"127.0.0.1:{server.getsockname()[1]}"
+
+
+@pytest.fixture
+def dead_controller():
+    """Address of a Slurm controller that refuses connections."""
+    with socket.create_server(("127.0.0.1", 0)) as server:
+        port = server.getsockname()[1]
+    yield f"127.0.0.1:{port}"
+
+
+class TestProbe:
+    """Test probing Slurm controllers."""
+
+    def test_parse_server(self) -> None:
+        """Test parsing controller addresses."""
+        assert probe.parse_server("ctld-0") == ("ctld-0", 6817)
+        assert probe.parse_server(" ctld-0:6820 ") == ("ctld-0", 6820)
+        assert probe.parse_server("[fd00::1]:6820") == ("fd00::1", 6820)
+        assert probe.parse_server("[fd00::1]") == ("fd00::1", 6817)
+        assert probe.parse_server("fd00::1") == ("fd00::1", 6817)
+        with pytest.raises(ValueError):
+            probe.parse_server("ctld-0:slurm")
+        with pytest.raises(ValueError):
+            probe.parse_server("ctld-0:70000")
+
+    def test_probe(self, controller, dead_controller) -> None:
+        """Test probing and ranking reachable and unreachable controllers."""
+        results = probe.probe([dead_controller, controller], timeout=0.5)
+        assert [r.server for r in results] == [dead_controller, controller]
+        assert not results[0].reachable
+        assert results[0].error
+        assert results[1].reachable
+        assert results[1].rtt_ms >= 0
+
+        assert probe.rank(results) == [controller, dead_controller]
+        assert probe.rank(
+            [
+                probe.ProbeResult("c", 3.0),
+                probe.ProbeResult("a", None, "timed out"),
+                probe.ProbeResult("b", 1.0),
+            ]
+        ) == ["b", "c", "a"]
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+# Copyright 2025 Canonical Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test the per-phase instrumentation of the snap hooks."""
+
+import json
+import os
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from slurmhelpers import profiling
+from slurmhelpers.profiling import HookProfiler
+
+COMMON = "/var/snap/slurm/common"
+
+
+class TestHookProfiler:
+    """Test the `HookProfiler` class."""
+
+    def test_phases(self, tmp_path) -> None:
+        """Test that phases record wall time, subprocesses, and file operations."""
+        # Use the real filesystem since `pyfakefs` does not raise audit events.
+        with HookProfiler("configure", tmp_path) as profiler:
+            with profiling.phase("files"):
+                (tmp_path / "a").write_text("a")
+                os.mkdir(tmp_path / "b")
+            with profiler.phase("subprocess"):
+                subprocess.run(["true"])
+
+        # Phases outside of a profiled hook are not recorded.
+        with profiling.phase("ignored"):
+            pass
+
+        records = [
+            json.loads(line) for line in Path(profiler.metrics_file).read_text().splitlines()
+        ]
+        assert [r["phase"] for r in records] == ["files", "subprocess", "total"]
+        assert all(r["hook"] == "configure" and r["status"] == "ok" for r in records)
+        assert records[0]["file_ops"] == 2
+        assert records[1]["subprocesses"] == 1
+        assert records[2]["wall_ms"] >= records[0]["wall_ms"] + records[1]["wall_ms"]
+
+    def test_phase_error(self, fake_fs) -> None:
+        """Test that failed phases are recorded before the error is raised."""
+        with pytest.raises(RuntimeError):
+            with HookProfiler("install", COMMON) as profiler:
+                with profiler.phase("generate_key"):
+                    raise RuntimeError("mungectl failed")
+
+        assert [r["status"] for r in profiler.records] == ["error", "error"]
+
+    def test_cprofile(self, fake_fs) -> None:
+        """Test that a single hook run is profiled when the trigger file exists."""
+        fake_fs.create_file(f"{COMMON}/hooks.profile")
+        with HookProfiler("configure", COMMON):
+            pass
+
+        assert not Path(COMMON, "hooks.profile").exists()
+        assert len(list(Path(COMMON).glob("hooks-configure-*.prof"))) == 1
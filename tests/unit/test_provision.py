@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+# Copyright 2025 Canonical Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test the manifest-driven directory provisioner."""
+
+import os
+from pathlib import Path
+
+import pytest
+
+from slurmhelpers.provision import MANIFEST, Directory, provision
+
+COMMON = Path("/var/snap/slurm/common")
+
+
+class TestProvision:
+    """Test provisioning the directories under $SNAP_COMMON."""
+
+    def test_provision(self, fake_fs) -> None:
+        """Test that provisioning is idempotent and only fixes what is wrong."""
+        fake_fs.create_file("/proc/self/status", contents="Name:\tpython3\nUmask:\t0022\n")
+        ops = provision(COMMON)
+        assert {str(op.path) for op in ops if op.action == "mkdir"} == {
+            str(COMMON / d.path) for d in MANIFEST
+        }
+        assert (COMMON / "etc" / "munge").stat().st_mode & 0o777 == 0o700
+        assert (COMMON / "var" / "lib" / "munge").stat().st_mode & 0o777 == 0o711
+
+        # Nothing to do when directories already match the manifest.
+        assert provision(COMMON) == []
+
+        # Only drifted or missing directories are repaired.
+        (COMMON / "etc" / "munge").chmod(0o755)
+        (COMMON / "run" / "slurm").rmdir()
+        ops = provision(COMMON)
+        assert [(op.action, str(op.path)) for op in ops] == [
+            ("chmod", str(COMMON / "etc" / "munge")),
+            ("mkdir", str(COMMON / "run" / "slurm")),
+        ]
+        assert (COMMON / "etc" / "munge").stat().st_mode & 0o777 == 0o700
+
+    def test_provision_umask(self, mocker, fake_fs) -> None:
+        """Test that the umask is never changed, and new directories are fixed if it is unknown."""
+        umask = mocker.spy(os, "umask")
+        ops = provision(COMMON, [Directory("run")])
+        assert [op.action for op in ops] == ["mkdir", "chmod"]
+        umask.assert_not_called()
+
+    def test_provision_not_a_directory(self, fake_fs) -> None:
+        """Test that files in place of a directory are not clobbered."""
+        fake_fs.create_file(COMMON / "etc")
+        with pytest.raises(NotADirectoryError):
+            provision(COMMON)
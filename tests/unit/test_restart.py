@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+# Copyright 2025 Canonical Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test the restart planner for the snap's services."""
+
+import pytest
+
+from slurmhelpers.restart import RestartPlanner
+
+
+@pytest.fixture
+def planner(snap, snapctl):
+    """Create a `RestartPlanner` with a mix of active and inactive services."""
+    snapctl.active.update({"munged": True, "slurmctld": False, "slurmd": True, "slurmrestd": True})
+    yield RestartPlanner(snap)
+
+
+class TestRestartPlanner:
+    """Test the `RestartPlanner` class."""
+
+    def test_plan(self, snapctl, planner) -> None:
+        """Test that restarts are ordered by dependency and skip inactive services."""
+        planner.request("slurmrestd", "slurmctld")
+        planner.request("munged", "slurmd", "slurmrestd")
+        assert planner.plan() == [["munged"], ["slurmd", "slurmrestd"]]
+
+        # Service state is only queried once per planner.
+        planner.plan()
+        assert snapctl.calls == [("services",)]
+
+    def test_plan_proxy(self, snapctl, planner) -> None:
+        """Test that `slurmrestd-proxy` is restarted after its upstream `slurmrestd`."""
+        snapctl.active["slurmrestd-proxy"] = True
+        planner.request("munged", "slurmrestd", "slurmrestd-proxy")
+        assert planner.plan() == [["munged"], ["slurmrestd"], ["slurmrestd-proxy"]]
+
+    def test_apply(self, snapctl, planner) -> None:
+        """Test that each stage is restarted with a single `snapctl` call."""
+        planner.request("munged", "slurmd", "slurmrestd", "slurmctld")
+        planner.apply()
+        assert [c for c in snapctl.calls if c[0] == "restart"] == [
+            ("restart", "munged"),
+            ("restart", "slurmd", "slurmrestd"),
+        ]
+        assert planner.requested == set()
+
+    def test_apply_start_stop(self, snapctl, planner) -> None:
+        """Test that started and stopped services are not also restarted."""
+        snapctl.active["prometheus-slurm-exporter"] = True
+        planner.request("munged", "logrotate-watch", "prometheus-slurm-exporter")
+        planner.start("logrotate-watch")
+        planner.stop("prometheus-slurm-exporter")
+        planner.apply()
+        assert [c for c in snapctl.calls if c[0] != "services"] == [
+            ("stop", "prometheus-slurm-exporter"),
+            ("restart", "munged"),
+            ("start", "logrotate-watch"),
+        ]
+        assert snapctl.enabled["logrotate-watch"]
+        assert not snapctl.enabled["prometheus-slurm-exporter"]
+
+    def test_apply_nothing_requested(self, snapctl, planner) -> None:
+        """Test that service state is not queried if no restarts are requested."""
+        planner.apply()
+        assert snapctl.calls == []
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+# Copyright 2025 Canonical Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test the `slurmrestd` worker supervisor."""
+
+import sys
+
+import pytest
+
+from slurmhelpers import restd
+
+
+class TestListeners:
+    """Test deriving the listeners of `slurmrestd` workers."""
+
+    def test_parse_listeners(self, mocker) -> None:
+        """Test parsing listeners and falling back to the short hostname."""
+        mocker.patch("socket.gethostname", return_value="api-0.example.com")
+        assert restd.parse_listeners("") == ["api-0:6820"]
+        assert restd.parse_listeners(":6820, unix:/run/rest.sock") == [
+            ":6820",
+            "unix:/run/rest.sock",
+        ]
+        with pytest.raises(ValueError):
+            restd.parse_listeners("unix:run/rest.sock")
+        with pytest.raises(ValueError):
+            restd.parse_listeners("api-0:http")
+
+    def test_worker_listeners(self) -> None:
+        """Test that each worker gets its own ports and sockets."""
+        assert restd.worker_listeners([":6820", "unix:/run/rest.sock"], 3) == [
+            [":6820", "unix:/run/rest.sock"],
+            [":6821", "unix:/run/rest-1.sock"],
+            [":6822", "unix:/run/rest-2.sock"],
+        ]
+
+        # Workers of adjacent listeners would share ports.
+        with pytest.raises(ValueError, match="overlap on :6821"):
+            restd.worker_listeners([":6820", ":6821"], 2)
+        with pytest.raises(ValueError):
+            restd.worker_listeners([":65535"], 2)
+
+
+class TestSupervisor:
+    """Test running `slurmrestd` workers."""
+
+    def test_main(self, mocker) -> None:
+        """Test that a single worker replaces the supervisor."""
+        execvp = mocker.patch("os.execvp", side_effect=SystemExit(0))
+        with pytest.raises(SystemExit):
+            restd.main(
+                [
+                    "--listen=:6820",
+                    "--max-connections=24",
+                    "--max-thread-count=4",
+                    "--",
+                    "slurmrestd",
+                    "-f",
+                    "slurm.conf",
+                ]
+            )
+        execvp.assert_called_once_with(
+            "slurmrestd",
+            ["slurmrestd", "-f", "slurm.conf", "--max-connections", "24", "-t", "4", ":6820"],
+        )
+
+    def test_supervise(self) -> None:
+        """Test that the other workers are stopped once any worker exits."""
+        sleep = [sys.executable, "-c", "import time; time.sleep(60)"]
+        fail = [sys.executable, "-c", "raise SystemExit(3)"]
+        assert restd.supervise([sleep, fail, sleep]) == 3
+
+    def test_supervise_clean_exit(self) -> None:
+        """Test that the service exits cleanly if the first worker to exit does."""
+        sleep = [sys.executable, "-c", "import time; time.sleep(60)"]
+        done = [sys.executable, "-c", "pass"]
+        assert restd.supervise([sleep, done]) == 0
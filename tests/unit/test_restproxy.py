@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+# Copyright 2025 Canonical Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test the caching proxy in front of `slurmrestd` against a stub `slurmrestd`."""
+
+import http.client
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from slurmhelpers import restproxy
+from slurmhelpers.restproxy import Proxy, ResponseCache
+
+
+class StubSlurmrestd(BaseHTTPRequestHandler):
+    """Stub `slurmrestd` that echoes each request and records it on the server."""
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args) -> None:
+        """Do not log requests."""
+
+    def _echo(self) -> None:
+        length = int(self.headers.get("content-length") or 0)
+        body = self.rfile.read(length).decode()
+        with self.server.lock:
+            self.server.requests.append((self.command, self.path, dict(self.headers), body))
+            n = len(self.server.requests)
+        time.sleep(self.server.delay)
+        data = json.dumps({"n": n, "user": self.headers.get("X-SLURM-USER-NAME")}).encode()
+        self.send_response(self.server.status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(data)
+
+    do_GET = do_HEAD = do_POST = do_DELETE = _echo  # noqa: N815
+
+
+@pytest.fixture
+def upstream():
+    """Start a stub `slurmrestd` on a local port."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubSlurmrestd)
+    server.requests, server.lock, server.delay, server.status = [], threading.Lock(), 0, 200
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def proxy(upstream):
+    """Start the proxy in front of the stub `slurmrestd`."""
+    now = [0.0]
+    server = Proxy(
+        ("127.0.0.1", 0),
+        [f"127.0.0.1:{upstream.server_port}"],
+        {"jobs": 5, "nodes": 30},
+        ResponseCache(clock=lambda: now[0]),
+    )
+    server.now = now
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def request(proxy, method="GET", path="/slurm/v0.0.40/jobs", user="alice", body=None):
+    """Send a request to the proxy and return the response's status, body, and cache status."""
+    conn = http.client.HTTPConnection("127.0.0.1", proxy.server_port, timeout=10)
+    headers = {"X-SLURM-USER-NAME": user, "X-SLURM-USER-TOKEN": f"{user}-jwt"}
+    conn.request(method, path, body=body, headers=headers)
+    r = conn.getresponse()
+    data = r.read()
+    conn.close()
+    return r.status, json.loads(data) if r.status == 200 else data, r.getheader("X-Cache")
+
+
+class TestProxy:
+    """Test caching, coalescing, and forwarding requests to `slurmrestd`."""
+
+    def test_cache(self, proxy, upstream) -> None:
+        """Test that read-only responses are cached per endpoint and per user."""
+        assert request(proxy) == (200, {"n": 1, "user": "alice"}, "miss")
+        assert request(proxy) == (200, {"n": 1, "user": "alice"}, "hit")
+        # Responses are never shared between users.
+        assert request(proxy, user="bob") == (200, {"n": 2, "user": "bob"}, "miss")
+        # Endpoints without a time-to-live are not cached.
+        assert request(proxy, path="/slurm/v0.0.40/diag")[2] == "bypass"
+        assert request(proxy, path="/slurm/v0.0.40/diag")[1]["n"] == 4
+
+        # Responses expire after the endpoint's time-to-live.
+        proxy.now[0] = 5
+        assert request(proxy) == (200, {"n": 5, "user": "alice"}, "miss")
+        assert request(proxy, path="/slurm/v0.0.40/nodes?update_time=1")[1]["n"] == 6
+
+        # Errors are not cached.
+        upstream.status = 500
+        assert request(proxy, path="/slurm/v0.0.40/nodes")[:1] == (500,)
+        assert request(proxy, path="/slurm/v0.0.40/nodes")[:1] == (500,)
+        assert len(upstream.requests) == 8
+
+    def test_coalesce(self, proxy, upstream) -> None:
+        """Test that concurrent identical requests share one upstream request."""
+        upstream.delay = 0.5
+        with ThreadPoolExecutor(8) as pool:
+            responses = list(pool.map(lambda _: request(proxy), range(8)))
+
+        assert len(upstream.requests) == 1
+        assert {r[1]["n"] for r in responses} == {1}
+        assert sorted(r[2] for r in responses) == ["coalesced"] * 7 + ["miss"]
+        assert proxy.cache.stats == {"hit": 0, "miss": 1, "coalesced": 7}
+
+    def test_writes(self, proxy, upstream) -> None:
+        """Test that writes are forwarded as is with their authentication headers."""
+        body = json.dumps({"job": {"script": "#!/bin/sh\ntrue"}})
+        assert request(proxy, "POST", "/slurm/v0.0.40/job/submit", body=body)[2] == "bypass"
+        assert request(proxy, "DELETE", "/slurm/v0.0.40/jobs")[2] == "bypass"
+        (method, path, headers, forwarded), _ = upstream.requests
+        assert (method, path, forwarded) == ("POST", "/slurm/v0.0.40/job/submit", body)
+        assert headers["X-SLURM-USER-TOKEN"] == "alice-jwt"
+
+    def test_head(self, proxy, upstream) -> None:
+        """Test that `HEAD` responses keep the `Content-Length` of the `GET` response."""
+        conn = http.client.HTTPConnection("127.0.0.1", proxy.server_port, timeout=10)
+        conn.request("HEAD", "/slurm/v0.0.40/jobs")
+        r = conn.getresponse()
+        r.read()
+        conn.close()
+        assert r.getheader("X-Cache") == "bypass"
+        assert r.getheader("Content-Length") == str(len(json.dumps({"n": 1, "user": None})))
+
+    def test_upstream_down(self, upstream) -> None:
+        """Test that clients get a bad gateway response if `slurmrestd` is down."""
+        port = upstream.server_port
+        upstream.shutdown()
+        upstream.server_close()
+        proxy = Proxy(("127.0.0.1", 0), [f"127.0.0.1:{port}"], {"jobs": 5})
+        threading.Thread(target=proxy.serve_forever, daemon=True).start()
+        try:
+            assert request(proxy)[0] == 502
+        finally:
+            proxy.shutdown()
+            proxy.server_close()
+
+    def test_upstreams(self) -> None:
+        """Test spreading requests across `slurmrestd` workers, preferring Unix sockets."""
+        assert restproxy.upstreams(":6820,unix:/run/rest.sock", 2) == [
+            "unix:/run/rest.sock",
+            "unix:/run/rest-1.sock",
+        ]
+        assert restproxy.parse_ttls("jobs=5,nodes=0") == {"jobs": 5, "nodes": 0}
+        assert restproxy.endpoint("/slurm/v0.0.40/partitions/?x=1") == "partitions"
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+# Copyright 2025 Canonical Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test the indexed `slurm.conf` parser."""
+
+from pathlib import Path
+
+import pytest
+
+from slurmhelpers import slurmconf
+from slurmhelpers.slurmconf import HostList
+
+ETC = Path("/var/snap/slurm/common/etc/slurm")
+
+mock_slurm_conf = """
+ClusterName=hpc
+SlurmctldHost=ctld-0(10.0.0.1)
+SlurmctldHost=ctld-1
+SchedulerParameters=defer  # Replaced by the include.
+NodeName=DEFAULT CPUs=4 RealMemory=1000
+NodeName=node[0001-9999] Feature="cpu,fast"
+NodeName=gpu1,gpu2,gpu3 \\
+  CPUs=64 Gres=gpu:4
+NodeName=node0042 Weight=10
+DownNodes=node0001 State=DOWN Reason=broken
+PartitionName=DEFAULT MaxTime=60
+PartitionName=compute Nodes=node[0001-9999] Default=YES
+PartitionName=all Nodes=ALL MaxTime=INFINITE
+Include slurmctld-profile.conf
+""".lstrip()
+
+
+@pytest.fixture
+def conf_file(fake_fs) -> Path:
+    """Create a `slurm.conf` file that includes the managed `slurmctld` profile."""
+    fake_fs.create_file(ETC / "slurm.conf", contents=mock_slurm_conf)
+    fake_fs.create_file(
+        ETC / "slurmctld-profile.conf", contents="SchedulerParameters=defer,bf_continue\n"
+    )
+    slurmconf._cache.clear()
+    yield ETC / "slurm.conf"
+
+
+class TestHostList:
+    """Test compressed hostlists."""
+
+    def test_parse(self) -> None:
+        """Test that hostlists are compressed and never expanded to answer queries."""
+        hosts = HostList.parse("node[0001-5000],node5001,node[5002-9999],login1,login2")
+        assert str(hosts) == "node[0001-9999],login[1-2]"
+        assert len(hosts) == 10001
+        assert "node0042" in hosts
+        assert "node42" not in hosts
+        assert "node10000" not in hosts
+        assert "login2" in hosts
+
+    def test_padding(self) -> None:
+        """Test that zero-padded ranges continue past their width."""
+        assert str(HostList.parse("n[01-09],n10,n[11-100]")) == "n[01-100]"
+        assert str(HostList.parse("n[1-9],n[01-09]")) == "n[1-9,01-09]"
+
+    def test_multiple_ranges(self) -> None:
+        """Test hostlists with more than one range per host."""
+        hosts = HostList.parse("rack[1-2]-node[01-03]")
+        assert len(hosts) == 6
+        assert "rack2-node03" in hosts
+        assert "rack3-node01" not in hosts
+        assert list(hosts)[:2] == ["rack1-node01", "rack1-node02"]
+
+    def test_invalid(self) -> None:
+        """Test that invalid ranges are rejected."""
+        with pytest.raises(ValueError):
+            HostList.parse("node[10-1]")
+        with pytest.raises(ValueError):
+            HostList.parse("node[a-z]")
+
+
+class TestSlurmConf:
+    """Test parsing and caching `slurm.conf`."""
+
+    def test_parse(self, conf_file) -> None:
+        """Test indexing parameters, nodes, and partitions across includes."""
+        conf = slurmconf.parse(conf_file)
+        assert conf.get("clustername") == "hpc"
+        assert conf.get("SchedulerParameters") == "defer,bf_continue"
+        assert conf.controllers == ["ctld-0", "ctld-1"]
+        assert conf.includes("slurmctld-profile.conf")
+        assert str(conf.all_nodes()) == "node[0001-9999],gpu[1-3]"
+        assert conf.node("node0042") == {
+            "CPUs": "4",
+            "RealMemory": "1000",
+            "Feature": "cpu,fast",
+            "Weight": "10",
+        }
+        assert "Weight" not in conf.node("node0043")
+        assert conf.node("gpu2")["CPUs"] == "64"
+        assert conf.node("node10000") is None
+        assert conf.partitions["compute"].attrs["MaxTime"] == "60"
+        assert conf.partitions_of("node0042") == ["compute", "all"]
+        assert conf.partitions_of("gpu1") == ["all"]
+        assert conf.records["downnodes"] == [
+            {"DownNodes": "node0001", "State": "DOWN", "Reason": "broken"}
+        ]
+
+    def test_parse_spacing(self, conf_file) -> None:
+        """Test that whitespace around `=` is accepted, like in Slurm."""
+        conf_file.write_text(
+            "SlurmctldHost = ctld-0\nNodeName=node1  CPUs= 4 Weight =10\nLicenses= Foo=bar\n"
+        )
+        conf = slurmconf.parse(conf_file)
+        assert conf.controllers == ["ctld-0"]
+        assert conf.node("node1") == {"CPUs": "4", "Weight": "10"}
+        assert conf.get("licenses") == ""
+        assert conf.get("foo") == "bar"
+
+    def test_parse_includes(self, conf_file) -> None:
+        """Test that a file can be included more than once, but not by itself."""
+        conf_file.write_text("Include slurmctld-profile.conf\nInclude slurmctld-profile.conf\n")
+        assert slurmconf.parse(conf_file).parameters["schedulerparameters"] == [
+            "defer,bf_continue",
+            "defer,bf_continue",
+        ]
+
+        (ETC / "slurmctld-profile.conf").write_text(f"Include {conf_file}\n")
+        with pytest.raises(ValueError, match="recursive include"):
+            slurmconf.parse(conf_file)
+
+    def test_parse_errors(self, conf_file) -> None:
+        """Test that missing includes and unparsable lines are rejected."""
+        (ETC / "slurmctld-profile.conf").unlink()
+        with pytest.raises(FileNotFoundError):
+            slurmconf.parse(conf_file)
+
+        conf_file.write_text("ClusterName=hpc\nthis is not slurm.conf\n")
+        with pytest.raises(ValueError, match="slurm.conf:2"):
+            slurmconf.parse(conf_file)
+
+    def test_load(self, mocker, conf_file) -> None:
+        """Test that configurations are only parsed again once a file they read changes."""
+        cache = Path("/var/snap/slurm/common/.slurm-conf-cache.json")
+        parse = mocker.spy(slurmconf, "parse")
+        conf = slurmconf.load(conf_file, cache)
+        assert slurmconf.load(conf_file, cache) is conf
+
+        # Another process reads the configuration from the cache file.
+        slurmconf._cache.clear()
+        cached = slurmconf.load(conf_file, cache)
+        assert str(cached.all_nodes()) == "node[0001-9999],gpu[1-3]"
+        assert parse.call_count == 1
+
+        # Changing an included file invalidates the cache.
+        (ETC / "slurmctld-profile.conf").write_text("SchedulerParameters=bf_continue\n")
+        assert slurmconf.load(conf_file, cache).get("SchedulerParameters") == "bf_continue"
+        assert parse.call_count == 2
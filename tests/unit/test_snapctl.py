@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+# Copyright 2025 Canonical Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test the memoizing `snapctl` client."""
+
+from slurmhelpers.snapctl import SnapCtlClient
+
+
+class TestSnapCtlClient:
+    """Test the `SnapCtlClient` class."""
+
+    def test_config(self, snap, snapctl) -> None:
+        """Test that configuration is fetched once and refetched after a write."""
+        snapctl.config = {"slurmd": {"config-server": "ctld-0"}, "munged": {}}
+        client = SnapCtlClient(snap)
+
+        assert client.config("slurmd", "slurmrestd") == {"slurmd": {"config-server": "ctld-0"}}
+        assert client.config("slurmd") == {"slurmd": {"config-server": "ctld-0"}}
+        assert snapctl.calls == [("get", "slurmd", "slurmrestd")]
+
+        # Only namespaces that have not been fetched yet are fetched.
+        assert client.config("slurmd", "munged") == {
+            "slurmd": {"config-server": "ctld-0"},
+            "munged": {},
+        }
+        assert snapctl.calls[-1] == ("get", "munged")
+
+        # Writes invalidate the namespaces that were written.
+        client.set_config({"slurmd.config-server": "ctld-1"})
+        assert client.config("slurmd", "munged") == {
+            "slurmd": {"config-server": "ctld-1"},
+            "munged": {},
+        }
+        assert snapctl.calls[-1] == ("get", "slurmd")
+        assert client.calls == len(snapctl.calls) == 4
+
+    def test_services(self, snap, snapctl) -> None:
+        """Test that service state is fetched once and refetched after a write."""
+        snapctl.active.update({"munged": True, "logrotate-watch": False})
+        client = SnapCtlClient(snap)
+
+        assert not client.services()["logrotate-watch"].active
+        assert client.services()["munged"].active
+        assert snapctl.calls == [("services",)]
+
+        client.start("logrotate-watch", enable=True)
+        assert client.services()["logrotate-watch"].enabled
+        assert snapctl.calls == [("services",), ("start", "logrotate-watch"), ("services",)]